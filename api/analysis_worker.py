@@ -0,0 +1,426 @@
+"""
+Analysis Workers
+Run queued analysis jobs from the durable job queue (api/job_queue.py).
+
+Each worker claims one job at a time, keeps its lease alive from a heartbeat
+thread and publishes progress to the queue, so any web worker can report it.
+Run dedicated worker processes with
+
+    python -m api.analysis_worker --workers 4
+
+and ANALYSIS_WORKER_INLINE=0 on the web processes; throughput scales with the
+number of worker processes while web workers only serve requests. With the
+default ANALYSIS_WORKER_INLINE=1 each web process also runs one worker thread,
+which keeps single-process deployments working unchanged (under gunicorn the
+cores are split between the web workers' extraction pools, see
+config/gunicorn_config.py).
+"""
+
+import os
+import time
+import heapq
+import socket
+import signal
+import threading
+import multiprocessing
+
+from api.job_queue import get_job_queue
+from api.inference import inference_engine, DEFAULT_ANALYSIS_TIER, CASCADE_TOP_K
+from api.talent_pool import get_talent_pool
+from api.history_db import (
+    update_job_completion, save_candidate_results, finalize_candidate_ranks,
+    clear_candidate_results, get_job_results, add_notification
+)
+from api.startup import warm_up, WARMUP_ON_STARTUP
+from src.matching.role_weights import detect_role_from_jd
+
+# Run a worker thread inside each web process (set to 0 when running dedicated workers)
+ANALYSIS_WORKER_INLINE = os.getenv("ANALYSIS_WORKER_INLINE", "1") == "1"
+
+# Seconds between lease renewals, and between polls of an empty queue
+JOB_HEARTBEAT_INTERVAL = float(os.getenv("JOB_HEARTBEAT_INTERVAL", "10"))
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))
+
+# Minimum seconds between progress writes to the queue
+JOB_PROGRESS_INTERVAL = float(os.getenv("JOB_PROGRESS_INTERVAL", "0.5"))
+
+# Candidates kept in the provisional ranking while a job runs (upper bound for stream top_n)
+PROVISIONAL_TOP_N = 50
+
+# Resumes scored between classifier calls (and provisional ranking updates) while streaming
+STREAM_PREDICT_BATCH = 16
+
+# Results written to the database per transaction while a job runs
+RESULTS_FLUSH_SIZE = 64
+
+# Job fields published to the queue with each progress update
+_STATE_FIELDS = ('processed', 'failed', 'total', 'provisional', 'cascade_stats',
+                 'candidate_count', 'processing_time', 'job_role')
+
+
+class LeaseLost(Exception):
+    """The job's lease expired and another worker may have claimed it"""
+
+
+def ranking_entry(rank: int, result: dict):
+    """Compact candidate summary for streamed rankings"""
+    return {
+        'rank': rank,
+        'filename': result['filename'],
+        'final_score': result['final_score'],
+        'match_classification': result.get('match_classification'),
+        'model_match_probability': result.get('model_match_probability')
+    }
+
+
+class JobLease:
+    """
+    A claimed job while it runs
+    Renews the lease from a background thread (model loading or one large
+    step can outlast the lease) and publishes the job's progress on demand.
+    """
+
+    def __init__(self, queue, job, worker_id):
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.lost = False
+        self.after_finish = []  # Work that must not hold the job back, run once it is released
+        self._last_publish = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._renew, daemon=True)
+
+    def _renew(self):
+        while not self._stop.wait(JOB_HEARTBEAT_INTERVAL):
+            try:
+                if not self.queue.heartbeat(self.job['job_id'], self.worker_id):
+                    self.lost = True
+                    return
+            except Exception as e:
+                print(f"⚠ Heartbeat failed for job {self.job['job_id']}: {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def state(self):
+        return {field: self.job[field] for field in _STATE_FIELDS if field in self.job}
+
+    def publish(self, force=False):
+        """
+        Write progress to the queue (at most every JOB_PROGRESS_INTERVAL seconds unless forced)
+
+        Raises:
+            LeaseLost: The worker no longer owns the job
+        """
+        if self.lost:
+            raise LeaseLost(self.job['job_id'])
+        now = time.monotonic()
+        if not force and now - self._last_publish < JOB_PROGRESS_INTERVAL:
+            return
+        self._last_publish = now
+        if not self.queue.heartbeat(self.job['job_id'], self.worker_id,
+                                    progress=self.job.get('progress', 0), state=self.state()):
+            self.lost = True
+            raise LeaseLost(self.job['job_id'])
+
+    def finish(self):
+        """Record the job's final status, progress details and result"""
+        return self.queue.finish(
+            self.job['job_id'], self.worker_id, self.job['status'],
+            state=self.state(), result=self.job.get('results'), error=self.job.get('error')
+        )
+
+
+def index_resumes(job_id, resume_paths, texts):
+    """Add a finished job's resumes to the talent pool, reusing their extracted text"""
+    try:
+        pool = get_talent_pool()
+        if pool is not None:
+            pool.add_resumes(resume_paths, job_id=job_id, texts=texts)
+    except Exception as e:
+        print(f"⚠ Talent pool indexing failed for job {job_id}: {e}")
+
+
+def process_analysis(lease: JobLease):
+    """Run a claimed analysis job"""
+    job = lease.job
+    job_id = job['job_id']
+    try:
+        job['progress'] = 10
+
+        # Read JD text
+        with open(job['jd_path'], 'r', encoding='utf-8', errors='ignore') as f:
+            jd_text = f.read()
+
+        job['progress'] = 30
+        lease.publish(force=True)
+
+        # ATS ALIGNMENT: Detect Job Role for Weighting
+        job_role = job['job_role'] = detect_role_from_jd(jd_text)
+
+        start_time = time.time()
+        options = {'tier': job.get('tier') or DEFAULT_ANALYSIS_TIER, 'encoder_tier': job.get('encoder_tier')}
+        if job.get('cascade'):
+            options['cascade'] = True
+            options['report'] = job['cascade_stats'] = {}
+            if job.get('top_k'):
+                options['top_k'] = job['top_k']
+
+        # Stream candidates as they are scored: progress moves from 30 to 90, results are
+        # written to the database every RESULTS_FLUSH_SIZE candidates, and only compact
+        # (score, upload index) tuples stay in memory, plus a bounded provisional top-N
+        # (min-heap of (score, -upload index, summary)) for /api/stream
+        total = len(job['resume_paths'])
+        job.update({'processed': 0, 'failed': 0, 'total': total, 'provisional': []})
+        # Cleaned text of every extracted resume, reused by talent pool indexing
+        resume_texts = {}
+        clear_candidate_results(job_id)  # A re-run (or a retry after a lost worker) replaces partial results
+        scores = []
+        top = []
+        pending_rows, pending_indices = [], []
+        for idx, result, error in inference_engine.iter_batch_analyze(
+            job['resume_paths'],
+            jd_text,
+            job_role=job_role,
+            predict_batch=STREAM_PREDICT_BATCH,
+            texts=resume_texts,
+            **options
+        ):
+            job['processed'] += 1
+            if error is not None:
+                job['failed'] += 1
+            else:
+                scores.append((result['final_score'], idx))
+                pending_rows.append(result)
+                pending_indices.append(idx)
+                if len(pending_rows) >= RESULTS_FLUSH_SIZE:
+                    save_candidate_results(job_id, pending_rows, pending_indices)
+                    pending_rows, pending_indices = [], []
+
+                # (score, -index) is unique, so summaries themselves are never compared
+                item = (result['final_score'], -idx, ranking_entry(None, result))
+                if len(top) < PROVISIONAL_TOP_N:
+                    heapq.heappush(top, item)
+                elif item[:2] > top[0][:2]:
+                    heapq.heapreplace(top, item)
+                else:
+                    item = None
+                if item is not None:
+                    job['provisional'] = [
+                        dict(entry, rank=rank)
+                        for rank, (_, _, entry) in enumerate(sorted(top, key=lambda t: t[:2], reverse=True), 1)
+                    ]
+            job['progress'] = 30 + int(60 * job['processed'] / total) if total else 90
+            lease.publish()
+        if pending_rows:
+            save_candidate_results(job_id, pending_rows, pending_indices)
+
+        # Final ranking in SQL (cascade mode keeps the best top_k)
+        top_k = options.get('top_k', CASCADE_TOP_K) if options.get('cascade') else None
+        finalize_candidate_ranks(job_id, top_k)
+        scores.sort(key=lambda item: (-item[0], item[1]))
+        if top_k is not None:
+            scores = scores[:top_k]
+        processing_time = time.time() - start_time
+
+        # Keep the final top-N for the stream; full results are served from the database
+        job['provisional'] = [ranking_entry(r['rank'], r) for r in get_job_results(job_id, PROVISIONAL_TOP_N)]
+        job['candidate_count'] = len(scores)
+        job['processing_time'] = processing_time
+        job['status'] = 'completed'
+        job['progress'] = 100
+
+        # Calculate statistics
+        avg_score = float(sum(score for score, _ in scores) / len(scores)) if scores else 0.0
+        top_candidate = os.path.basename(job['resume_paths'][scores[0][1]]) if scores else None
+
+        # Save to persistent database
+        update_job_completion(
+            job_id=job_id,
+            status='completed',
+            processing_time=float(processing_time),
+            avg_score=avg_score,
+            top_candidate=top_candidate,
+            job_role=job_role,
+            encoder_tier=job.get('encoder_tier')
+        )
+
+        # Make these resumes searchable for future JDs, once the job is reported complete
+        lease.after_finish.append(lambda: index_resumes(job_id, job['resume_paths'], resume_texts))
+
+        # NOTIFICATIONS: Real-time alerts
+        add_notification(
+            category='alert',
+            title='Analysis Complete',
+            content=f"Analysis detailed report for {len(scores)} candidates is ready.",
+            meta={'job_id': job_id, 'type': 'job_complete'}
+        )
+
+        # Check for top talent to send a 'Message'
+        top_talent = sum(1 for score, _ in scores if score >= 85)
+        if top_talent:
+            add_notification(
+                category='message',
+                title='System AI Agent',
+                content=f"I found {top_talent} candidates with a generic match score above 85%. You should review them immediately.",
+                meta={'job_id': job_id, 'count': top_talent, 'type': 'insight'}
+            )
+
+        # MONITORING: Log predictions for drift detection
+        from src.monitoring.drift_monitor import drift_monitor
+        for score, _ in scores:
+            drift_monitor.log_prediction(score)
+
+    except LeaseLost:
+        raise
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = str(e)
+
+        # Update database with failure
+        update_job_completion(
+            job_id=job_id,
+            status='failed',
+            processing_time=0,
+            error_message=str(e)
+        )
+
+        # NOTIFICATION: Failure
+        add_notification(
+            category='alert',
+            title='Analysis Failed',
+            content=f"Job processing failed: {str(e)}",
+            meta={'job_id': job_id, 'type': 'job_failed'}
+        )
+
+
+def process_matrix_analysis(lease: JobLease):
+    """Score every uploaded resume against every uploaded JD"""
+    job = lease.job
+    try:
+        job['progress'] = 10
+        lease.publish(force=True)
+
+        jd_texts = {}
+        for jd_path in job['jd_paths']:
+            with open(jd_path, 'r', encoding='utf-8', errors='ignore') as f:
+                jd_texts[os.path.basename(jd_path)] = f.read()
+
+        start_time = time.time()
+        matrix = inference_engine.matrix_analyze(job['resume_paths'], jd_texts, encoder_tier=job.get('encoder_tier'))
+
+        job['results'] = matrix
+        job['processing_time'] = time.time() - start_time
+        job['status'] = 'completed'
+        job['progress'] = 100
+    except LeaseLost:
+        raise
+    except Exception as e:
+        job['status'] = 'failed'
+        job['error'] = str(e)
+
+
+JOB_HANDLERS = {
+    'analysis': process_analysis,
+    'matrix': process_matrix_analysis
+}
+
+
+def run_job(queue, job, worker_id):
+    """
+    Run one claimed job to completion
+    Exceptions inside the job fail it; a lost lease abandons it to the worker that took over.
+    Follow-up work (lease.after_finish) runs only after the job is released.
+    """
+    with JobLease(queue, job, worker_id) as lease:
+        try:
+            JOB_HANDLERS[job['kind']](lease)
+        except LeaseLost:
+            print(f"⚠ Lost the lease on job {job['job_id']}; leaving it to another worker")
+            return
+        except Exception as e:
+            job['status'] = 'failed'
+            job['error'] = str(e)
+        if not lease.finish():
+            print(f"⚠ Job {job['job_id']} was reclaimed before it finished")
+            return
+    for task in lease.after_finish:
+        task()
+
+
+def run_worker(stop_event=None, worker_id=None, queue=None):
+    """Claim and run jobs until stop_event is set (the current job always finishes)"""
+    queue = queue or get_job_queue()
+    stop_event = stop_event or threading.Event()
+    worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+    while not stop_event.is_set():
+        try:
+            job = queue.claim(worker_id)
+        except Exception as e:
+            print(f"⚠ Job queue unavailable: {e}")
+            job = None
+        if job is None:
+            stop_event.wait(JOB_POLL_INTERVAL)
+            continue
+        run_job(queue, job, worker_id)
+
+
+_inline_worker = None
+_inline_lock = threading.Lock()
+
+
+def start_inline_worker():
+    """Start this process's inline worker thread (once) if ANALYSIS_WORKER_INLINE is set"""
+    global _inline_worker
+    if not ANALYSIS_WORKER_INLINE:
+        return
+    with _inline_lock:
+        if _inline_worker is None or not _inline_worker.is_alive():
+            _inline_worker = threading.Thread(target=run_worker, name="analysis-worker", daemon=True)
+            _inline_worker.start()
+
+
+def _worker_process():
+    """Entry point of a dedicated worker process; SIGTERM/SIGINT stop it after the current job"""
+    stop_event = threading.Event()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: stop_event.set())
+    if WARMUP_ON_STARTUP:
+        warm_up()
+    print(f"✓ Analysis worker {os.getpid()} started")
+    run_worker(stop_event)
+    print(f"✓ Analysis worker {os.getpid()} stopped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run analysis workers for the job queue")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes to run")
+    args = parser.parse_args()
+
+    if args.workers <= 1:
+        _worker_process()
+    else:
+        # Each worker runs its own extraction pool: split the cores between them unless configured
+        os.environ.setdefault("BATCH_WORKERS", str(max(1, (os.cpu_count() or 1) // args.workers)))
+
+        # Non-daemonic (workers start their own extraction processes); spawn, as for ExtractionPool
+        context = multiprocessing.get_context("spawn")
+        processes = [context.Process(target=_worker_process, name=f"analysis-worker-{i}")
+                     for i in range(args.workers)]
+        for process in processes:
+            process.start()
+        signal.signal(signal.SIGTERM, lambda *_: [p.terminate() for p in processes if p.is_alive()])
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            # Children got the SIGINT too and stop after their current job
+            for process in processes:
+                process.join()
@@ -329,32 +329,30 @@ def create_default_admin():
             print("✓ Default admin user created: admin@company.com / admin123")
             print("⚠️  IMPORTANT: Change the default admin password immediately!")
 
-# --- Initialize Database ---
-init_db()
-
-# Migrate existing tables (add new columns if they don't exist)
-try:
-    conn = get_db_connection()
-    
-    # Try to add new columns (will fail silently if they exist)
-    migrations = [
-        "ALTER TABLE users ADD COLUMN provider TEXT DEFAULT 'local'",
-        "ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'recruiter'",
-        "ALTER TABLE users ADD COLUMN company_id INTEGER",
-        "ALTER TABLE users ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
-        "ALTER TABLE users ADD COLUMN last_login TIMESTAMP"
-    ]
-    
-    for migration in migrations:
-        try:
-            conn.execute(migration)
-            conn.commit()
-        except sqlite3.OperationalError:
-            pass  # Column already exists
+def migrate_users_db():
+    """Create the auth tables and add columns introduced since they were created"""
+    init_db()
     
-    conn.close()
-except Exception as e:
-    print(f"Migration note: {e}")
-
-# Create default admin if needed
-create_default_admin()
+    # Migrate existing tables (add new columns if they don't exist)
+    try:
+        conn = get_db_connection()
+        
+        # Try to add new columns (will fail silently if they exist)
+        migrations = [
+            "ALTER TABLE users ADD COLUMN provider TEXT DEFAULT 'local'",
+            "ALTER TABLE users ADD COLUMN role TEXT DEFAULT 'recruiter'",
+            "ALTER TABLE users ADD COLUMN company_id INTEGER",
+            "ALTER TABLE users ADD COLUMN created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            "ALTER TABLE users ADD COLUMN last_login TIMESTAMP"
+        ]
+        
+        for migration in migrations:
+            try:
+                conn.execute(migration)
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+        
+        conn.close()
+    except Exception as e:
+        print(f"Migration note: {e}")
@@ -0,0 +1,124 @@
+"""
+Process Pool for Batch Resume Extraction
+Runs the CPU-bound parsing/extraction stage of batch_analyze across cores
+while the sentence encoder stays in the parent process
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.feature_extraction.resume_features import extract_resume_features, extract_features_from_text
+from src.preprocessing.text_cleaner import get_stopwords
+
+# 0 = auto (match torch intra-op threads), 1 = sequential, N = N worker processes
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "0"))
+
+# Resumes handed to a worker per task
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "8"))
+
+# Smaller batches are not worth the inter-process overhead
+MIN_PARALLEL_BATCH = int(os.getenv("MIN_PARALLEL_BATCH", "16"))
+
+
+def default_worker_count():
+    """
+    Size the pool to the encoder's core budget: the extraction stage runs
+    before the batched encode, so both stages get the same number of cores.
+    Falls back to the CPU count when torch is not available.
+    """
+    try:
+        import torch
+        threads = torch.get_num_threads()
+    except ImportError:
+        threads = os.cpu_count() or 1
+    return max(1, min(threads, os.cpu_count() or 1))
+
+
+def resolve_worker_count(workers=None):
+    """Resolve an explicit/configured worker count (0 or None means auto)"""
+    if workers is None:
+        workers = BATCH_WORKERS
+    if workers <= 0:
+        workers = default_worker_count()
+    return workers
+
+
+def _init_worker():
+    """
+    Runs once per worker process: pin native thread pools to one thread
+    (parallelism comes from the processes) and load shared resources
+    (stopword set; the skill automaton is built on module import).
+    """
+    os.environ.setdefault("OMP_NUM_THREADS", "1")
+    os.environ.setdefault("MKL_NUM_THREADS", "1")
+    get_stopwords()
+
+
+def extract_one(resume_path):
+    """
+    Extract features for one resume with per-file error isolation
+
+    Returns:
+        (resume_path, features or None, error message or None)
+    """
+    try:
+        return resume_path, extract_resume_features(resume_path), None
+    except Exception as e:
+        return resume_path, None, str(e)
+
+
+def extract_from_text(resume_text_raw):
+    """
+    Text-only extraction for the pipelined path (parsing already done in threads)
+    The raw text is not sent back; the caller still holds it.
+
+    Returns:
+        (features without 'raw_text' or None, error message or None)
+    """
+    try:
+        features = extract_features_from_text(resume_text_raw)
+        features.pop('raw_text', None)
+        return features, None
+    except Exception as e:
+        return None, str(e)
+
+
+class ExtractionPool:
+    """
+    Long-lived worker pool; created on first use and reused across jobs
+    so workers initialize once rather than once per batch
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            # spawn: workers must not inherit the parent's torch/OpenMP thread state
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker
+            )
+        return self._executor
+
+    def map(self, resume_paths, chunk_size=BATCH_CHUNK_SIZE):
+        """
+        Extract all resumes, distributing them to workers in chunks
+        Results are returned in input order, so downstream ranking is deterministic
+        """
+        if self.workers <= 1 or len(resume_paths) < MIN_PARALLEL_BATCH:
+            return [extract_one(path) for path in resume_paths]
+
+        return list(self._get_executor().map(extract_one, resume_paths, chunksize=chunk_size))
+
+    def submit(self, fn, *args):
+        """Submit a single task (the pipelined executor manages its own in-flight bound)"""
+        return self._get_executor().submit(fn, *args)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
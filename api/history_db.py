@@ -81,7 +81,14 @@ def init_history_db():
         ("education_history", "TEXT"), # JSON
         ("experience_history", "TEXT"), # JSON
         ("projects", "TEXT"), # JSON
-        ("certifications", "TEXT") # JSON
+        ("certifications", "TEXT"), # JSON
+        ("skill_recommendations", "TEXT"), # JSON
+        ("learning_paths", "TEXT"), # JSON
+        ("categorized_skills", "TEXT"), # JSON
+        ("analysis_tier", "TEXT"),
+        ("model_match_probability", "REAL"),
+        ("confidence_score", "TEXT"),  # High / Medium / Low (REAL in older databases; SQLite keeps the text as is)
+        ("upload_index", "INTEGER")  # Position in the upload; breaks score ties when ranking
     ]
     
     for col_name, col_type in new_columns:
@@ -89,6 +96,15 @@ def init_history_db():
             c.execute(f"ALTER TABLE candidate_results ADD COLUMN {col_name} {col_type}")
         except sqlite3.OperationalError:
             pass
+    
+    # Migration: Role and encoder tier a job was scored with (reused by detail-view enrichment)
+    for col_name in ("job_role", "encoder_tier"):
+        try:
+            c.execute(f"ALTER TABLE analysis_jobs ADD COLUMN {col_name} TEXT")
+        except sqlite3.OperationalError:
+            pass
+    
+    c.execute('CREATE INDEX IF NOT EXISTS idx_candidate_results_job ON candidate_results(job_id, rank)')
             
     # Analytics aggregation table
     c.execute('''
@@ -162,22 +178,28 @@ def save_analysis_job(job_id: str, user_email: str, jd_filename: str, resume_cou
 
 def update_job_completion(job_id: str, status: str, processing_time: float, 
                           avg_score: float = None, top_candidate: str = None, 
-                          error_message: str = None):
+                          error_message: str = None, job_role: str = None, encoder_tier: str = None):
     """Update job with completion details"""
     conn = sqlite3.connect(DB_PATH)
     conn.execute('''
         UPDATE analysis_jobs 
         SET status = ?, completed_at = ?, processing_time = ?, 
-            avg_score = ?, top_candidate = ?, error_message = ?
+            avg_score = ?, top_candidate = ?, error_message = ?,
+            job_role = COALESCE(?, job_role), encoder_tier = COALESCE(?, encoder_tier)
         WHERE job_id = ?
-    ''', (status, datetime.now(), processing_time, avg_score, top_candidate, error_message, job_id))
+    ''', (status, datetime.now(), processing_time, avg_score, top_candidate, error_message,
+          job_role, encoder_tier, job_id))
     conn.commit()
     conn.close()
 
-def save_candidate_results(job_id: str, results: List[Dict]):
-    """Save candidate results for a job"""
-    conn = sqlite3.connect(DB_PATH)
-    for r in results:
+def save_candidate_results(job_id: str, results: List[Dict], upload_indices: List[int] = None):
+    """
+    Save candidate results for a job
+    Called once per batch while a job runs; ranks are assigned by finalize_candidate_ranks
+    unless the results already carry one.
+    """
+    rows = []
+    for i, r in enumerate(results):
         # Serialize complex fields
         matched_skills = json.dumps(r.get('matched_skills', []))
         missing_skills = json.dumps(r.get('missing_skills', []))
@@ -189,22 +211,18 @@ def save_candidate_results(job_id: str, results: List[Dict]):
         exp_history = json.dumps(r.get('experience_history', []))
         projects = json.dumps(r.get('projects', []))
         certs = json.dumps(r.get('certifications', []))
+        skill_recommendations = json.dumps(r.get('skill_recommendations', {}))
+        learning_paths = json.dumps(r.get('learning_paths', []))
+        categorized_skills = json.dumps(r.get('categorized_skills', {}))
         
-        conn.execute('''
-            INSERT INTO candidate_results 
-            (job_id, filename, final_score, semantic_score, experience_score, education_score, rank,
-             email, phone, matched_skills, missing_skills, recommended_roles, match_classification, 
-             summary, interview_questions, linkedin_url, github_url, portfolio_url, location,
-             education_history, experience_history, projects, certifications)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
+        rows.append((
             job_id, 
             r['filename'], 
             float(r['final_score']), 
             float(r.get('semantic_score', 0)), 
             float(r.get('experience_score', 0)), 
             float(r.get('education_score', 0)), 
-            int(r.get('rank', 0)),
+            r.get('rank'),
             r.get('email'),
             r.get('phone'),
             matched_skills,
@@ -220,8 +238,83 @@ def save_candidate_results(job_id: str, results: List[Dict]):
             edu_history,
             exp_history,
             projects,
-            certs
+            certs,
+            skill_recommendations,
+            learning_paths,
+            categorized_skills,
+            r.get('analysis_tier'),
+            r.get('model_match_probability'),
+            r.get('confidence_score'),
+            upload_indices[i] if upload_indices is not None else i
         ))
+    
+    conn = sqlite3.connect(DB_PATH)
+    conn.executemany('''
+        INSERT INTO candidate_results 
+        (job_id, filename, final_score, semantic_score, experience_score, education_score, rank,
+         email, phone, matched_skills, missing_skills, recommended_roles, match_classification, 
+         summary, interview_questions, linkedin_url, github_url, portfolio_url, location,
+         education_history, experience_history, projects, certifications,
+         skill_recommendations, learning_paths, categorized_skills, analysis_tier, model_match_probability,
+         confidence_score, upload_index)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ''', rows)
+    conn.commit()
+    conn.close()
+
+def finalize_candidate_ranks(job_id: str, top_k: int = None) -> int:
+    """
+    Rank a job's saved results by final score (ties in upload order)
+    
+    Args:
+        top_k: Keep only the best top_k rows (cascade mode)
+        
+    Returns:
+        Number of ranked candidates kept
+    """
+    conn = sqlite3.connect(DB_PATH)
+    ranks = conn.execute('''
+        SELECT id, ROW_NUMBER() OVER (ORDER BY final_score DESC, upload_index ASC, id ASC)
+        FROM candidate_results
+        WHERE job_id = ?
+    ''', (job_id,)).fetchall()
+    conn.executemany('UPDATE candidate_results SET rank = ? WHERE id = ?', [(rank, row_id) for row_id, rank in ranks])
+    if top_k is not None:
+        conn.execute('DELETE FROM candidate_results WHERE job_id = ? AND rank > ?', (job_id, top_k))
+    conn.commit()
+    conn.close()
+    return min(len(ranks), top_k) if top_k is not None else len(ranks)
+
+def clear_candidate_results(job_id: str):
+    """Remove a job's saved results (before it is re-run)"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute('DELETE FROM candidate_results WHERE job_id = ?', (job_id,))
+    conn.commit()
+    conn.close()
+
+# Enrichment fields that are stored as JSON
+_JSON_ENRICHMENT_FIELDS = (
+    'recommended_roles', 'interview_questions', 'education_history', 'experience_history',
+    'projects', 'certifications', 'skill_recommendations', 'learning_paths', 'categorized_skills'
+)
+_ENRICHMENT_COLUMNS = _JSON_ENRICHMENT_FIELDS + (
+    'email', 'phone', 'linkedin_url', 'github_url', 'portfolio_url', 'location', 'analysis_tier'
+)
+
+def update_candidate_enrichment(job_id: str, filename: str, fields: Dict):
+    """Persist lazily computed enrichment (higher analysis tier) for a candidate"""
+    columns = [name for name in _ENRICHMENT_COLUMNS if name in fields]
+    if not columns:
+        return
+    values = [json.dumps(fields[name]) if name in _JSON_ENRICHMENT_FIELDS else fields[name] for name in columns]
+    assignments = ', '.join(f"{name} = ?" for name in columns)
+    
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute(f'''
+        UPDATE candidate_results
+        SET {assignments}
+        WHERE job_id = ? AND filename = ?
+    ''', values + [job_id, filename])
     conn.commit()
     conn.close()
 
@@ -253,8 +346,40 @@ def get_all_jobs(user_email: str = None, limit: int = 50) -> List[Dict]:
     conn.close()
     return [dict(row) for row in rows]
 
-def get_job_results(job_id: str) -> List[Dict]:
-    """Get candidate results for a specific job"""
+def _parse_candidate_row(row) -> Dict:
+    """candidate_results row as a result dict with its JSON fields decoded"""
+    r = dict(row)
+    # Parse potential JSON fields
+    try:
+        r['matched_skills'] = json.loads(r['matched_skills']) if r.get('matched_skills') else []
+        r['missing_skills'] = json.loads(r['missing_skills']) if r.get('missing_skills') else []
+        r['recommended_roles'] = json.loads(r['recommended_roles']) if r.get('recommended_roles') else []
+        r['interview_questions'] = json.loads(r['interview_questions']) if r.get('interview_questions') else []
+        
+        # Parse new fields
+        r['education_history'] = json.loads(r['education_history']) if r.get('education_history') else []
+        r['experience_history'] = json.loads(r['experience_history']) if r.get('experience_history') else []
+        r['projects'] = json.loads(r['projects']) if r.get('projects') else []
+        r['certifications'] = json.loads(r['certifications']) if r.get('certifications') else []
+        r['skill_recommendations'] = json.loads(r['skill_recommendations']) if r.get('skill_recommendations') else None
+        r['learning_paths'] = json.loads(r['learning_paths']) if r.get('learning_paths') else None
+        r['categorized_skills'] = json.loads(r['categorized_skills']) if r.get('categorized_skills') else None
+        
+    except:
+        # Fallback if parsing fails
+        r['matched_skills'] = []
+        r['missing_skills'] = []
+        r['recommended_roles'] = []
+        r['interview_questions'] = []
+        r['education_history'] = []
+        r['experience_history'] = []
+        r['projects'] = []
+        r['certifications'] = []
+    
+    return r
+
+def get_job_results(job_id: str, limit: int = None) -> List[Dict]:
+    """Get candidate results for a specific job (best first; optionally only the first limit)"""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
     
@@ -262,41 +387,23 @@ def get_job_results(job_id: str) -> List[Dict]:
         SELECT * FROM candidate_results 
         WHERE job_id = ?
         ORDER BY rank ASC
-    ''', (job_id,)).fetchall()
+        LIMIT ?
+    ''', (job_id, -1 if limit is None else limit)).fetchall()
     
     conn.close()
     
     # Convert Row objects to dicts and handle any necessary parsing
-    results = []
-    for row in rows:
-        r = dict(row)
-        # Parse potential JSON fields
-        try:
-            r['matched_skills'] = json.loads(r['matched_skills']) if r.get('matched_skills') else []
-            r['missing_skills'] = json.loads(r['missing_skills']) if r.get('missing_skills') else []
-            r['recommended_roles'] = json.loads(r['recommended_roles']) if r.get('recommended_roles') else []
-            r['interview_questions'] = json.loads(r['interview_questions']) if r.get('interview_questions') else []
-            
-            # Parse new fields
-            r['education_history'] = json.loads(r['education_history']) if r.get('education_history') else []
-            r['experience_history'] = json.loads(r['experience_history']) if r.get('experience_history') else []
-            r['projects'] = json.loads(r['projects']) if r.get('projects') else []
-            r['certifications'] = json.loads(r['certifications']) if r.get('certifications') else []
-            
-        except:
-            # Fallback if parsing fails
-            r['matched_skills'] = []
-            r['missing_skills'] = []
-            r['recommended_roles'] = []
-            r['interview_questions'] = []
-            r['education_history'] = []
-            r['experience_history'] = []
-            r['projects'] = []
-            r['certifications'] = []
-            
-        results.append(r)
-        
-    return results
+    return [_parse_candidate_row(row) for row in rows]
+
+def get_candidate_result(job_id: str, filename: str) -> Optional[Dict]:
+    """Get one candidate's result"""
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+    row = conn.execute(
+        'SELECT * FROM candidate_results WHERE job_id = ? AND filename = ?', (job_id, filename)
+    ).fetchone()
+    conn.close()
+    return _parse_candidate_row(row) if row else None
 
 def get_job_by_id(job_id: str) -> Optional[Dict]:
     """Get job details by ID"""
@@ -477,7 +584,3 @@ def get_login_activity(user_email: str, limit: int = 10) -> List[Dict]:
     rows = conn.execute('SELECT * FROM login_activity WHERE user_email = ? ORDER BY timestamp DESC LIMIT ?', (user_email, limit)).fetchall()
     conn.close()
     return [dict(row) for row in rows]
-
-
-# Initialize database on import
-init_history_db()
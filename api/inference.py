@@ -5,26 +5,74 @@ Handles model loading and prediction with all advanced features
 
 import joblib
 import os
+import numpy as np
 import sys
+import time
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future
 from pathlib import Path
 
 # Add project root to path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from src.preprocessing.resume_parser import extract_text
-from src.preprocessing.text_cleaner import clean_text
-from src.feature_extraction.skill_extractor import extract_skills, categorize_skills
-from src.feature_extraction.experience_extractor import extract_experience
-from src.feature_extraction.education_extractor import extract_education
-from src.matching.semantic_matcher_bert import semantic_similarity
+from src.feature_extraction.resume_features import extract_resume_features
+from src.feature_extraction.skill_extractor import categorize_skills
+from src.matching.semantic_matcher_bert import (
+    similarity_to_embedding, batch_similarity_to_embedding, encoder_version, ENCODE_BATCH_SIZE
+)
+from src.matching.jd_profile import JDProfile, build_jd_profiles
+from src.matching.matrix_scoring import score_matrix
 from src.matching.experience_weight import experience_score
-from src.matching.bias_filter import remove_bias
-from src.matching.role_weights import get_role_weights, apply_role_weights
+from src.matching.role_weights import apply_role_weights, detect_role_from_jd
 from src.explainability.score_breakdown import calculate_final_score
 from src.recommendation.skill_gap_recommender import recommend_skills
-from src.recommendation.skill_gap_recommender import recommend_skills
 from src.recommendation.learning_path import suggest_learning_paths
-from src.feature_extraction.comprehensive_parser import parser as comprehensive_parser
+from api.batch_pool import ExtractionPool, resolve_worker_count, extract_from_text
+from api.talent_pool import get_talent_pool, TALENT_POOL_DEFAULT_K
+from api.model_scoring import limit_model_threads, predict_match_probability
+from api.model_registry import get_model_registry, MODEL_REGISTRY_POLL_INTERVAL
+from api.result_cache import (
+    AnalysisResultCache, analysis_version, file_digest, jd_digest, RESULT_CACHE_ENABLED
+)
+
+# Analysis tiers, cheapest first:
+# - score: scores, classification, confidence, matched/missing skills
+# - standard: + skill recommendations, learning paths, role suggestions,
+#   interview questions, categorized skills
+# - full: + structured profile (contact info, education/experience history,
+#   projects, certifications) from the spaCy-based comprehensive parser
+ANALYSIS_TIERS = ("score", "standard", "full")
+DEFAULT_ANALYSIS_TIER = os.getenv("ANALYSIS_TIER", "standard")
+
+def tier_level(tier):
+    """Position of a tier in ANALYSIS_TIERS (results without a tier count as score-only)"""
+    return ANALYSIS_TIERS.index(tier) if tier in ANALYSIS_TIERS else 0
+
+# Cascade ranking: candidates kept after the semantic stage (and fully enriched)
+CASCADE_TOP_K = int(os.getenv("CASCADE_TOP_K", "50"))
+# Stage 1 thresholds: minimum JD skill coverage (%) and fraction of required years
+CASCADE_MIN_SKILL_OVERLAP = float(os.getenv("CASCADE_MIN_SKILL_OVERLAP", "10"))
+CASCADE_MIN_EXPERIENCE_RATIO = float(os.getenv("CASCADE_MIN_EXPERIENCE_RATIO", "0"))
+
+# Classifier for model_match_probability: "student" (distilled, falls back to the
+# ensemble when not trained) or "ensemble"
+SCORING_MODEL = os.getenv("SCORING_MODEL", "student")
+
+def rank_results(ranked, top_k=None):
+    """
+    Final ranking of (upload index, result) pairs: by final score (descending),
+    ties in upload order, optionally cut to top_k; sets each result's 'rank'
+    """
+    ranked = sorted(ranked, key=lambda item: (-item[1]['final_score'], item[0]))
+    results = [result for _, result in ranked]
+    if top_k is not None:
+        results = results[:top_k]
+    for idx, result in enumerate(results):
+        result['rank'] = idx + 1
+    return results
 
 class MLInferenceEngine:
     """
@@ -35,40 +83,150 @@ class MLInferenceEngine:
     _instance = None
     _model = None
     _model_loaded = False
+    _model_load_attempted = False
+    _model_path = None
+    _model_version = None
+    _model_lock = threading.Lock()
+    _registry_checked = (0.0, None)  # (monotonic time, manifest mtime) of the last registry poll
+    _extraction_pool = None
+    _result_cache = None
     
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
     
-    def __init__(self):
-        if not self._model_loaded:
-            self.load_model()
+    def ensure_model(self):
+        """
+        Load the scoring model on first use rather than on import
+        (unpickling it pulls in sklearn and the training modules)
+        """
+        if self._model_load_attempted:
+            return
+        with self._model_lock:
+            if not self._model_load_attempted:
+                self.load_model()
+                self._model_load_attempted = True
     
     def load_model(self):
-        """Load the trained model"""
+        """Load the trained model (the registry's active version when there is one)"""
         try:
-            # Try ensemble model first
+            registry = get_model_registry()
+            self._registry_checked = (time.monotonic(), registry.manifest_mtime())
+            version = registry.active_version()
+            if version is not None:
+                self._install_model(registry.load(version), registry.artifact_path(version), version)
+                print(f"✓ Loaded model version {version} from the registry")
+                self._model_loaded = True
+                return
+            
+            # Distilled student first: same decisions as the ensemble at a fraction of the latency
+            student_path = "models/student_classifier.pkl"
             ensemble_path = "models/ensemble_classifier.pkl"
-            if os.path.exists(ensemble_path):
+            if SCORING_MODEL == "student" and os.path.exists(student_path):
+                self._model = joblib.load(student_path)
+                self._model_path = student_path
+                print(f"✓ Loaded distilled student model from {student_path}")
+            elif os.path.exists(ensemble_path):
                 self._model = joblib.load(ensemble_path)
+                self._model_path = ensemble_path
                 print(f"✓ Loaded ensemble model from {ensemble_path}")
             else:
                 # Fallback to standard model
                 standard_path = "models/match_classifier.pkl"
                 if os.path.exists(standard_path):
                     self._model = joblib.load(standard_path)
+                    self._model_path = standard_path
                     print(f"✓ Loaded standard model from {standard_path}")
                 else:
                     print("⚠ Warning: No trained model found. Using rule-based scoring only.")
                     self._model = None
+                    self._model_path = None
+            
+            if self._model is not None:
+                limit_model_threads(self._model)
             
+            # Results scored under the previous model must not be served
+            self._result_cache = None
+            self._model_version = None
             self._model_loaded = True
         except Exception as e:
             print(f"❌ Error loading model: {e}")
             self._model = None
             self._model_loaded = False
     
+    def _install_model(self, model, model_path, version):
+        """Swap in a loaded model; calls already holding the previous one finish with it"""
+        limit_model_threads(model)
+        self._model, self._model_path, self._model_version = model, model_path, version
+        # Results scored under the previous model must not be served
+        self._result_cache = None
+    
+    def refresh_model(self, force: bool = False):
+        """
+        Switch to the registry's active version if it changed since the last check
+        The manifest is stat'ed at most every MODEL_REGISTRY_POLL_INTERVAL seconds;
+        a version that fails to load is reported and the current model kept.
+        """
+        self.ensure_model()
+        checked_at, seen_mtime = self._registry_checked
+        if not force and time.monotonic() - checked_at < MODEL_REGISTRY_POLL_INTERVAL:
+            return
+        registry = get_model_registry()
+        mtime = registry.manifest_mtime()
+        self._registry_checked = (time.monotonic(), mtime)
+        if not force and mtime == seen_mtime:
+            return
+        
+        with self._model_lock:
+            try:
+                version = registry.active_version()
+                if version is None or version == self._model_version:
+                    return
+                model = registry.load(version)
+                self._install_model(model, registry.artifact_path(version), version)
+                print(f"✓ Switched to model version {version}")
+            except Exception as e:
+                print(f"⚠ Could not switch model version: {e}")
+    
+    def activate_model_version(self, version: str):
+        """Make a registered version active for every worker and load it here"""
+        get_model_registry().activate(version)
+        self.refresh_model(force=True)
+        if self._model_version != version:
+            raise ValueError(f"Model version {version} was activated but could not be loaded")
+    
+    def model_info(self):
+        """Version and file of the model scoring in this worker"""
+        self.ensure_model()
+        return {
+            'version': self._model_version,
+            'path': self._model_path,
+            'model_class': type(self._model).__name__ if self._model is not None else None
+        }
+    
+    def predict_match_probabilities(self, results: list):
+        """
+        Classifier probability of a good match for many results in one predict_proba call
+        Adds 'model_match_probability' (0-100) to each result; no-op without a loaded model
+        """
+        self.ensure_model()
+        if self._model is None or not results:
+            return
+        columns = {
+            'semantic_score': [r['semantic_score'] for r in results],
+            'experience_score': [r['experience_score'] for r in results],
+            'skill_overlap': [len(r['matched_skills']) for r in results],
+            'education_score': [r['education_score'] for r in results]
+        }
+        try:
+            probabilities = predict_match_probability(self._model, columns)
+        except Exception as e:
+            print(f"⚠ Model scoring failed: {e}")
+            return
+        for result, probability in zip(results, probabilities):
+            result['model_match_probability'] = round(float(probability) * 100, 2)
+    
     def classify_match_level(self, final_score):
         """
         FEATURE 8: Multi-Level Match Classification
@@ -144,7 +302,40 @@ class MLInferenceEngine:
         recommended = [role for role, score in sorted_roles[:3] if score > 30]
         return recommended if recommended else ["General Software Engineer"]
     
-    def analyze_resume(self, resume_path: str, jd_text: str, job_role: str = "Data Scientist"):
+    def build_jd_profile(self, jd_text: str, job_role: str = None, encoder_tier: str = None):
+        """
+        Precompute everything derived from the job description
+        (cleaned text, skills, required years, role weights, embedding)
+        so a batch pays for it once instead of once per resume
+        """
+        return JDProfile(jd_text, job_role, encoder_tier=encoder_tier)
+    
+    def extract_resume_features(self, resume_path: str):
+        """
+        Candidate-side feature extraction: parsing, bias removal, cleaning,
+        skills, experience and education. Independent of the job description.
+        """
+        return extract_resume_features(resume_path)
+    
+    def get_result_cache(self):
+        """Result cache for the current skill data/model version (None when disabled)"""
+        if not RESULT_CACHE_ENABLED:
+            return None
+        if self._result_cache is None:
+            self._result_cache = AnalysisResultCache(analysis_version(self._model_path))
+        return self._result_cache
+    
+    def _result_key(self, cache, resume_path: str, jd_hash: str, job_role: str, tier: str,
+                    encoder_tier: str = None):
+        """Cache key for one resume, or None if the file cannot be read (analysis reports the error)"""
+        try:
+            return cache.key(file_digest(resume_path), jd_hash, job_role, tier, encoder_version(encoder_tier))
+        except OSError:
+            return None
+    
+    def analyze_resume(self, resume_path: str, jd_text: str, job_role: str = "Data Scientist",
+                       jd_profile: JDProfile = None, tier: str = DEFAULT_ANALYSIS_TIER,
+                       encoder_tier: str = None):
         """
         Analyze a single resume against a job description
         
@@ -152,47 +343,82 @@ class MLInferenceEngine:
             resume_path: Path to resume file
             jd_text: Job description text
             job_role: Target job role for role-specific weighting
+            jd_profile: Precomputed JD profile (built from jd_text/job_role if omitted)
+            tier: Analysis tier (see ANALYSIS_TIERS)
+            encoder_tier: Encoder tier (see ENCODER_TIERS; a given jd_profile's tier wins)
             
         Returns:
             Dictionary with comprehensive analysis results
         """
-        # Extract and clean text
-        resume_text_raw = extract_text(resume_path)
+        if jd_profile is not None:
+            jd_text, job_role = jd_profile.raw_text, jd_profile.job_role
+            encoder_tier = jd_profile.encoder_tier
+        else:
+            job_role = job_role or detect_role_from_jd(jd_text)
+        
+        self.refresh_model()
+        cache = self.get_result_cache()
+        key = None
+        if cache is not None:
+            key = self._result_key(cache, resume_path, jd_digest(jd_text), job_role, tier, encoder_tier)
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                return cached
+        
+        if jd_profile is None:
+            jd_profile = self.build_jd_profile(jd_text, job_role, encoder_tier)
+        
+        features = self.extract_resume_features(resume_path)
         
-        # FEATURE 5: Bias-Reduced Hiring Mechanism
-        resume_text_unbiased = remove_bias(resume_text_raw)
+        # FEATURE 1: Semantic Skill Matching (JD embedding precomputed in the profile)
+        semantic_score = similarity_to_embedding(features['clean_text'], jd_profile.embedding,
+                                                 jd_profile.encoder_tier)
         
-        resume_clean = clean_text(resume_text_unbiased)
-        jd_clean = clean_text(jd_text)
+        result = self.score_resume(features, semantic_score, jd_profile, tier)
+        self.predict_match_probabilities([result])
+        if key is not None:
+            cache.put(key, result)
+        return result
+    
+    def score_resume(self, features: dict, semantic_score: float, jd_profile: JDProfile,
+                     tier: str = DEFAULT_ANALYSIS_TIER):
+        """
+        Combine extracted resume features and a semantic score into the full result
         
-        # Extract features
-        resume_skills = extract_skills(resume_clean)
-        jd_skills = extract_skills(jd_clean)
+        Args:
+            features: Output of extract_resume_features
+            semantic_score: Resume/JD semantic similarity (0-100)
+            jd_profile: Precomputed JD profile
+            tier: Analysis tier; fields of higher tiers can be added later with enrich_result
+            
+        Returns:
+            Dictionary with comprehensive analysis results
+        """
+        job_role = jd_profile.job_role
+        resume_skills = features['skills']
+        jd_skills = jd_profile.skills
         
         # FEATURE 9: Role-Specific Skill Weighting
         role_weighted_skills = apply_role_weights(resume_skills, job_role)
         
         # Calculate scores
-        # FEATURE 1: Semantic Skill Matching
-        semantic_score = semantic_similarity(resume_clean, jd_clean)
-        
         # FEATURE 4: Experience-Weighted
-        resume_exp = extract_experience(resume_clean)
-        jd_required_exp = extract_experience(jd_clean) or 3  # Default 3 years
+        resume_exp = features['experience_years']
+        jd_required_exp = jd_profile.required_experience
         exp_score = experience_score(resume_exp, jd_required_exp)
         
         # Education Scoring
-        edu_score, degree = extract_education(resume_clean)
+        edu_score, degree = features['education_score'], features['degree']
         
         # Skill overlap calculation
         if not jd_skills:
             skill_overlap_score = 0
         else:
-            intersection = set(resume_skills).intersection(set(jd_skills))
-            skill_overlap_score = (len(intersection) / len(set(jd_skills))) * 100
+            intersection = set(resume_skills).intersection(jd_profile.skill_set)
+            skill_overlap_score = (len(intersection) / len(jd_profile.skill_set)) * 100
         
         # FEATURE 9: Apply role-specific weights to final score
-        role_weights = get_role_weights(job_role)
+        role_weights = jd_profile.role_weights
         final_score = (
             semantic_score * role_weights['semantic'] +
             skill_overlap_score * role_weights['skills'] +
@@ -212,24 +438,12 @@ class MLInferenceEngine:
             len(jd_skills)
         )
         
-        # FEATURE 3: Skill Gap Recommendation
+        # FEATURE 3: Skill Gap Recommendation (missing skills are part of every tier)
         skill_gaps = recommend_skills(jd_skills, resume_skills)
-        
-        # FEATURE 13: Learning Path Recommendation
-        learning_paths = suggest_learning_paths(list(skill_gaps.keys())[:5])  # Top 5 missing skills
-        
-        # FEATURE 14: Job Role Recommendation
-        recommended_roles = self.recommend_job_roles(resume_skills, resume_clean)
-        
-        # FEATURE 15: Interview Questions
         matched_skills_list = list(set(resume_skills).intersection(set(jd_skills)))
         missing_skills_list = list(skill_gaps.keys())
-        interview_questions = self.generate_interview_questions(missing_skills_list, matched_skills_list)
         
-        # Categorize skills for better presentation
-        categorized_skills = categorize_skills(resume_skills)
-        
-        return {
+        result = {
             'final_score': round(final_score, 2),
             'semantic_score': round(semantic_score, 2),
             'skill_overlap_score': round(skill_overlap_score, 2),
@@ -241,31 +455,304 @@ class MLInferenceEngine:
             'confidence_score': confidence_score,
             'matched_skills': matched_skills_list,
             'missing_skills': missing_skills_list,
-            'skill_recommendations': skill_gaps,
-            'learning_paths': learning_paths,
-            'recommended_roles': recommended_roles,
-            'interview_questions': interview_questions,
-            'categorized_skills': categorized_skills,
-            'role_weights_applied': role_weights
+            'role_weights_applied': role_weights,
+            'analysis_tier': ANALYSIS_TIERS[0]
         }
+        result.update(self._enrichment(features, jd_profile, ANALYSIS_TIERS[0], tier))
+        return result
+    
+    def _enrichment(self, features: dict, jd_profile: JDProfile, from_tier: str, to_tier: str):
+        """Fields added by the tiers above from_tier, up to and including to_tier"""
+        fields = {}
+        start, target = tier_level(from_tier), tier_level(to_tier)
+        if start >= target:
+            return fields
+        
+        resume_skills = features['skills']
+        jd_skills = jd_profile.skills
+        
+        if start < tier_level("standard") <= target:
+            skill_gaps = recommend_skills(jd_skills, resume_skills)
+            matched_skills_list = list(set(resume_skills).intersection(set(jd_skills)))
+            missing_skills_list = list(skill_gaps.keys())
+            fields.update({
+                'skill_recommendations': skill_gaps,
+                # FEATURE 13: Learning Path Recommendation
+                'learning_paths': suggest_learning_paths(missing_skills_list[:5]),  # Top 5 missing skills
+                # FEATURE 14: Job Role Recommendation
+                'recommended_roles': self.recommend_job_roles(resume_skills, features['clean_text']),
+                # FEATURE 15: Interview Questions
+                'interview_questions': self.generate_interview_questions(missing_skills_list, matched_skills_list),
+                # Categorize skills for better presentation
+                'categorized_skills': categorize_skills(resume_skills)
+            })
+            fields['analysis_tier'] = "standard"
         
-        # Merge comprehensive data
-        structured_data = comprehensive_parser.parse(resume_text_raw)
-        result.update({
-            'email': structured_data['contact_info'].get('email'),
-            'phone': structured_data['contact_info'].get('phone'),
-            'linkedin_url': structured_data['contact_info'].get('linkedin'),
-            'github_url': structured_data['contact_info'].get('github'),
-            'location': structured_data['contact_info'].get('location'),
+        if start < tier_level("full") <= target:
+            try:
+                fields.update(self._structured_profile(features['raw_text']))
+                fields['analysis_tier'] = "full"
+            except Exception as e:
+                # Leave the tier below full so the next detail view retries
+                print(f"⚠ Structured parsing failed: {e}")
+        
+        return fields
+    
+    def _structured_profile(self, raw_text: str):
+        """Contact info and detailed history from the comprehensive (spaCy) parser"""
+        # Imported on first use: loading the spaCy pipeline is only paid by full-tier analyses
+        from src.feature_extraction.comprehensive_parser import parser as comprehensive_parser
+        
+        structured_data = comprehensive_parser.parse(raw_text)
+        contact_info = structured_data['contact_info']
+        return {
+            'email': contact_info.get('email'),
+            'phone': contact_info.get('phone'),
+            'linkedin_url': contact_info.get('linkedin'),
+            'github_url': contact_info.get('github'),
+            'portfolio_url': contact_info.get('portfolio'),
+            'location': contact_info.get('location'),
             'education_history': structured_data.get('education', []),
             'experience_history': structured_data.get('experience', []),
             'projects': structured_data.get('projects', []),
             'certifications': structured_data.get('certifications', [])
-        })
+        }
+    
+    def enrich_result(self, result: dict, resume_path: str, jd_text: str, job_role: str = None,
+                      tier: str = "full", encoder_tier: str = None):
+        """
+        Bring a stored result up to a higher tier (e.g. when its detail view is opened)
         
-        return result
+        Args:
+            result: Previously computed analysis result
+            resume_path: Resume file the result was computed from
+            jd_text: Job description text
+            job_role: Target job role (the one the job was scored with)
+            tier: Tier to reach
+            encoder_tier: Encoder tier the job was scored with
+            
+        Returns:
+            Dictionary of the added fields (empty if the result is already at that tier)
+        """
+        current = result.get('analysis_tier')
+        if tier_level(current) >= tier_level(tier):
+            return {}
+        features = self.extract_resume_features(resume_path)
+        # Enrichment only reads the JD's skills: the profile's embedding is never encoded here
+        jd_profile = self.build_jd_profile(jd_text, job_role, encoder_tier)
+        return self._enrichment(features, jd_profile, current, tier)
+    
+    def _get_extraction_pool(self, workers: int = None):
+        """Worker pool for the extraction stage, recreated only if the size changes"""
+        workers = resolve_worker_count(workers)
+        pool = self._extraction_pool
+        if pool is None or pool.workers != workers:
+            if pool is not None:
+                pool.shutdown()
+            pool = ExtractionPool(workers)
+            self._extraction_pool = pool
+        return pool
+    
+    def _iter_staged(self, resume_paths: list, jd_profile: JDProfile, workers: int = None,
+                     tier: str = DEFAULT_ANALYSIS_TIER, texts: dict = None):
+        """
+        Stage-at-a-time batch: extract everything, encode everything, then score
+        Yields (index, resume_path, result or None, error or None)
+        """
+        # Stage 1: parse and extract every resume across the process pool
+        # (per-file error isolation; results come back in input order)
+        extracted = []
+        for idx, (resume_path, features, error) in enumerate(self._get_extraction_pool(workers).map(resume_paths)):
+            if error is not None:
+                yield idx, resume_path, None, error
+                continue
+            if texts is not None:
+                texts[resume_path] = features['clean_text']
+            extracted.append((idx, resume_path, features))
+        
+        # Stage 2: one batched encode for all resumes, scored with a single matrix-vector product
+        semantic_scores = batch_similarity_to_embedding(
+            [features['clean_text'] for _, _, features in extracted],
+            jd_profile.embedding,
+            tier=jd_profile.encoder_tier
+        )
+        
+        # Stage 3: combine scores and enrich
+        for (idx, resume_path, features), semantic_score in zip(extracted, semantic_scores):
+            try:
+                result = self.score_resume(features, semantic_score, jd_profile, tier)
+                result['filename'] = os.path.basename(resume_path)
+                yield idx, resume_path, result, None
+            except Exception as e:
+                yield idx, resume_path, None, str(e)
+    
+    def _iter_cascade(self, resume_paths: list, jd_profile: JDProfile, top_k: int,
+                      min_skill_overlap: float, min_experience_ratio: float, workers: int, report: dict,
+                      tier: str = DEFAULT_ANALYSIS_TIER, texts: dict = None):
+        """
+        Cascade ranking: cheap filters first, expensive scoring only for survivors
+        
+        - Stage 1: set-based skill overlap and required-experience check, plus
+          pruning of candidates whose best possible score cannot reach the top K
+        - Stage 2: batched semantic scores and core final score for the survivors
+        - Stage 3: enrichment up to the requested tier (score_resume) for the final top K only
+        
+        Yields (index, resume_path, result or None, error or None) for failures and the top K
+        """
+        extracted = []
+        for idx, (resume_path, features, error) in enumerate(self._get_extraction_pool(workers).map(resume_paths)):
+            if error is not None:
+                yield idx, resume_path, None, error
+                continue
+            if texts is not None:
+                texts[resume_path] = features['clean_text']
+            extracted.append((idx, resume_path, features))
+        if not extracted:
+            return
+        
+        # Stage 1: partial score from skills, experience and education (no model calls)
+        weights = jd_profile.role_weights
+        jd_skill_count = len(jd_profile.skill_set)
+        overlap = np.array([
+            len(jd_profile.skill_set.intersection(features['skills'])) / jd_skill_count * 100 if jd_skill_count else 0.0
+            for _, _, features in extracted
+        ])
+        years = np.array([features['experience_years'] for _, _, features in extracted], dtype=np.float64)
+        required = jd_profile.required_experience
+        exp_scores = np.array([experience_score(y, required) for y in years], dtype=np.float64)
+        education = np.array([features['education_score'] for _, _, features in extracted], dtype=np.float64)
+        partial = overlap * weights['skills'] + exp_scores * weights['experience'] + education * weights['education']
+        
+        # Bounds over the unknown semantic score: a cosine, so -100 to 100 (final scoring
+        # does not clamp it, and a negative similarity lowers the final score)
+        lower = np.minimum(100.0, partial - 100.0 * weights['semantic'])
+        upper = np.minimum(100.0, partial + 100.0 * weights['semantic'])
+        
+        passes = np.ones(len(extracted), dtype=bool)
+        if jd_skill_count:
+            passes &= overlap >= min_skill_overlap
+        if required:
+            passes &= years >= required * min_experience_ratio
+        # Thresholds never leave fewer than K candidates: refill with the best of the rest
+        if passes.sum() < top_k:
+            refill = [i for i in np.argsort(-upper, kind='stable') if not passes[i]][:top_k - int(passes.sum())]
+            passes[refill] = True
+        # A candidate whose upper bound is below the K-th best lower bound cannot make the top K
+        survivors = np.flatnonzero(passes)
+        if len(survivors) > top_k:
+            kth_lower = np.sort(lower[survivors])[::-1][top_k - 1]
+            survivors = survivors[upper[survivors] >= kth_lower]
+        report['stage1_pruned'] = len(extracted) - len(survivors)
+        
+        # Stage 2: semantic scores and core final score for the survivors only
+        survivor_features = [extracted[i][2] for i in survivors]
+        scores = score_matrix(survivor_features, [jd_profile])
+        order = np.argsort(-scores['final'][:, 0], kind='stable')[:top_k]
+        report['stage2_scored'] = len(survivors)
+        report['stage2_pruned'] = len(survivors) - len(order)
+        
+        # Stage 3: full enrichment for the final top K
+        for pos in order:
+            idx, resume_path, features = extracted[survivors[pos]]
+            try:
+                result = self.score_resume(features, float(scores['semantic'][pos, 0]), jd_profile, tier)
+                result['filename'] = os.path.basename(resume_path)
+                report['enriched'] += 1
+                yield idx, resume_path, result, None
+            except Exception as e:
+                yield idx, resume_path, None, str(e)
+    
+    def iter_batch_analyze(self, resume_paths: list, jd_text: str, job_role: str = "Data Scientist",
+                           workers: int = None, pipelined: bool = None, cascade: bool = False,
+                           top_k: int = CASCADE_TOP_K, min_skill_overlap: float = CASCADE_MIN_SKILL_OVERLAP,
+                           min_experience_ratio: float = CASCADE_MIN_EXPERIENCE_RATIO, report: dict = None,
+                           tier: str = DEFAULT_ANALYSIS_TIER, predict_batch: int = None,
+                           encoder_tier: str = None, texts: dict = None):
+        """
+        Streaming form of batch_analyze: yields each resume as soon as it is scored
+        
+        Cached results come first, then fresh ones in completion order. In cascade
+        mode resumes pruned before the final stage are not yielded (see report).
+        
+        Args:
+            (as batch_analyze)
+            predict_batch: Yield after every this many scored resumes, with their classifier
+                probabilities predicted together (None = one call once everything is scored)
+            texts: Optional dict filled with resume path -> cleaned text for every resume
+                extracted here (cached results are not extracted), e.g. for the talent pool
+            
+        Yields:
+            (upload index, result, None) or (upload index, None, error message)
+        """
+        job_role = job_role or detect_role_from_jd(jd_text)
+        stage_counts = {'total': len(resume_paths), 'cached': 0, 'failed': 0, 'stage1_pruned': 0,
+                        'stage2_scored': 0, 'stage2_pruned': 0, 'enriched': 0}
+        
+        # Serve previously scored (resume, JD, role) combinations from the result cache
+        keys = {}
+        pending = []
+        self.refresh_model()
+        cache = self.get_result_cache()
+        jd_hash = jd_digest(jd_text) if cache is not None else None
+        for idx, resume_path in enumerate(resume_paths):
+            key = (self._result_key(cache, resume_path, jd_hash, job_role, tier, encoder_tier)
+                   if cache is not None else None)
+            cached = cache.get(key) if key is not None else None
+            if cached is not None:
+                cached['filename'] = os.path.basename(resume_path)
+                stage_counts['cached'] += 1
+                yield idx, cached, None
+                continue
+            keys[idx] = key
+            pending.append(idx)
+        
+        if pending:
+            pending_paths = [resume_paths[idx] for idx in pending]
+            
+            # JD cleaning, skill scan and encoding happen once for the whole batch
+            jd_profile = self.build_jd_profile(jd_text, job_role, encoder_tier)
+            
+            if pipelined is None:
+                pipelined = len(pending_paths) >= PIPELINE_MIN_BATCH
+            
+            if cascade:
+                scored = self._iter_cascade(pending_paths, jd_profile, top_k, min_skill_overlap,
+                                            min_experience_ratio, workers, stage_counts, tier, texts)
+            elif pipelined:
+                executor = PipelinedBatchExecutor(self, self._get_extraction_pool(workers), tier=tier)
+                scored = executor.run(pending_paths, jd_profile, texts)
+            else:
+                scored = self._iter_staged(pending_paths, jd_profile, workers, tier, texts)
+            
+            def finish(fresh):
+                # One classifier call per group of newly scored candidates
+                self.predict_match_probabilities([result for _, result in fresh])
+                for idx, result in fresh:
+                    if keys[idx] is not None:
+                        cache.put(keys[idx], result)
+                    yield idx, result, None
+            
+            fresh = []
+            for pending_idx, resume_path, result, error in scored:
+                if error is not None:
+                    print(f"❌ Error analyzing {resume_path}: {error}")
+                    stage_counts['failed'] += 1
+                    yield pending[pending_idx], None, str(error)
+                    continue
+                fresh.append((pending[pending_idx], result))
+                if predict_batch and len(fresh) >= predict_batch:
+                    yield from finish(fresh)
+                    fresh = []
+            yield from finish(fresh)
+        
+        if report is not None:
+            report.update(stage_counts)
     
-    def batch_analyze(self, resume_paths: list, jd_text: str, job_role: str = "Data Scientist"):
+    def batch_analyze(self, resume_paths: list, jd_text: str, job_role: str = "Data Scientist",
+                      workers: int = None, pipelined: bool = None, cascade: bool = False,
+                      top_k: int = CASCADE_TOP_K, min_skill_overlap: float = CASCADE_MIN_SKILL_OVERLAP,
+                      min_experience_ratio: float = CASCADE_MIN_EXPERIENCE_RATIO, report: dict = None,
+                      tier: str = DEFAULT_ANALYSIS_TIER, encoder_tier: str = None):
         """
         FEATURE 19: Batch Resume Processing
         Analyze multiple resumes against a job description
@@ -274,33 +761,384 @@ class MLInferenceEngine:
             resume_paths: List of resume file paths
             jd_text: Job description text
             job_role: Target job role
+            workers: Extraction processes (None = BATCH_WORKERS, 0 = auto, 1 = sequential)
+            pipelined: Stream through the stage pipeline (default: batches >= PIPELINE_MIN_BATCH)
+            cascade: Return only the top_k candidates, pruning cheaply before semantic scoring
+            top_k: Candidates returned in cascade mode
+            min_skill_overlap: Cascade stage 1 minimum JD skill coverage (%)
+            min_experience_ratio: Cascade stage 1 minimum fraction of the required years
+            report: Optional dict filled with per-stage candidate counts in cascade mode
+            tier: Analysis tier for every returned candidate (see ANALYSIS_TIERS)
+            encoder_tier: Encoder tier for the semantic scores (see ENCODER_TIERS)
             
         Returns:
             List of analysis results sorted by score
         """
-        results = []
+        ranked = [
+            (idx, result) for idx, result, error in self.iter_batch_analyze(
+                resume_paths, jd_text, job_role, workers=workers, pipelined=pipelined, cascade=cascade,
+                top_k=top_k, min_skill_overlap=min_skill_overlap, min_experience_ratio=min_experience_ratio,
+                report=report, tier=tier, encoder_tier=encoder_tier
+            )
+            if error is None
+        ]
+        return rank_results(ranked, top_k if cascade else None)
+    
+    def matrix_analyze(self, resume_paths: list, jd_texts: dict, top_n: int = None,
+                       best_fit_count: int = 3, workers: int = None, encoder_tier: str = None):
+        """
+        Place a pool of resumes across several job descriptions at once
+        Every resume is extracted and embedded once and every JD profiled and
+        embedded once; all pairs are scored by score_matrix, without
+        per-pair analyze_resume calls (so no recommendations or questions).
         
-        for resume_path in resume_paths:
+        Args:
+            resume_paths: List of resume file paths
+            jd_texts: Mapping of JD name (e.g. filename) -> JD text
+            top_n: Candidates kept per JD ranking (None = all)
+            best_fit_count: JDs listed per resume
+            workers: Extraction processes (see batch_analyze)
+            encoder_tier: Encoder tier for the semantic scores (see ENCODER_TIERS)
+            
+        Returns:
+            Dictionary with 'jobs' (role/skills per JD), 'jd_rankings'
+            (JD name -> candidates, best first), 'resume_best_fit'
+            (per resume, its best JDs) and 'errors'
+        """
+        self.refresh_model()
+        jd_names = list(jd_texts)
+        jd_profiles = build_jd_profiles([jd_texts[name] for name in jd_names], encoder_tier=encoder_tier)
+        jobs = {
+            name: {
+                'job_role': profile.job_role,
+                'required_experience': profile.required_experience,
+                'skills': sorted(profile.skill_set)
+            }
+            for name, profile in zip(jd_names, jd_profiles)
+        }
+        
+        extracted, errors = [], []
+        for resume_path, features, error in self._get_extraction_pool(workers).map(resume_paths):
+            if error is not None:
+                print(f"❌ Error analyzing {resume_path}: {error}")
+                errors.append({'filename': os.path.basename(resume_path), 'error': error})
+                continue
+            features.pop('raw_text', None)
+            extracted.append((os.path.basename(resume_path), features))
+        
+        if not extracted or not jd_profiles:
+            return {'jobs': jobs, 'jd_rankings': {name: [] for name in jd_names},
+                    'resume_best_fit': [], 'errors': errors}
+        
+        scores = score_matrix([features for _, features in extracted], jd_profiles)
+        
+        # Classifier probabilities for all pairs in one predict_proba call
+        probabilities = None
+        if self._model is not None:
             try:
-                result = self.analyze_resume(resume_path, jd_text, job_role)
-                result['filename'] = os.path.basename(resume_path)
-                results.append(result)
+                probabilities = predict_match_probability(self._model, {
+                    'semantic_score': scores['semantic'].ravel(),
+                    'experience_score': scores['experience'].ravel(),
+                    'skill_overlap': scores['skill_matches'].ravel(),
+                    'education_score': np.repeat(scores['education'], len(jd_profiles))
+                }).reshape(scores['final'].shape)
             except Exception as e:
-                print(f"❌ Error analyzing {resume_path}: {e}")
-                continue
+                print(f"⚠ Model scoring failed: {e}")
+        
+        def pair_scores(i, j):
+            final_score = float(scores['final'][i, j])
+            pair = {
+                'final_score': round(final_score, 2),
+                'semantic_score': round(float(scores['semantic'][i, j]), 2),
+                'skill_overlap_score': round(float(scores['skill_overlap'][i, j]), 2),
+                'experience_score': round(float(scores['experience'][i, j]), 2),
+                'education_score': round(float(scores['education'][i]), 2),
+                'match_classification': self.classify_match_level(final_score)
+            }
+            if probabilities is not None:
+                pair['model_match_probability'] = round(float(probabilities[i, j]) * 100, 2)
+            return pair
+        
+        # Per-JD rankings (ties keep upload order)
+        jd_rankings = {}
+        for j, name in enumerate(jd_names):
+            order = np.argsort(-scores['final'][:, j], kind='stable')[:top_n]
+            jd_rankings[name] = [
+                {'rank': rank, 'filename': extracted[i][0], **pair_scores(i, j)}
+                for rank, i in enumerate(order, 1)
+            ]
+        
+        # Per-resume best-fit JDs
+        resume_best_fit = []
+        for i, (filename, _) in enumerate(extracted):
+            order = np.argsort(-scores['final'][i], kind='stable')[:best_fit_count]
+            resume_best_fit.append({
+                'filename': filename,
+                'best_fit': [{'jd': jd_names[j], 'job_role': jd_profiles[j].job_role, **pair_scores(i, j)}
+                             for j in order]
+            })
+        
+        return {'jobs': jobs, 'jd_rankings': jd_rankings, 'resume_best_fit': resume_best_fit, 'errors': errors}
+    
+    def search_talent_pool(self, jd_text: str, job_role: str = None, top_k: int = TALENT_POOL_DEFAULT_K):
+        """
+        Match a JD against every previously analysed resume
+        Candidates are retrieved by embedding similarity from the talent pool;
+        only the top K go through full scoring.
+        
+        Args:
+            jd_text: Job description text
+            job_role: Target job role (detected from the JD when omitted)
+            top_k: Candidates to retrieve and score
+            
+        Returns:
+            List of analysis results sorted by score, each with its
+            'retrieval_score' and the 'job_id' it was last uploaded with
+        """
+        pool = get_talent_pool()
+        if pool is None:
+            return []
+        
+        # The query is embedded with the pool's own encoder tier
+        jd_profile = self.build_jd_profile(jd_text, job_role, pool.encoder_tier)
+        hits = pool.search(jd_profile.embedding, top_k)
+        locations = pool.locations([resume_hash for resume_hash, _ in hits])
         
-        # Sort by final score (descending)
-        results.sort(key=lambda x: x['final_score'], reverse=True)
+        results = []
+        for resume_hash, similarity in hits:
+            location = locations.get(resume_hash)
+            if location is None or not os.path.exists(location['resume_path']):
+                print(f"⚠ Talent pool candidate {resume_hash[:12]} has no stored file")
+                continue
+            try:
+                result = self.analyze_resume(location['resume_path'], jd_text, jd_profile=jd_profile)
+            except Exception as e:
+                print(f"❌ Error analyzing {location['resume_path']}: {e}")
+                continue
+            result['filename'] = location['filename']
+            result['job_id'] = location['job_id']
+            result['retrieval_score'] = round(similarity * 100, 2)
+            results.append(result)
         
-        # Add ranks
+        results.sort(key=lambda r: r['final_score'], reverse=True)
         for idx, result in enumerate(results):
             result['rank'] = idx + 1
-        
         return results
     
     def is_model_loaded(self):
         """Check if model is loaded"""
         return self._model_loaded
 
+
+# Pipelined batch executor settings
+PIPELINE_MIN_BATCH = int(os.getenv("PIPELINE_MIN_BATCH", "64"))
+PIPELINE_PARSE_THREADS = int(os.getenv("PIPELINE_PARSE_THREADS", "2"))
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "64"))
+PIPELINE_MAX_BATCH_WAIT = float(os.getenv("PIPELINE_MAX_BATCH_WAIT", "0.05"))
+
+# End-of-stream marker passed between pipeline stages
+_STAGE_DONE = object()
+
+class PipelinedBatchExecutor:
+    """
+    Streams resumes through parse -> extract -> embed -> score stages
+    
+    - parse: a few threads running pdfplumber/docx text extraction
+    - extract: cleaning and skill/experience/education extraction in worker processes
+    - embed: a single encoder thread that forms micro-batches as items arrive
+    - score: the consuming thread combines scores and enriches each candidate
+    
+    Stages are connected by bounded queues, so a slow stage blocks the ones
+    upstream of it and memory stays flat regardless of job size.
+    """
+    
+    _POLL_INTERVAL = 0.1
+    
+    def __init__(self, engine, extraction_pool, parse_threads: int = PIPELINE_PARSE_THREADS,
+                 queue_size: int = PIPELINE_QUEUE_SIZE, embed_batch_size: int = ENCODE_BATCH_SIZE,
+                 max_batch_wait: float = PIPELINE_MAX_BATCH_WAIT, tier: str = DEFAULT_ANALYSIS_TIER):
+        self.engine = engine
+        self.extraction_pool = extraction_pool
+        self.parse_threads = max(1, parse_threads)
+        self.queue_size = max(1, queue_size)
+        self.embed_batch_size = max(1, embed_batch_size)
+        self.max_batch_wait = max_batch_wait
+        self.tier = tier
+        self._failure = None
+    
+    def _put(self, q, item, stop):
+        """Blocking put that gives up once the pipeline is stopping"""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=self._POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def _get(self, q, stop, timeout=None):
+        """Blocking get; returns _STAGE_DONE when stopping (or None on timeout)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not stop.is_set():
+            wait = self._POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    return None
+            try:
+                return q.get(timeout=wait)
+            except queue.Empty:
+                continue
+        return _STAGE_DONE
+    
+    def _stage(self, body, downstream, stop):
+        """Run a stage body; always signal end-of-stream downstream, record failures"""
+        def runner():
+            try:
+                body()
+            except Exception as e:
+                self._failure = e
+                stop.set()
+            finally:
+                self._put(downstream, _STAGE_DONE, stop)
+        thread = threading.Thread(target=runner, daemon=True)
+        thread.start()
+        return thread
+    
+    def _parse_stage(self, path_q, text_q, stop):
+        def parse_worker():
+            while not stop.is_set():
+                try:
+                    idx, resume_path = path_q.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    item = (idx, resume_path, extract_text(resume_path), None)
+                except Exception as e:
+                    item = (idx, resume_path, None, str(e))
+                if not self._put(text_q, item, stop):
+                    return
+        
+        workers = [threading.Thread(target=parse_worker, daemon=True) for _ in range(self.parse_threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+    
+    def _extract_stage(self, text_q, feature_q, stop):
+        # FIFO of in-flight tasks; its length bounds outstanding work in the pool
+        in_flight = deque()
+        parallel = self.extraction_pool.workers > 1
+        
+        def emit_oldest():
+            idx, resume_path, raw_text, future, error = in_flight.popleft()
+            features = None
+            if future is not None:
+                features, error = future.result()
+            if features is not None:
+                features['raw_text'] = raw_text
+            return self._put(feature_q, (idx, resume_path, features, error), stop)
+        
+        while True:
+            item = self._get(text_q, stop)
+            if item is _STAGE_DONE:
+                break
+            idx, resume_path, raw_text, error = item
+            
+            future = None
+            if error is None:
+                if parallel:
+                    future = self.extraction_pool.submit(extract_from_text, raw_text)
+                else:
+                    future = Future()
+                    future.set_result(extract_from_text(raw_text))
+            in_flight.append((idx, resume_path, raw_text, future, error))
+            
+            if len(in_flight) >= self.queue_size and not emit_oldest():
+                return
+        
+        while in_flight:
+            if not emit_oldest():
+                return
+    
+    def _embed_stage(self, feature_q, scored_q, jd_profile, stop):
+        finished = False
+        while not finished:
+            item = self._get(feature_q, stop)
+            if item is _STAGE_DONE:
+                break
+            
+            # Micro-batch: take what is ready, up to the batch size or the wait deadline
+            batch = [item]
+            deadline = time.monotonic() + self.max_batch_wait
+            while len(batch) < self.embed_batch_size:
+                nxt = self._get(feature_q, stop, timeout=max(0.0, deadline - time.monotonic()))
+                if nxt is None:
+                    break
+                if nxt is _STAGE_DONE:
+                    finished = True
+                    break
+                batch.append(nxt)
+            
+            ready = [entry for entry in batch if entry[2] is not None]
+            scores = batch_similarity_to_embedding(
+                [features['clean_text'] for _, _, features, _ in ready],
+                jd_profile.embedding,
+                batch_size=self.embed_batch_size,
+                tier=jd_profile.encoder_tier
+            )
+            score_by_idx = {entry[0]: score for entry, score in zip(ready, scores)}
+            
+            for idx, resume_path, features, error in batch:
+                if not self._put(scored_q, (idx, resume_path, features, score_by_idx.get(idx), error), stop):
+                    return
+    
+    def run(self, resume_paths: list, jd_profile: JDProfile, texts: dict = None):
+        """
+        Generator yielding (index, resume_path, result or None, error or None)
+        as each candidate completes (not in input order); texts, if given, is
+        filled with resume path -> cleaned text
+        """
+        stop = threading.Event()
+        self._failure = None
+        
+        path_q = queue.Queue()
+        for item in enumerate(resume_paths):
+            path_q.put(item)
+        text_q = queue.Queue(maxsize=self.queue_size)
+        feature_q = queue.Queue(maxsize=self.queue_size)
+        scored_q = queue.Queue(maxsize=self.queue_size)
+        
+        threads = [
+            self._stage(lambda: self._parse_stage(path_q, text_q, stop), text_q, stop),
+            self._stage(lambda: self._extract_stage(text_q, feature_q, stop), feature_q, stop),
+            self._stage(lambda: self._embed_stage(feature_q, scored_q, jd_profile, stop), scored_q, stop),
+        ]
+        
+        try:
+            while True:
+                item = self._get(scored_q, stop)
+                if item is _STAGE_DONE:
+                    break
+                idx, resume_path, features, semantic_score, error = item
+                if error is not None:
+                    yield idx, resume_path, None, error
+                    continue
+                if texts is not None:
+                    texts[resume_path] = features['clean_text']
+                try:
+                    result = self.engine.score_resume(features, semantic_score, jd_profile, self.tier)
+                    result['filename'] = os.path.basename(resume_path)
+                    yield idx, resume_path, result, None
+                except Exception as e:
+                    yield idx, resume_path, None, str(e)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+        
+        if self._failure is not None:
+            raise self._failure
+
 # Global inference engine instance
 inference_engine = MLInferenceEngine()
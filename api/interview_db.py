@@ -36,6 +36,3 @@ def get_interviews_db(user_email: str) -> List[Dict]:
     rows = conn.execute('SELECT * FROM interviews WHERE user_email = ? ORDER BY date, time', (user_email,)).fetchall()
     conn.close()
     return [dict(row) for row in rows]
-
-# Initialize on import
-init_interview_table()
@@ -0,0 +1,274 @@
+"""
+Durable Job Queue
+Analysis jobs in a SQLite (WAL) table shared by every web and analysis worker
+on the host, replacing the per-process jobs dict.
+
+Web workers create and enqueue jobs and read their progress; analysis workers
+claim queued jobs under a lease, renew it with heartbeats while they run and
+write progress with each renewal. A job whose lease runs out (worker killed)
+is claimed again by another worker, up to JOB_MAX_ATTEMPTS times; after that
+it is marked failed, in the queue and in the job history.
+"""
+
+import os
+import json
+import time
+import sqlite3
+from datetime import datetime
+
+from api.history_db import update_job_completion
+
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", "job_queue.db")
+
+# Seconds a claimed job stays owned by its worker without a heartbeat
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "60"))
+
+# Claims of a job (including ones whose worker died) before it is marked failed
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+JOB_STATUSES = ('uploaded', 'queued', 'processing', 'completed', 'failed')
+
+
+class JobQueue:
+    """
+    Job table with lease-based claiming
+    A job's payload (file paths, options) is fixed once queued; its state
+    (progress details) is rewritten by the owning worker on every heartbeat.
+    """
+
+    def __init__(self, path=None, lease_seconds=None, max_attempts=None):
+        self.path = path or JOB_QUEUE_PATH
+        self.lease_seconds = JOB_LEASE_SECONDS if lease_seconds is None else lease_seconds
+        self.max_attempts = JOB_MAX_ATTEMPTS if max_attempts is None else max_attempts
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,  -- 'analysis' or 'matrix'
+                    status TEXT NOT NULL,  -- uploaded, queued, processing, completed, failed
+                    payload TEXT NOT NULL,  -- JSON: file paths and options
+                    state TEXT NOT NULL DEFAULT '{}',  -- JSON: progress details from the worker
+                    result TEXT,  -- JSON: output kept with the job (matrix analyses)
+                    progress INTEGER NOT NULL DEFAULT 0,
+                    revision INTEGER NOT NULL DEFAULT 0,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    worker_id TEXT,
+                    lease_expires REAL,
+                    error TEXT,
+                    created_at TIMESTAMP NOT NULL,
+                    queued_at REAL,
+                    updated_at REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs(status, queued_at)')
+            self._initialized = True
+        return conn
+
+    def create(self, job_id, kind, payload, queued=False):
+        """Add a job; queued=True makes it claimable immediately"""
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute('''
+                INSERT INTO jobs (job_id, kind, status, payload, created_at, queued_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (job_id, kind, 'queued' if queued else 'uploaded', json.dumps(payload),
+                  datetime.now(), now if queued else None, now))
+        finally:
+            conn.close()
+
+    def get(self, job_id):
+        """
+        Job as a flat dictionary (payload and state fields merged in), or None
+
+        Includes job_id, kind, status, progress, revision, attempts, error and created_at;
+        the result column is only read by get_result.
+        """
+        conn = self._connect()
+        try:
+            row = conn.execute('''
+                SELECT job_id, kind, status, payload, state, progress, revision, attempts, error, created_at
+                FROM jobs WHERE job_id = ?
+            ''', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        job = json.loads(row['payload'])
+        job.update(json.loads(row['state']))
+        job.update({key: row[key] for key in ('job_id', 'kind', 'status', 'progress', 'revision', 'attempts', 'error')})
+        created_at = row['created_at']
+        job['created_at'] = datetime.fromisoformat(created_at) if isinstance(created_at, str) else created_at
+        return job
+
+    def get_result(self, job_id):
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT result FROM jobs WHERE job_id = ?', (job_id,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row['result']) if row is not None and row['result'] else None
+
+    def enqueue(self, job_id, options=None):
+        """
+        Queue an uploaded job, merging options into its payload
+
+        Returns:
+            False if the job is not in the 'uploaded' state
+        """
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT payload FROM jobs WHERE job_id = ? AND status = ?',
+                               (job_id, 'uploaded')).fetchone()
+            if row is None:
+                conn.execute('ROLLBACK')
+                return False
+            payload = json.loads(row['payload'])
+            payload.update(options or {})
+            now = time.time()
+            conn.execute('''
+                UPDATE jobs SET status = 'queued', payload = ?, queued_at = ?, updated_at = ?,
+                                revision = revision + 1
+                WHERE job_id = ?
+            ''', (json.dumps(payload), now, now, job_id))
+            conn.execute('COMMIT')
+            return True
+        finally:
+            conn.close()
+
+    def claim(self, worker_id, kinds=None):
+        """
+        Take the oldest queued job (or one whose worker's lease expired)
+
+        Returns:
+            The claimed job (see get), or None when there is nothing to do
+        """
+        conn = self._connect()
+        try:
+            while True:
+                now = time.time()
+                conn.execute('BEGIN IMMEDIATE')
+                query = '''
+                    SELECT job_id, attempts FROM jobs
+                    WHERE (status = 'queued' OR (status = 'processing' AND lease_expires < ?))
+                '''
+                params = [now]
+                if kinds:
+                    query += f" AND kind IN ({','.join('?' * len(kinds))})"
+                    params.extend(kinds)
+                row = conn.execute(query + ' ORDER BY queued_at LIMIT 1', params).fetchone()
+                if row is None:
+                    conn.execute('ROLLBACK')
+                    return None
+
+                if row['attempts'] >= self.max_attempts:
+                    # Its workers keep dying: stop retrying
+                    error = f"Abandoned after {row['attempts']} attempts"
+                    conn.execute('''
+                        UPDATE jobs SET status = 'failed', error = ?, worker_id = NULL, lease_expires = NULL,
+                                        updated_at = ?, revision = revision + 1
+                        WHERE job_id = ?
+                    ''', (error, now, row['job_id']))
+                    conn.execute('COMMIT')
+                    # No worker is left to record the failure in the job history
+                    try:
+                        update_job_completion(row['job_id'], 'failed', processing_time=0, error_message=error)
+                    except sqlite3.Error as e:
+                        print(f"⚠ Could not record abandoned job {row['job_id']} in the history: {e}")
+                    continue
+
+                conn.execute('''
+                    UPDATE jobs SET status = 'processing', worker_id = ?, lease_expires = ?,
+                                    attempts = attempts + 1, updated_at = ?, revision = revision + 1
+                    WHERE job_id = ?
+                ''', (worker_id, now + self.lease_seconds, now, row['job_id']))
+                conn.execute('COMMIT')
+                return self.get(row['job_id'])
+        finally:
+            conn.close()
+
+    def heartbeat(self, job_id, worker_id, progress=None, state=None):
+        """
+        Renew the lease and optionally publish progress
+
+        Returns:
+            False if the worker no longer owns the job (lease expired and reclaimed)
+        """
+        now = time.time()
+        assignments = ['lease_expires = ?', 'updated_at = ?']
+        params = [now + self.lease_seconds, now]
+        if progress is not None:
+            assignments.append('progress = ?')
+            params.append(int(progress))
+        if state is not None:
+            assignments += ['state = ?', 'revision = revision + 1']
+            params.append(json.dumps(state, default=str))
+        conn = self._connect()
+        try:
+            cursor = conn.execute(f'''
+                UPDATE jobs SET {', '.join(assignments)}
+                WHERE job_id = ? AND worker_id = ? AND status = 'processing'
+            ''', params + [job_id, worker_id])
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def finish(self, job_id, worker_id, status, state=None, result=None, error=None):
+        """
+        Record a job's outcome ('completed' or 'failed') and release it
+
+        Returns:
+            False if the worker no longer owns the job
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            cursor = conn.execute('''
+                UPDATE jobs SET status = ?, progress = ?, state = COALESCE(?, state), result = ?, error = ?,
+                                worker_id = NULL, lease_expires = NULL, updated_at = ?, revision = revision + 1
+                WHERE job_id = ? AND worker_id = ? AND status = 'processing'
+            ''', (status, 100 if status == 'completed' else 0,
+                  json.dumps(state, default=str) if state is not None else None,
+                  json.dumps(result, default=str) if result is not None else None,
+                  error, now, job_id, worker_id))
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def delete(self, job_id):
+        conn = self._connect()
+        try:
+            return conn.execute('DELETE FROM jobs WHERE job_id = ?', (job_id,)).rowcount > 0
+        finally:
+            conn.close()
+
+    def stats(self):
+        """Job counts per status"""
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute('SELECT status, COUNT(*) FROM jobs GROUP BY status').fetchall())
+        finally:
+            conn.close()
+        return {status: counts.get(status, 0) for status in JOB_STATUSES}
+
+
+_queue = None
+
+
+def get_job_queue():
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
@@ -3,30 +3,40 @@ FastAPI Main Application with RBAC
 REST API for Resume Matching System
 """
 
-from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks, Depends, status
+from fastapi import FastAPI, File, Form, UploadFile, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Dict, Optional, Any
 import os
+import json
 import uuid
 import time
+import asyncio
 from datetime import datetime, timedelta
 from pathlib import Path
 
 # Import internal modules
 from api.models import (
     UploadResponse, AnalysisResult, CandidateScore,
-    JobStatus, HealthResponse, StatusUpdate, Notification, NotificationReadRequest, UserSettings
+    JobStatus, HealthResponse, StatusUpdate, Notification, NotificationReadRequest, UserSettings,
+    ModelActivation
 )
-from api.inference import inference_engine
+from api.inference import inference_engine, ANALYSIS_TIERS, tier_level
+from api.job_queue import get_job_queue
+from api.analysis_worker import start_inline_worker, ranking_entry, PROVISIONAL_TOP_N
+from api.talent_pool import get_talent_pool, TALENT_POOL_DEFAULT_K
+from api.model_registry import get_model_registry, MODEL_REGISTRY_POLL_INTERVAL
 from api.history_db import (
-    save_analysis_job, update_job_completion, save_candidate_results,
+    save_analysis_job, get_candidate_result,
     get_all_jobs, delete_job, get_analytics_stats, get_job_results, get_job_by_id,
-    update_candidate_status, add_notification, get_notifications, mark_notifications_read,
+    update_candidate_status, update_candidate_enrichment, add_notification, get_notifications, mark_notifications_read,
     get_user_settings, update_user_settings
 )
 from src.matching.role_weights import detect_role_from_jd
+from src.preprocessing.text_cache import get_parsed_text_cache
+from src.matching.semantic_matcher_bert import encoder_stats, encoder_tier_available, ENCODER_TIERS
 
 # Import RBAC system
 from api.auth_endpoints import router as auth_router
@@ -35,9 +45,17 @@ from api.rbac import (
     get_current_active_user,
     require_recruiter_or_above,
     require_permission,
-    log_user_action
+    log_user_action,
+    require_stream_token,
+    create_stream_token,
+    STREAM_TOKEN_EXPIRE_MINUTES
 )
 from api.auth_utils import User, UserRole
+from api.startup import run_migrations, MIGRATE_ON_STARTUP, start_warm_up, warm_up_status
+
+# Schemas are migrated here only when nothing ran them before the workers started
+if MIGRATE_ON_STARTUP:
+    run_migrations()
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -69,9 +87,6 @@ app.add_middleware(
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-# In-memory job storage (use Redis/DB in production)
-jobs = {}
-
 # In-memory history and usage tracking
 analysis_history = []
 usage_limit = 1000
@@ -89,30 +104,53 @@ def add_to_history(filename: str, status: str, job_id: str):
     if len(analysis_history) > 50:
         analysis_history.pop(0)
 
+@app.on_event("startup")
+async def warm_up_models():
+    """Warm the models up in the background; /api/ready reports when this worker is done"""
+    start_warm_up()
+
+@app.on_event("startup")
+async def resume_queued_jobs():
+    """
+    Start the inline worker (if enabled) so jobs left queued or with an expired lease
+    by a restart are picked up without waiting for the next analysis request
+    """
+    start_inline_worker()
+
 # --- GENERAL ENDPOINTS ---
 
-@app.get("/", response_model=HealthResponse)
-async def root():
-    """API health check"""
+def health_response():
+    warmup = warm_up_status()
     return HealthResponse(
         status="healthy",
         version="2.0.0",
         model_loaded=inference_engine.is_model_loaded(),
-        timestamp=datetime.now()
+        timestamp=datetime.now(),
+        ready=warmup['ready'],
+        warmup_seconds=warmup['seconds']
     )
 
+@app.get("/", response_model=HealthResponse)
+async def root():
+    """API health check"""
+    return health_response()
+
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
-    """Detailed health check"""
-    return HealthResponse(
-        status="healthy",
-        version="2.0.0",
-        model_loaded=inference_engine.is_model_loaded(),
-        timestamp=datetime.now()
-    )
+    """Detailed health check (liveness: healthy while the models may still be warming up)"""
+    return health_response()
+
+@app.get("/api/ready")
+async def readiness_check():
+    """Readiness probe: 503 until this worker has finished its warm-up analyses"""
+    warmup = warm_up_status()
+    return JSONResponse(status_code=200 if warmup['ready'] else 503, content=warmup)
 
 # --- UPLOAD & ANALYSIS ENDPOINTS ---
 
+# Upper bound on candidates fully scored per talent pool search
+MAX_TALENT_POOL_K = 200
+
 @app.post("/api/upload", response_model=UploadResponse)
 async def upload_files(
     resumes: List[UploadFile] = File(...),
@@ -146,14 +184,12 @@ async def upload_files(
             f.write(content)
         resume_paths.append(str(resume_path))
     
-    # Store job metadata
-    jobs[job_id] = {
-        'status': 'uploaded',
+    # Store job metadata (queued by /api/analyze)
+    get_job_queue().create(job_id, 'analysis', {
         'jd_path': str(jd_path),
         'resume_paths': resume_paths,
-        'jd_filename': job_description.filename,
-        'created_at': datetime.now()
-    }
+        'jd_filename': job_description.filename
+    })
 
     # Save to persistent database
     save_analysis_job(
@@ -169,122 +205,165 @@ async def upload_files(
         files_uploaded=len(resumes)
     )
 
-def process_analysis(job_id: str):
-    """Background task to process analysis"""
-    try:
-        jobs[job_id]['status'] = 'processing'
-        jobs[job_id]['progress'] = 10
-        
-        # Read JD text
-        jd_path = jobs[job_id]['jd_path']
-        with open(jd_path, 'r', encoding='utf-8', errors='ignore') as f:
-            jd_text = f.read()
-        
-        jobs[job_id]['progress'] = 30
-        
-        # Analyze resumes
-        # Analyze resumes
-        # ATS ALIGNMENT: Detect Job Role for Weighting
-        job_role = detect_role_from_jd(jd_text)
-        
-        start_time = time.time()
-        results = inference_engine.batch_analyze(
-            jobs[job_id]['resume_paths'],
-            jd_text,
-            job_role=job_role
-        )
-        processing_time = time.time() - start_time
-        
-        jobs[job_id]['progress'] = 90
-        
-        # Store results
-        jobs[job_id]['results'] = results
-        jobs[job_id]['processing_time'] = processing_time
-        jobs[job_id]['status'] = 'completed'
-        jobs[job_id]['progress'] = 100
-        
-        # Calculate statistics
-        avg_score = float(sum(r['final_score'] for r in results) / len(results)) if results else 0.0
-        top_candidate = results[0]['filename'] if results else None
-        
-        # Save to persistent database
-        update_job_completion(
-            job_id=job_id,
-            status='completed',
-            processing_time=float(processing_time),
-            avg_score=avg_score,
-            top_candidate=top_candidate
-        )
-        save_candidate_results(job_id, results)
-
-        # NOTIFICATIONS: Real-time alerts
-        add_notification(
-            category='alert',
-            title='Analysis Complete',
-            content=f"Analysis detailed report for {len(results)} candidates is ready.",
-            meta={'job_id': job_id, 'type': 'job_complete'}
-        )
+# Seconds between SSE checks for new progress, and between keep-alive comments
+STREAM_POLL_INTERVAL = 0.5
+STREAM_KEEPALIVE_INTERVAL = 15
+
+def validate_encoder_tier(encoder: Optional[str]):
+    """400 for an unknown encoder tier, or one whose model is not installed on this server"""
+    if encoder is None:
+        return
+    if encoder not in ENCODER_TIERS:
+        raise HTTPException(status_code=400, detail=f"encoder must be one of {', '.join(ENCODER_TIERS)}")
+    if not encoder_tier_available(encoder):
+        raise HTTPException(status_code=400, detail=f"The {encoder} encoder tier is not installed on this server")
+
+@app.post("/api/matrix/upload")
+async def upload_matrix_files(
+    resumes: List[UploadFile] = File(...),
+    job_descriptions: List[UploadFile] = File(...),
+    encoder: Optional[str] = Form(None),
+    current_user: User = Depends(require_recruiter_or_above)
+):
+    """
+    Upload a pool of resumes and several job descriptions for matrix analysis
+    Every resume is scored against every JD; poll /api/status/{job_id},
+    then fetch /api/matrix/{job_id}. encoder selects the encoder tier (fast, standard, accurate).
+    """
+    validate_encoder_tier(encoder)
+    job_id = str(uuid.uuid4())
+    job_dir = UPLOAD_DIR / job_id
+    jd_dir = job_dir / "job_descriptions"
+    jd_dir.mkdir(parents=True, exist_ok=True)
+    
+    jd_paths = []
+    for jd in job_descriptions:
+        jd_path = jd_dir / jd.filename
+        with open(jd_path, "wb") as f:
+            f.write(await jd.read())
+        jd_paths.append(str(jd_path))
+    
+    resume_paths = []
+    for resume in resumes:
+        resume_path = job_dir / resume.filename
+        with open(resume_path, "wb") as f:
+            f.write(await resume.read())
+        resume_paths.append(str(resume_path))
+    
+    get_job_queue().create(job_id, 'matrix', {
+        'jd_paths': jd_paths,
+        'resume_paths': resume_paths,
+        'encoder_tier': encoder
+    }, queued=True)
+    start_inline_worker()
+    
+    return {"message": "Matrix analysis started", "job_id": job_id,
+            "resumes": len(resume_paths), "job_descriptions": len(jd_paths)}
 
-        # Check for top talent to send a 'Message'
-        top_talent = [c for c in results if c['final_score'] >= 85]
-        if top_talent:
-            add_notification(
-                category='message',
-                title='System AI Agent',
-                content=f"I found {len(top_talent)} candidates with a generic match score above 85%. You should review them immediately.",
-                meta={'job_id': job_id, 'count': len(top_talent), 'type': 'insight'}
-            )
-        
-        # MONITORING: Log predictions for drift detection
-        from src.monitoring.drift_monitor import drift_monitor
-        for r in results:
-            drift_monitor.log_prediction(r['final_score'])
-        
-    except Exception as e:
-        jobs[job_id]['status'] = 'failed'
-        jobs[job_id]['error'] = str(e)
-        
-        # Update database with failure
-        update_job_completion(
-            job_id=job_id,
-            status='failed',
-            processing_time=0,
-            error_message=str(e)
-        )
-        
-        # NOTIFICATION: Failure
-        add_notification(
-            category='alert',
-            title='Analysis Failed',
-            content=f"Job processing failed: {str(e)}",
-            meta={'job_id': job_id, 'type': 'job_failed'}
-        )
+@app.get("/api/matrix/{job_id}")
+async def get_matrix_results(
+    job_id: str,
+    top_n: Optional[int] = None,
+    current_user: User = Depends(require_recruiter_or_above)
+):
+    """Per-JD rankings and per-resume best-fit JDs of a matrix analysis"""
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None or job['kind'] != 'matrix':
+        raise HTTPException(status_code=404, detail="Matrix job not found")
+    if job['status'] != 'completed':
+        raise HTTPException(status_code=400, detail=f"Job status: {job['status']}")
+    
+    matrix = queue.get_result(job_id)
+    jd_rankings = matrix['jd_rankings']
+    if top_n is not None:
+        jd_rankings = {name: ranking[:top_n] for name, ranking in jd_rankings.items()}
+    
+    return {
+        'job_id': job_id,
+        'processing_time': job['processing_time'],
+        'jobs': matrix['jobs'],
+        'jd_rankings': jd_rankings,
+        'resume_best_fit': matrix['resume_best_fit'],
+        'errors': matrix['errors']
+    }
+
+@app.post("/api/talent-pool/search")
+async def search_talent_pool(
+    job_description: UploadFile = File(...),
+    top_k: int = Form(TALENT_POOL_DEFAULT_K),
+    current_user: User = Depends(require_recruiter_or_above)
+):
+    """
+    Match a new job description against all previously analysed resumes
+    Returns the top-K candidates from the talent pool with full scoring,
+    without re-uploading any resume
+    """
+    if not 1 <= top_k <= MAX_TALENT_POOL_K:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 1 and {MAX_TALENT_POOL_K}")
+    
+    pool = get_talent_pool()
+    if pool is None:
+        raise HTTPException(status_code=503, detail="Talent pool is disabled")
+    
+    jd_text = (await job_description.read()).decode('utf-8', errors='ignore')
+    job_role = detect_role_from_jd(jd_text)
+    
+    start_time = time.time()
+    candidates = await run_in_threadpool(inference_engine.search_talent_pool, jd_text, job_role, top_k)
+    
+    return {
+        'job_role': job_role,
+        'pool_size': pool.size(),
+        'top_k': top_k,
+        'processing_time': time.time() - start_time,
+        'candidates': candidates
+    }
 
 @app.post("/api/analyze/{job_id}")
 async def start_analysis(
     job_id: str, 
-    background_tasks: BackgroundTasks,
+    cascade: bool = False,
+    top_k: Optional[int] = None,
+    tier: Optional[str] = None,
+    encoder: Optional[str] = None,
     current_user: User = Depends(require_recruiter_or_above)
 ):
 
-    """ Start analysis for uploaded files """
-    if job_id not in jobs:
+    """
+    Start analysis for uploaded files
+    With cascade=true only the top_k candidates are fully analysed and returned.
+    tier selects how much enrichment bulk analysis computes (score, standard, full);
+    the rest is filled in when a candidate's detail view is opened.
+    encoder selects the encoder tier of the semantic scores (fast, standard, accurate).
+    """
+    queue = get_job_queue()
+    job = queue.get(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    if jobs[job_id]['status'] != 'uploaded':
+    if job['status'] != 'uploaded':
         raise HTTPException(status_code=400, detail="Job already processing or completed")
     
-    # Start background processing
-    background_tasks.add_task(process_analysis, job_id)
+    if top_k is not None and top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be at least 1")
+    if tier is not None and tier not in ANALYSIS_TIERS:
+        raise HTTPException(status_code=400, detail=f"tier must be one of {', '.join(ANALYSIS_TIERS)}")
+    validate_encoder_tier(encoder)
+    
+    # Queue for the analysis workers
+    if not queue.enqueue(job_id, {'cascade': cascade, 'tier': tier, 'top_k': top_k, 'encoder_tier': encoder}):
+        raise HTTPException(status_code=400, detail="Job already processing or completed")
+    start_inline_worker()
     
     return {"message": "Analysis started", "job_id": job_id}
 
 @app.get("/api/status/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get job processing status"""
-    # 1. Check In-Memory Cache
-    if job_id in jobs:
-        job = jobs[job_id]
+    # 1. Check the job queue
+    job = get_job_queue().get(job_id)
+    if job is not None:
         return JobStatus(
             job_id=job_id,
             status=job['status'],
@@ -306,66 +385,110 @@ async def get_job_status(job_id: str):
         
     raise HTTPException(status_code=404, detail="Job not found")
 
+def stream_snapshot(job_id: str, job: dict, top_n: int):
+    """Progress payload for /api/stream; the ranking is final once the job completes"""
+    top = job.get('provisional', [])[:top_n]
+    return {
+        'job_id': job_id,
+        'status': job['status'],
+        'progress': job.get('progress', 0),
+        'processed': job.get('processed', 0),
+        'failed': job.get('failed', 0),
+        'total': job.get('total', len(job.get('resume_paths', []))),
+        'top': top,
+        'message': job.get('error')
+    }
+
+def sse_event(event: str, data: dict):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@app.post("/api/stream/{job_id}/token")
+async def get_stream_token(
+    job_id: str,
+    current_user: User = Depends(require_recruiter_or_above)
+):
+    """Short-lived token for /api/stream/{job_id}?token=... (EventSource cannot send an auth header)"""
+    return {
+        'token': create_stream_token(current_user, job_id),
+        'expires_in': STREAM_TOKEN_EXPIRE_MINUTES * 60
+    }
+
+@app.get("/api/stream/{job_id}")
+async def stream_job(
+    job_id: str,
+    top_n: int = 10,
+    current_user: User = Depends(require_stream_token)
+):
+    """
+    Server-Sent Events feed of a job: 'progress' events with per-resume progress and
+    the provisional top_n ranking, ending with one 'complete' or 'failed' event
+    (replaces polling /api/status). Authenticated by a token from /api/stream/{job_id}/token.
+    """
+    top_n = max(1, min(top_n, PROVISIONAL_TOP_N))
+    queue = get_job_queue()
+    if queue.get(job_id) is None:
+        # Finished in an earlier run: report the stored outcome once
+        db_job = get_job_by_id(job_id)
+        if not db_job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        status_value = db_job.get('status', 'completed')
+        results = get_job_results(job_id) if status_value == 'completed' else []
+        snapshot = {
+            'job_id': job_id,
+            'status': status_value,
+            'progress': 100 if status_value == 'completed' else 0,
+            'processed': len(results),
+            'failed': 0,
+            'total': db_job.get('resume_count', len(results)),
+            'top': [ranking_entry(r['rank'], r) for r in results[:top_n]],
+            'message': db_job.get('error_message')
+        }
+        event = 'complete' if status_value == 'completed' else 'failed'
+        return StreamingResponse(iter([sse_event(event, snapshot)]), media_type="text/event-stream")
+    
+    async def events():
+        sent_revision = None
+        last_sent = time.monotonic()
+        while True:
+            job = await run_in_threadpool(queue.get, job_id)
+            if job is None:
+                return
+            if job['status'] in ('completed', 'failed'):
+                event = 'complete' if job['status'] == 'completed' else 'failed'
+                yield sse_event(event, stream_snapshot(job_id, job, top_n))
+                return
+            revision = job.get('revision', 0)
+            if revision != sent_revision:
+                sent_revision = revision
+                last_sent = time.monotonic()
+                yield sse_event('progress', stream_snapshot(job_id, job, top_n))
+            elif time.monotonic() - last_sent >= STREAM_KEEPALIVE_INTERVAL:
+                last_sent = time.monotonic()
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @app.get("/api/results/{job_id}", response_model=AnalysisResult)
 async def get_results(
     job_id: str,
     current_user: User = Depends(require_recruiter_or_above)
 ):
     """Get analysis results"""
-    # 1. Check in-memory first (fastest)
-    if job_id in jobs:
-        job = jobs[job_id]
-        
-        if job['status'] != 'completed':
-            raise HTTPException(status_code=400, detail=f"Job status: {job['status']}")
-        
-        # Convert results to Pydantic models
-        candidates = [
-            CandidateScore(
-                filename=r['filename'],
-                final_score=r['final_score'],
-                semantic_score=r['semantic_score'],
-                experience_score=r['experience_score'],
-                education_score=r['education_score'],
-                matched_skills=r['matched_skills'],
-                missing_skills=r.get('missing_skills', []),
-                recommended_roles=r.get('recommended_roles', []),
-                match_classification=r.get('match_classification', None),
-                confidence_score=r.get('confidence_score', None),
-                rank=r.get('rank'),
-                email=r.get('email'),
-                phone=r.get('phone'),
-                summary=r.get('summary'),
-                interview_questions=r.get('interview_questions', []),
-                status=r.get('status', 'new'),
-                linkedin_url=r.get('linkedin_url'),
-                github_url=r.get('github_url'),
-                portfolio_url=r.get('portfolio_url'),
-                location=r.get('location'),
-                education_history=r.get('education_history', []),
-                experience_history=r.get('experience_history', []),
-                projects=r.get('projects', []),
-                certifications=r.get('certifications', [])
-            ) for r in job['results']
-        ]
-        
-        # In-memory 'started_at' might be missing in some paths, but 'created_at' exists
-        timestamp = job['created_at']
-        
-        return AnalysisResult(
-            job_id=job_id,
-            jd_filename=job['jd_filename'],
-            candidates=candidates,
-            total_candidates=len(candidates),
-            processing_time=job.get('processing_time', 0.0),
-            timestamp=timestamp
-        )
+    # 1. Jobs still queued or running
+    job = get_job_queue().get(job_id)
+    if job is not None and job['status'] != 'completed':
+        raise HTTPException(status_code=400, detail=f"Job status: {job['status']}")
     
-    # 2. Fallback to Database
+    # 2. Results are written to the database while the job runs
     db_job = get_job_by_id(job_id)
     if db_job:
         db_results = get_job_results(job_id)
-        if db_results:
+        if db_results or job is not None:
              candidates = [
                 CandidateScore(
                     filename=r['filename'],
@@ -377,7 +500,7 @@ async def get_results(
                     missing_skills=r['missing_skills'],
                     recommended_roles=r.get('recommended_roles', []),
                     match_classification=r.get('match_classification', None),
-                    confidence_score=None, # Not stored in DB
+                    confidence_score=r.get('confidence_score'),
                     rank=r.get('rank'),
                     email=r.get('email'),
                     phone=r.get('phone'),
@@ -391,7 +514,9 @@ async def get_results(
                     education_history=r.get('education_history', []),
                     experience_history=r.get('experience_history', []),
                     projects=r.get('projects', []),
-                    certifications=r.get('certifications', [])
+                    certifications=r.get('certifications', []),
+                    analysis_tier=r.get('analysis_tier'),
+                    model_match_probability=r.get('model_match_probability')
                 ) for r in db_results
             ]
              
@@ -408,12 +533,57 @@ async def get_results(
                 jd_filename=db_job['jd_filename'],
                 candidates=candidates,
                 total_candidates=len(candidates),
-                processing_time=db_job.get('processing_time', 0.0),
-                timestamp=ts
+                processing_time=db_job.get('processing_time') or 0.0,
+                timestamp=ts,
+                cascade=job.get('cascade_stats') if job is not None else None
             )
 
     raise HTTPException(status_code=404, detail="Job not found")
 
+@app.get("/api/results/{job_id}/{filename}", response_model=CandidateScore)
+async def get_candidate_detail(
+    job_id: str,
+    filename: str,
+    current_user: User = Depends(require_recruiter_or_above)
+):
+    """
+    Detail view of one candidate
+    Enrichment beyond the job's analysis tier (learning paths, interview questions,
+    structured profile) is computed on first access and persisted
+    """
+    job = get_job_queue().get(job_id)
+    if job is not None:
+        jd_path = job['jd_path']
+        resume_path = next((p for p in job['resume_paths'] if os.path.basename(p) == filename), None)
+        job_role, encoder_tier = job.get('job_role'), job.get('encoder_tier')
+    else:
+        db_job = get_job_by_id(job_id)
+        if not db_job:
+            raise HTTPException(status_code=404, detail="Job not found")
+        jd_path = str(UPLOAD_DIR / job_id / db_job['jd_filename'])
+        resume_path = str(UPLOAD_DIR / job_id / filename)
+        job_role, encoder_tier = db_job.get('job_role'), db_job.get('encoder_tier')
+    candidate = get_candidate_result(job_id, filename)
+    
+    if candidate is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    full_tier = ANALYSIS_TIERS[-1]
+    if (tier_level(candidate.get('analysis_tier')) < tier_level(full_tier)
+            and resume_path and os.path.exists(resume_path) and os.path.exists(jd_path)):
+        with open(jd_path, 'r', encoding='utf-8', errors='ignore') as f:
+            jd_text = f.read()
+        # Same role and encoder tier as the job's scoring (jobs from older versions did not record them)
+        fields = await run_in_threadpool(
+            inference_engine.enrich_result, candidate, resume_path, jd_text,
+            job_role or detect_role_from_jd(jd_text), full_tier, encoder_tier
+        )
+        if fields:
+            candidate.update(fields)
+            update_candidate_enrichment(job_id, filename, fields)
+    
+    return CandidateScore(**{k: v for k, v in candidate.items() if k in CandidateScore.model_fields})
+
 @app.put("/api/results/{job_id}/{filename}/status")
 async def update_status(
     job_id: str,
@@ -422,15 +592,7 @@ async def update_status(
     current_user: User = Depends(require_recruiter_or_above)
 ):
     """Update candidate status (shortlisted/rejected)"""
-    # 1. Update Persistent DB
     update_candidate_status(job_id, filename, update.status)
-    
-    # 2. Update In-Memory Cache (if job is fresh)
-    if job_id in jobs:
-        for result in jobs[job_id]['results']:
-            if result['filename'] == filename:
-                result['status'] = update.status
-                break
                 
     # NOTIFICATION: Status Update
     add_notification(
@@ -461,9 +623,8 @@ async def delete_analysis(
     current_user: User = Depends(require_recruiter_or_above)
 ):
     """Delete an analysis job"""
-    # Check if job exists in memory
-    if job_id in jobs:
-        del jobs[job_id]
+    # Remove it from the job queue
+    get_job_queue().delete(job_id)
     
     # Delete from database
     deleted = delete_job(job_id)
@@ -525,6 +686,56 @@ async def get_detailed_analytics(
     """Get detailed analytics with charts data"""
     return get_analytics_stats(days=days)
 
+@app.get("/api/cache/stats")
+async def get_cache_stats(
+    current_user: User = Depends(require_hr_manager_or_above)
+):
+    """Result and parsed-text cache counters, and encoder batching counters by tier, for this worker"""
+    result_cache = inference_engine.get_result_cache()
+    text_cache = get_parsed_text_cache()
+    return {
+        'results': result_cache.stats() if result_cache is not None else {'enabled': False},
+        'parsed_text': text_cache.stats() if text_cache is not None else {'enabled': False},
+        'encoder': encoder_stats()
+    }
+
+# --- MODEL REGISTRY (ADMIN) ---
+
+from api.rbac import require_admin
+
+@app.get("/api/admin/models")
+async def list_model_versions(
+    current_user: User = Depends(require_admin)
+):
+    """Registered model versions, the active one, and the model scoring in this worker"""
+    manifest = get_model_registry().read_manifest()
+    return {
+        'active': manifest.get('active'),
+        'activated_at': manifest.get('activated_at'),
+        'versions': manifest['versions'],
+        'worker_model': inference_engine.model_info()
+    }
+
+@app.post("/api/admin/models/activate")
+async def activate_model_version(
+    activation: ModelActivation,
+    current_user: User = Depends(require_admin)
+):
+    """Switch every worker to a registered model version without a restart"""
+    try:
+        await run_in_threadpool(inference_engine.activate_model_version, activation.version)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown model version: {activation.version}")
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    log_user_action(current_user, "activate_model", activation.version)
+    return {
+        'message': f"Model version {activation.version} activated",
+        'active': activation.version,
+        'propagation_seconds': MODEL_REGISTRY_POLL_INTERVAL
+    }
+
 @app.get("/api/learning-path/{job_id}/{candidate_filename}", response_model=List[SkillRecommendation])
 async def get_learning_path(
     job_id: str, 
@@ -532,11 +743,10 @@ async def get_learning_path(
     current_user: User = Depends(require_recruiter_or_above)
 ):
     """Get learning path for a specific candidate in a job"""
-    if job_id not in jobs:
+    if get_job_queue().get(job_id) is None and not get_job_by_id(job_id):
         raise HTTPException(status_code=404, detail="Job not found")
         
-    job = jobs[job_id]
-    candidate = next((r for r in job['results'] if r['filename'] == candidate_filename), None)
+    candidate = get_candidate_result(job_id, candidate_filename)
     
     if not candidate:
          raise HTTPException(status_code=404, detail="Candidate not found")
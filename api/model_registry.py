@@ -0,0 +1,227 @@
+"""
+Model Registry
+Versioned scoring-model artifacts under models/registry with a JSON manifest.
+
+Each version is an uncompressed joblib dump (so numpy arrays inside it can be
+memory-mapped and shared through the page cache by every worker), recorded in
+the manifest with its checksum, model class, feature order and free-form
+metadata. The manifest names the active version; it is rewritten atomically
+(temp file + rename), and every worker polls it and swaps models in place,
+so activating a version needs no restart.
+"""
+
+import os
+import json
+import shutil
+import threading
+from datetime import datetime
+from contextlib import contextmanager
+
+import joblib
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: writers are serialized within the process only
+    fcntl = None
+
+from api.model_scoring import MODEL_FEATURES, model_feature_names
+from api.result_cache import file_digest
+
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "models/registry")
+
+# Seconds between checks of the manifest for a newly activated version
+MODEL_REGISTRY_POLL_INTERVAL = float(os.getenv("MODEL_REGISTRY_POLL_INTERVAL", "2"))
+
+_ARTIFACT_NAME = "model.joblib"
+
+
+class ModelRegistry:
+    """
+    Manifest-backed store of model versions
+    Versions are immutable once registered; only the active pointer changes.
+    """
+
+    def __init__(self, root=None):
+        self.root = root or MODEL_REGISTRY_DIR
+        self.manifest_path = os.path.join(self.root, 'manifest.json')
+        self._lock_path = os.path.join(self.root, 'write.lock')
+        self._thread_lock = threading.Lock()
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive across threads and (where supported) processes"""
+        os.makedirs(self.root, exist_ok=True)
+        with self._thread_lock:
+            with open(self._lock_path, 'a') as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def read_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {'active': None, 'versions': {}}
+        with open(self.manifest_path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest):
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.manifest_path)
+
+    def manifest_mtime(self):
+        """Modification time of the manifest (0 when there is none); cheap change check for pollers"""
+        try:
+            return os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def active_version(self):
+        return self.read_manifest().get('active')
+
+    def artifact_path(self, version):
+        entry = self.read_manifest()['versions'].get(version)
+        if entry is None:
+            raise KeyError(f"Unknown model version: {version}")
+        return os.path.join(self.root, entry['file'])
+
+    def register(self, model, kind, metadata=None, activate=False):
+        """
+        Add a model as a new version
+
+        Args:
+            model: Fitted classifier, or path to a joblib/pickle file holding one
+            kind: Model family, e.g. 'student' or 'ensemble'
+            metadata: Extra JSON-serializable details (training data, metrics, ...)
+            activate: Make it the active version
+
+        Returns:
+            The new version name
+        """
+        source = None
+        if isinstance(model, (str, os.PathLike)):
+            source = str(model)
+            model = joblib.load(source)
+
+        feature_names = list(model_feature_names(model))
+        unknown = [name for name in feature_names if name not in MODEL_FEATURES]
+        if unknown:
+            raise ValueError(f"Model expects features the API does not compute: {unknown}")
+
+        with self._write_lock():
+            manifest = self.read_manifest()
+            number = 1 + max([int(v[1:]) for v in manifest['versions']] or [0])
+            version = f"v{number}"
+            directory = os.path.join(self.root, version)
+            os.makedirs(directory, exist_ok=True)
+            artifact = os.path.join(directory, _ARTIFACT_NAME)
+            # Uncompressed so load(mmap_mode='r') can map the arrays
+            joblib.dump(model, artifact)
+
+            manifest['versions'][version] = {
+                'file': f"{version}/{_ARTIFACT_NAME}",
+                'sha256': file_digest(artifact),
+                'kind': kind,
+                'model_class': type(model).__name__,
+                'feature_names': feature_names,
+                'source': source,
+                'created_at': datetime.now().isoformat(),
+                'metadata': metadata or {}
+            }
+            if activate:
+                manifest['active'] = version
+                manifest['activated_at'] = datetime.now().isoformat()
+            self._write_manifest(manifest)
+        return version
+
+    def activate(self, version):
+        """Point the manifest at a registered version (checksum verified first)"""
+        with self._write_lock():
+            manifest = self.read_manifest()
+            entry = manifest['versions'].get(version)
+            if entry is None:
+                raise KeyError(f"Unknown model version: {version}")
+            if file_digest(os.path.join(self.root, entry['file'])) != entry['sha256']:
+                raise ValueError(f"Checksum mismatch for model version {version}")
+            manifest['active'] = version
+            manifest['activated_at'] = datetime.now().isoformat()
+            self._write_manifest(manifest)
+
+    def load(self, version):
+        """
+        Load a version with its arrays memory-mapped read-only
+
+        Raises:
+            KeyError: Unknown version
+            ValueError: Checksum or feature order does not match the manifest
+        """
+        entry = self.read_manifest()['versions'].get(version)
+        if entry is None:
+            raise KeyError(f"Unknown model version: {version}")
+        path = os.path.join(self.root, entry['file'])
+        if file_digest(path) != entry['sha256']:
+            raise ValueError(f"Checksum mismatch for model version {version}")
+
+        model = joblib.load(path, mmap_mode='r')
+        if list(model_feature_names(model)) != entry['feature_names']:
+            raise ValueError(f"Feature order of model version {version} does not match its manifest")
+        return model
+
+    def remove(self, version):
+        """Delete an inactive version"""
+        with self._write_lock():
+            manifest = self.read_manifest()
+            if version == manifest.get('active'):
+                raise ValueError("Cannot remove the active model version")
+            entry = manifest['versions'].pop(version, None)
+            if entry is None:
+                raise KeyError(f"Unknown model version: {version}")
+            self._write_manifest(manifest)
+        shutil.rmtree(os.path.join(self.root, version), ignore_errors=True)
+
+
+_registry = None
+
+
+def get_model_registry():
+    global _registry
+    if _registry is None:
+        _registry = ModelRegistry()
+    return _registry
+
+
+if __name__ == "__main__":
+    # python -m api.model_registry register models/student_classifier.pkl student --activate
+    # python -m api.model_registry activate v2
+    # python -m api.model_registry list
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage scoring model versions")
+    commands = parser.add_subparsers(dest="command", required=True)
+    register_cmd = commands.add_parser("register")
+    register_cmd.add_argument("path")
+    register_cmd.add_argument("kind")
+    register_cmd.add_argument("--activate", action="store_true")
+    activate_cmd = commands.add_parser("activate")
+    activate_cmd.add_argument("version")
+    commands.add_parser("list")
+    args = parser.parse_args()
+
+    registry = get_model_registry()
+    if args.command == "register":
+        version = registry.register(args.path, args.kind, activate=args.activate)
+        print(f"✓ Registered {args.path} as {version}" + (" (active)" if args.activate else ""))
+    elif args.command == "activate":
+        registry.activate(args.version)
+        print(f"✓ Activated {args.version}; workers switch within {MODEL_REGISTRY_POLL_INTERVAL:g}s")
+    else:
+        manifest = registry.read_manifest()
+        for version, entry in manifest['versions'].items():
+            marker = "*" if version == manifest.get('active') else " "
+            print(f"{marker} {version}  {entry['kind']:10} {entry['model_class']:24} {entry['created_at']}")
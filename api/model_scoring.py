@@ -0,0 +1,54 @@
+"""
+Batch Model Scoring
+Runs the trained match classifier over many candidates with one predict_proba call,
+with thread pools pinned so gunicorn workers do not oversubscribe the cores
+"""
+
+import os
+import warnings
+import numpy as np
+from threadpoolctl import threadpool_limits
+
+# Threads per prediction call (n_jobs of the estimators and BLAS/OpenMP pools)
+MODEL_THREADS = int(os.getenv("MODEL_THREADS", "1"))
+
+# Training feature order (src/training/train_model.py), used when the model does not record names
+MODEL_FEATURES = ("semantic_score", "experience_score", "skill_overlap", "education_score")
+
+
+def limit_model_threads(model, threads=MODEL_THREADS):
+    """
+    Replace n_jobs=-1 (every core, per worker process) on the model and,
+    for ensembles, on each fitted member
+    """
+    for estimator in [model] + list(getattr(model, 'estimators_', [])):
+        if hasattr(estimator, 'get_params') and 'n_jobs' in estimator.get_params(deep=False):
+            estimator.set_params(n_jobs=threads)
+    return model
+
+
+def model_feature_names(model):
+    names = getattr(model, 'feature_names_in_', None)
+    return tuple(names) if names is not None else MODEL_FEATURES
+
+
+def predict_match_probability(model, columns):
+    """
+    Positive-class probability for every row
+
+    Args:
+        model: Fitted classifier with predict_proba
+        columns: Dictionary feature name -> 1-D array (one entry per candidate)
+
+    Returns:
+        1-D array of probabilities (0-1)
+    """
+    names = model_feature_names(model)
+    matrix = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in names])
+
+    # Columns are already in the fitted order; a DataFrame would only add a pandas
+    # dependency to the API for sklearn's name check
+    with threadpool_limits(limits=MODEL_THREADS), warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='X does not have valid feature names')
+        probabilities = model.predict_proba(matrix)
+    return probabilities[:, list(model.classes_).index(1)]
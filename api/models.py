@@ -41,6 +41,18 @@ class CandidateScore(BaseModel):
     interview_questions: Optional[List[str]] = None
     status: Optional[str] = "new" 
     categorized_skills: Optional[Dict[str, List[str]]] = None
+    analysis_tier: Optional[str] = None
+    model_match_probability: Optional[float] = Field(None, ge=0, le=100, description="Trained classifier's match probability (%)")
+
+class CascadeStats(BaseModel):
+    """Candidates handled by each stage of a cascade analysis"""
+    total: int
+    cached: int = 0
+    failed: int = 0
+    stage1_pruned: int = Field(0, description="Dropped by skill/experience filters before semantic scoring")
+    stage2_scored: int = Field(0, description="Semantically scored")
+    stage2_pruned: int = Field(0, description="Scored but outside the top K")
+    enriched: int = Field(0, description="Fully analysed (top K)")
 
 class AnalysisResult(BaseModel):
     """Complete analysis result"""
@@ -50,10 +62,15 @@ class AnalysisResult(BaseModel):
     total_candidates: int
     processing_time: float
     timestamp: datetime
+    cascade: Optional[CascadeStats] = None
 
 class StatusUpdate(BaseModel):
     status: str
 
+class ModelActivation(BaseModel):
+    """Registered model version to make active in every worker"""
+    version: str
+
 class JobStatus(BaseModel):
     """Job processing status"""
     job_id: str
@@ -67,6 +84,8 @@ class HealthResponse(BaseModel):
     version: str
     model_loaded: bool
     timestamp: datetime
+    ready: bool = False
+    warmup_seconds: Optional[float] = None
 
 
 class Notification(BaseModel):
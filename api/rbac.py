@@ -3,15 +3,20 @@ Role-Based Access Control (RBAC) Middleware
 Provides decorators and dependencies for protecting API endpoints
 """
 
-from fastapi import Depends, HTTPException, status
+import os
+from datetime import timedelta
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from typing import List, Optional
 from api.auth_utils import (
     SECRET_KEY, ALGORITHM, UserRole, User, get_user_by_email,
-    check_permission, ROLE_PERMISSIONS
+    check_permission, ROLE_PERMISSIONS, create_access_token
 )
 
+# Lifetime of the job-scoped tokens that authenticate /api/stream (EventSource cannot send headers)
+STREAM_TOKEN_EXPIRE_MINUTES = int(os.getenv("STREAM_TOKEN_EXPIRE_MINUTES", "5"))
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
 
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
@@ -98,6 +103,43 @@ async def require_recruiter_or_above(
         )
     return current_user
 
+# --- Job Stream Tokens ---
+
+def create_stream_token(user: User, job_id: str) -> str:
+    """
+    Short-lived token for one job's event stream, passed as ?token=
+    It has no 'sub' claim, so it is not accepted as a bearer token anywhere else.
+    """
+    return create_access_token(
+        {"stream_user": user.email, "job_id": job_id},
+        expires_delta=timedelta(minutes=STREAM_TOKEN_EXPIRE_MINUTES)
+    )
+
+async def require_stream_token(job_id: str, token: Optional[str] = Query(None)) -> User:
+    """
+    Dependency for /api/stream/{job_id}: a valid stream token for this job,
+    issued to an active user who still has Recruiter access or above
+    """
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid or expired stream token"
+    )
+    
+    if token is None:
+        raise credentials_exception
+    try:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise credentials_exception
+    email = payload.get("stream_user")
+    if email is None or payload.get("job_id") != job_id:
+        raise credentials_exception
+    
+    user = get_user_by_email(email)
+    if user is None or user.disabled:
+        raise credentials_exception
+    return await require_recruiter_or_above(user)
+
 # --- Permission-Based Dependencies ---
 
 def require_permission(permission: str):
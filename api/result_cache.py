@@ -0,0 +1,278 @@
+"""
+Analysis Result Cache
+Memoizes MLInferenceEngine results per (resume, JD, role, analysis tier, version).
+
+Two tiers: an in-process LRU of serialized results in front of a SQLite (WAL)
+table shared by all workers on the host. The version stamp covers everything
+a score depends on besides the inputs (skill database, role weights, parser,
+stopwords, the feature extractors' code and the loaded classifier; the encoder
+is part of each key), so any change to those misses the old entries. Workers on
+different versions (a rolling deploy, a registry swap) share the table safely:
+old entries are only removed by prune_result_cache, once unused for
+RESULT_CACHE_RETENTION_DAYS, from the migration step or python -m api.startup prune-cache.
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+from src.preprocessing import text_cleaner
+from src.preprocessing.text_cleaner import cached_clean_text, get_stopwords
+from src.preprocessing.resume_parser import PARSER_VERSION
+from src.feature_extraction import experience_extractor, education_extractor
+from src.matching import bias_filter
+from src.feature_extraction.skill_extractor import SKILLS_DATABASE, SKILL_SYNONYMS
+from src.matching.role_weights import ROLE_SKILL_WEIGHTS, ROLE_SCORING_WEIGHTS, JOB_ROLE_SKILLS
+
+RESULT_CACHE_ENABLED = os.getenv("RESULT_CACHE", "1") != "0"
+RESULT_CACHE_PATH = os.getenv("RESULT_CACHE_PATH", "cache/analysis_results.db")
+
+# Entries kept in the in-process tier
+RESULT_CACHE_MEMORY_SIZE = int(os.getenv("RESULT_CACHE_MEMORY_SIZE", "1024"))
+
+# Rows kept in the SQLite tier before least-recently-used eviction
+RESULT_CACHE_MAX_ROWS = int(os.getenv("RESULT_CACHE_MAX_ROWS", "200000"))
+
+# Entries not read or written for this long are pruned (stale versions age out this way)
+RESULT_CACHE_RETENTION_DAYS = float(os.getenv("RESULT_CACHE_RETENTION_DAYS", "7"))
+
+# Bump when score_resume output changes in a way the inputs above do not capture
+RESULT_SCHEMA_VERSION = "2"
+
+# Feature extraction code hashed into the version stamp (extractor changes miss old results)
+_FEATURE_MODULES = (text_cleaner, bias_filter, experience_extractor, education_extractor)
+
+# Per-upload fields; filled in by the caller, never cached
+_VOLATILE_FIELDS = ('filename', 'rank')
+
+_TOUCH_INTERVAL = 60.0
+
+
+def file_digest(file_path):
+    """SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def jd_digest(jd_text):
+    """
+    Digest of the normalized JD. Scoring only sees the cleaned text,
+    so formatting, casing and stopword-only edits hash the same.
+    """
+    return hashlib.sha256(cached_clean_text(jd_text).encode('utf-8')).hexdigest()
+
+
+def analysis_version(model_path=None):
+    """
+    Version stamp of everything besides the inputs that affects a result
+
+    Args:
+        model_path: Loaded classifier file (hashed by content), if any
+    """
+    digest = hashlib.sha256()
+    reference_data = {
+        'schema': RESULT_SCHEMA_VERSION,
+        'parser': PARSER_VERSION,
+        'skills': SKILLS_DATABASE,
+        'synonyms': SKILL_SYNONYMS,
+        'role_skill_weights': ROLE_SKILL_WEIGHTS,
+        'role_scoring_weights': ROLE_SCORING_WEIGHTS,
+        'job_role_skills': JOB_ROLE_SKILLS,
+        # NLTK's list or the bundled fallback, whichever this host resolves
+        'stopwords': sorted(get_stopwords()),
+        'feature_code': [file_digest(module.__file__) for module in _FEATURE_MODULES],
+    }
+    digest.update(json.dumps(reference_data, sort_keys=True, default=str).encode('utf-8'))
+    if model_path and os.path.exists(model_path):
+        digest.update(file_digest(model_path).encode('ascii'))
+    return digest.hexdigest()[:16]
+
+
+class AnalysisResultCache:
+    """
+    In-memory LRU over a SQLite table; both tiers store JSON so callers
+    always get a private copy they can annotate (filename, rank, status).
+    Database errors degrade to a miss so analysis never fails because of the cache.
+    """
+
+    def __init__(self, version, path=None, memory_size=None, max_rows=None):
+        self.version = version
+        self.path = path or RESULT_CACHE_PATH
+        self.memory_size = RESULT_CACHE_MEMORY_SIZE if memory_size is None else memory_size
+        self.max_rows = RESULT_CACHE_MAX_ROWS if max_rows is None else max_rows
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._initialized = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def key(self, resume_hash, jd_hash, job_role, tier, encoder):
+        return f"{self.version}:{resume_hash}:{jd_hash}:{job_role}:{tier}:{encoder}"
+
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS analysis_results (
+                    key TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    result BLOB NOT NULL,  -- zlib-compressed JSON
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_analysis_results_access ON analysis_results(last_access)')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def _remember(self, key, payload):
+        if self.memory_size <= 0:
+            return
+        with self._lock:
+            self._memory[key] = payload
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_size:
+                self._memory.popitem(last=False)
+
+    def get(self, key):
+        """Return a fresh copy of the cached result, or None on miss"""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return json.loads(payload)
+
+        payload = None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT result, last_access FROM analysis_results WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    payload = zlib.decompress(row[0]).decode('utf-8')
+                    now = time.time()
+                    if now - row[1] > _TOUCH_INTERVAL:
+                        conn.execute('UPDATE analysis_results SET last_access = ? WHERE key = ?', (now, key))
+                        conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, zlib.error, OSError):
+            payload = None
+
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._remember(key, payload)
+        return json.loads(payload)
+
+    def put(self, key, result):
+        """Store a result (per-upload fields are dropped) in both tiers"""
+        payload = json.dumps({k: v for k, v in result.items() if k not in _VOLATILE_FIELDS})
+        self._remember(key, payload)
+        with self._lock:
+            self.stores += 1
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO analysis_results (key, version, result, last_access)
+                    VALUES (?, ?, ?, ?)
+                ''', (key, self.version, zlib.compress(payload.encode('utf-8'), 6), time.time()))
+                self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def _evict(self, conn):
+        count = conn.execute('SELECT COUNT(*) FROM analysis_results').fetchone()[0]
+        if count <= self.max_rows:
+            return
+        # Trim to 90% so eviction does not run on every subsequent insert
+        excess = count - int(self.max_rows * 0.9)
+        conn.execute('''
+            DELETE FROM analysis_results WHERE key IN (
+                SELECT key FROM analysis_results ORDER BY last_access ASC LIMIT ?
+            )
+        ''', (excess,))
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM analysis_results')
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def stats(self):
+        """Hit/miss counters for this process plus tier sizes"""
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            stats = {
+                'version': self.version,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'stores': self.stores,
+                'hit_rate': round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self._memory),
+            }
+        try:
+            conn = self._connect()
+            try:
+                stats['disk_entries'] = conn.execute('SELECT COUNT(*) FROM analysis_results').fetchone()[0]
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            stats['disk_entries'] = 0
+        return stats
+
+
+def prune_result_cache(retention_days=None, path=None):
+    """
+    Delete entries unused for retention_days (default RESULT_CACHE_RETENTION_DAYS)
+    Entries of other versions are never hit, so they age out; ones a worker on an
+    older version still uses are kept until it is gone.
+
+    Returns:
+        Number of entries deleted
+    """
+    path = path or RESULT_CACHE_PATH
+    retention_days = RESULT_CACHE_RETENTION_DAYS if retention_days is None else retention_days
+    if not os.path.exists(path):
+        return 0
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        cursor = conn.execute('DELETE FROM analysis_results WHERE last_access < ?',
+                              (time.time() - retention_days * 86400,))
+        conn.commit()
+        return cursor.rowcount
+    except sqlite3.OperationalError:
+        # Table not created yet
+        return 0
+    finally:
+        conn.close()
@@ -0,0 +1,313 @@
+"""
+Startup Tasks
+Schema migrations, offline resources and the pre-fork serving profile, prepared
+once per deployment rather than by every worker on import:
+
+    python -m api.startup migrate   # create/upgrade the SQLite schemas
+    python -m api.startup bundle    # save the encoder locally, check spaCy/NLTK data
+    python -m api.startup workers   # web worker count the available RAM allows
+    python -m api.startup warmup    # time the warm-up analyses
+
+gunicorn runs the migrations and preloads the models in its master process
+(config/gunicorn_config.py); a plain `uvicorn api.main:app` runs the migrations
+on import unless MIGRATE_ON_STARTUP=0. Each serving process warms its models
+up after it starts and reports ready (/api/ready) once that finished.
+Heavy modules are imported inside the functions so this module stays cheap.
+"""
+
+import os
+import threading
+
+# Run migrations when api.main is imported (set to 0 where they run before the workers start)
+MIGRATE_ON_STARTUP = os.getenv("MIGRATE_ON_STARTUP", "1") == "1"
+
+# Memory each web worker needs of its own (request handling, activations, caches)
+# when the models are preloaded and shared copy-on-write
+WORKER_MEMORY_MB = int(os.getenv("WORKER_MEMORY_MB", "256"))
+
+# Model memory each worker adds when it loads its own copy (no preloading)
+MODEL_MEMORY_MB = int(os.getenv("MODEL_MEMORY_MB", "700"))
+
+# Memory kept free for the OS, the page cache (embedding store) and analysis workers
+MEMORY_RESERVE_MB = int(os.getenv("MEMORY_RESERVE_MB", "1024"))
+
+_MB = 1024 * 1024
+
+# Warm the models up in every serving process before it reports ready (/api/ready)
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+
+# Dummy analyses run by the warm-up
+WARMUP_ROUNDS = int(os.getenv("WARMUP_ROUNDS", "2"))
+
+# Representative inputs: contact details, dated experience, education and common skills
+WARMUP_RESUME = """Jordan Lee
+jordan.lee@example.com | +1 555 010 2030 | linkedin.com/in/jordanlee | github.com/jordanlee
+San Francisco, CA
+
+EXPERIENCE
+Senior Data Scientist, Acme Analytics (Jan 2019 - Present)
+- Built machine learning models in Python with scikit-learn, TensorFlow and PyTorch
+- Deployed NLP services with FastAPI, Docker and Kubernetes on AWS
+Data Analyst, Globex Corp (2016 - 2018)
+- SQL, Tableau and Excel reporting; 6+ years of experience in analytics
+
+EDUCATION
+Master of Science in Computer Science, Stanford University, 2016
+
+PROJECTS
+Resume matcher: semantic search with BERT embeddings
+
+CERTIFICATIONS
+AWS Certified Machine Learning - Specialty
+"""
+
+WARMUP_JD = """We are hiring a Data Scientist with 5+ years of experience in Python, SQL,
+machine learning, deep learning (TensorFlow or PyTorch), NLP and cloud deployment
+on AWS with Docker. A Master's degree in Computer Science or a related field is preferred.
+"""
+
+_migrated = False
+_migrate_lock = threading.Lock()
+
+
+def run_migrations():
+    """
+    Create or upgrade every SQLite schema the API uses, and prune long-unused
+    result cache entries (idempotent, once per process)
+    """
+    global _migrated
+    with _migrate_lock:
+        if _migrated:
+            return
+        from api.auth_utils import migrate_users_db, create_default_admin
+        from api.history_db import init_history_db
+        from api.interview_db import init_interview_table
+        from api.result_cache import prune_result_cache
+
+        migrate_users_db()
+        create_default_admin()
+        init_history_db()
+        init_interview_table()
+        prune_result_cache()
+        _migrated = True
+
+
+def bundle_resources():
+    """
+    Store the models workers need locally so they start without the network
+
+    Returns:
+        True if every resource is available offline
+    """
+    from src.matching.semantic_matcher_bert import bundle_encoder_model
+    from src.feature_extraction.spacy_pipeline import SPACY_MODEL
+
+    ok = True
+    for path in bundle_encoder_model():
+        print(f"✓ Encoder saved to {path}")
+
+    try:
+        import spacy
+        spacy.load(SPACY_MODEL)
+        print(f"✓ spaCy model {SPACY_MODEL} is installed")
+    except (ImportError, OSError):
+        print(f"⚠ spaCy model {SPACY_MODEL} is missing: python -m spacy download {SPACY_MODEL}")
+        ok = False
+
+    try:
+        from nltk.corpus import stopwords
+        stopwords.words("english")
+        print("✓ NLTK stopwords are installed")
+    except (ImportError, LookupError):
+        print("✓ NLTK stopwords not installed; the bundled stopword list is used")
+
+    return ok
+
+
+def process_rss_bytes():
+    """Resident memory of this process"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cgroup_memory_headroom():
+    """Memory left under the container's cgroup limit (None without one)"""
+    for limit_path, usage_path in (
+        ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory.current'),  # cgroup v2
+        ('/sys/fs/cgroup/memory/memory.limit_in_bytes', '/sys/fs/cgroup/memory/memory.usage_in_bytes'),  # v1
+    ):
+        try:
+            with open(limit_path) as f:
+                limit = f.read().strip()
+            with open(usage_path) as f:
+                usage = int(f.read().strip())
+        except (OSError, ValueError):
+            continue
+        # "max" (v2) or a huge sentinel (v1) means no limit
+        if limit == 'max' or int(limit) >= 1 << 60:
+            return None
+        return int(limit) - usage
+    return None
+
+
+def available_memory_bytes():
+    """
+    Memory that can still be allocated: MemAvailable, capped by the cgroup limit
+    inside containers (None where neither can be read)
+    """
+    available = None
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    available = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    headroom = _cgroup_memory_headroom()
+    if headroom is not None:
+        available = headroom if available is None else min(available, headroom)
+    return available
+
+
+def recommended_workers(max_workers, per_worker_bytes):
+    """
+    Web workers that fit in the available memory, at most max_workers (the CPU-based count)
+    Call after the shared models are loaded: their memory is then already in use.
+    """
+    available = available_memory_bytes()
+    if available is None:
+        return max_workers
+    budget = available - MEMORY_RESERVE_MB * _MB
+    return max(1, min(max_workers, budget // per_worker_bytes))
+
+
+def preload_models():
+    """
+    Load every model the request path uses into this process
+    In gunicorn's master before fork, the workers then share them copy-on-write.
+    Only the weights are loaded: running a model here would start native thread
+    pools that do not survive fork (the ONNX backend's onnxruntime session is
+    likewise only created on first use, in each worker).
+
+    Returns:
+        Growth of this process's resident memory (bytes)
+    """
+    before = process_rss_bytes()
+    from src.matching.semantic_matcher_bert import get_encoder_model
+    from src.feature_extraction.spacy_pipeline import get_spacy_pipeline
+    from api.inference import inference_engine
+
+    get_encoder_model()
+    get_spacy_pipeline()
+    inference_engine.ensure_model()
+    return process_rss_bytes() - before
+
+
+_warmup = {'state': 'pending', 'seconds': None, 'error': None, 'finished_at': None}
+_warmup_pid = None
+_warmup_lock = threading.Lock()
+
+
+def warm_up(rounds=WARMUP_ROUNDS):
+    """
+    Run dummy full-tier analyses so the first real requests don't pay for lazy
+    initialization (model loads, the first encoder and spaCy calls, regex compilation,
+    the talent pool's search graph)
+    Failures are recorded rather than raised.
+
+    Returns:
+        Warm-up status (see warm_up_status)
+    """
+    import time
+    from datetime import datetime
+
+    _warmup.update(state='running', seconds=None, error=None, finished_at=None)
+    start = time.perf_counter()
+    try:
+        from api.inference import inference_engine
+        from src.feature_extraction.resume_features import extract_features_from_text
+        from src.matching.semantic_matcher_bert import similarity_to_embedding, warm_up_encoder
+        from api.talent_pool import get_talent_pool
+
+        inference_engine.refresh_model()
+        warm_up_encoder([WARMUP_RESUME, WARMUP_JD])
+        for _ in range(max(1, rounds)):
+            jd_profile = inference_engine.build_jd_profile(WARMUP_JD)
+            features = extract_features_from_text(WARMUP_RESUME)
+            semantic_score = similarity_to_embedding(features['clean_text'], jd_profile.embedding)
+            result = inference_engine.score_resume(features, semantic_score, jd_profile, tier="full")
+            inference_engine.predict_match_probabilities([result])
+        # The talent pool's search graph, saved by whichever worker last added resumes
+        pool = get_talent_pool()
+        if pool is not None:
+            pool.load_ann()
+    except Exception as e:
+        _warmup.update(state='failed', error=str(e))
+        print(f"⚠ Warm-up failed: {e}")
+    else:
+        _warmup['state'] = 'ready'
+    _warmup['seconds'] = round(time.perf_counter() - start, 3)
+    _warmup['finished_at'] = datetime.now().isoformat()
+    if _warmup['state'] == 'ready':
+        print(f"✓ Warm-up finished in {_warmup['seconds']}s")
+    return warm_up_status()
+
+
+def start_warm_up():
+    """
+    Warm this process up in a background thread (once per process)
+    Called from each worker after fork: threads and native thread pools
+    started in gunicorn's master would not survive it.
+    """
+    global _warmup_pid
+    with _warmup_lock:
+        if _warmup_pid == os.getpid():
+            return
+        _warmup_pid = os.getpid()
+        if not WARMUP_ON_STARTUP:
+            _warmup.update(state='skipped', seconds=0.0)
+            return
+        _warmup['state'] = 'running'
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+
+def warm_up_status():
+    """Warm-up state of this process; ready once it finished (or is disabled)"""
+    status = dict(_warmup)
+    status['ready'] = status['state'] in ('ready', 'skipped')
+    return status
+
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prepare the API for startup")
+    parser.add_argument("task", choices=["migrate", "bundle", "workers", "warmup", "prune-cache"])
+    args = parser.parse_args()
+
+    if args.task == "migrate":
+        run_migrations()
+        print("✓ Database schemas are up to date")
+    elif args.task == "bundle":
+        sys.exit(0 if bundle_resources() else 1)
+    elif args.task == "warmup":
+        sys.exit(0 if warm_up()['ready'] else 1)
+    elif args.task == "prune-cache":
+        from api.result_cache import prune_result_cache
+        print(f"✓ Pruned {prune_result_cache()} unused result cache entries")
+    else:
+        import multiprocessing
+        cpu_workers = multiprocessing.cpu_count() * 2 + 1
+        model_bytes = preload_models()
+        available = available_memory_bytes()
+        print(f"Models: {model_bytes // _MB} MB, available memory: "
+              f"{available // _MB if available is not None else 'unknown'} MB")
+        print(f"Web workers: {recommended_workers(cpu_workers, WORKER_MEMORY_MB * _MB)} preloaded "
+              f"(shared models), {recommended_workers(cpu_workers, (WORKER_MEMORY_MB + MODEL_MEMORY_MB) * _MB)} "
+              f"without preloading; CPU-based limit {cpu_workers}")
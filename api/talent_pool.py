@@ -0,0 +1,308 @@
+"""
+Talent Pool Index
+Every analysed resume becomes a searchable candidate, so a new JD can be
+matched against everyone seen so far without re-uploading anything.
+
+Resume embeddings live in a dedicated embedding store keyed by the resume's
+file hash (one entry per distinct resume, whatever the number of uploads);
+file locations live in a small SQLite table next to it. Retrieval is a
+brute-force matrix-vector scan over the memory-mapped vectors, switching to
+an HNSW graph for large pools when hnswlib is installed. The graph is saved
+next to the vectors whenever resumes are added, and loaded (then extended to
+any newer rows) by each worker at warm-up, so no search pays for building it.
+"""
+
+import os
+import glob
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+
+import numpy as np
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+from src.feature_extraction.resume_features import extract_resume_features
+from src.matching.embedding_store import EmbeddingStore
+from src.matching.semantic_matcher_bert import (
+    encoder_dimension, encode_texts, encoder_version, resolve_encoder_tier
+)
+from api.result_cache import file_digest
+
+TALENT_POOL_ENABLED = os.getenv("TALENT_POOL", "1") != "0"
+TALENT_POOL_DIR = os.getenv("TALENT_POOL_DIR", "cache/talent_pool")
+
+# Candidates returned (and fully scored) per search by default
+TALENT_POOL_DEFAULT_K = int(os.getenv("TALENT_POOL_DEFAULT_K", "20"))
+
+# Pools at least this large use HNSW (hnswlib, in requirements.txt; builds from source with
+# a C++ compiler); exact scan below it, and for every pool when hnswlib is not installed
+TALENT_POOL_ANN_MIN = int(os.getenv("TALENT_POOL_ANN_MIN", "20000"))
+
+# HNSW graph parameters
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "128"))
+
+
+class TalentPool:
+    """
+    Persistent resume vector index with top-K retrieval
+    Vectors and locations are versioned by encoder model (via the store directory);
+    searches must embed the query with the pool's encoder_tier.
+    """
+
+    def __init__(self, root=None, encoder_tier=None):
+        self.encoder_tier = resolve_encoder_tier(encoder_tier)
+        self.vectors = EmbeddingStore(
+            encoder_version(self.encoder_tier),
+            encoder_dimension(self.encoder_tier),
+            root=root or TALENT_POOL_DIR, dtype='float32'
+        )
+        self._db_path = os.path.join(self.vectors.directory, 'candidates.db')
+        self._initialized = False
+        self._ann = None  # (store generation, hnswlib index, rows indexed)
+        self._ann_digest = None  # _keys_digest of the indexed rows
+        self._ann_lock = threading.Lock()
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(self.vectors.directory, exist_ok=True)
+        conn = sqlite3.connect(self._db_path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS candidates (
+                    resume_hash TEXT PRIMARY KEY,
+                    resume_path TEXT NOT NULL,
+                    filename TEXT NOT NULL,
+                    job_id TEXT,
+                    added_at TIMESTAMP NOT NULL
+                )
+            ''')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def add_resumes(self, resume_paths, job_id=None, texts=None):
+        """
+        Index resumes; unseen ones are embedded, known ones get their latest location
+
+        Args:
+            resume_paths: Resume files
+            job_id: Analysis job the resumes were uploaded with
+            texts: Cleaned text by resume path, where already extracted (the rest are
+                parsed again); texts encoded in the pool's tier come from the embedding store
+
+        Returns:
+            Number of newly embedded candidates
+        """
+        texts = texts or {}
+        located = {}
+        for resume_path in resume_paths:
+            try:
+                located[file_digest(resume_path)] = resume_path
+            except OSError as e:
+                print(f"⚠ Skipping {resume_path} for talent pool: {e}")
+
+        known = self.vectors.get_many(list(located))
+        keys, new_texts = [], []
+        for resume_hash, resume_path in located.items():
+            if resume_hash in known:
+                continue
+            try:
+                text = texts.get(resume_path)
+                if text is None:
+                    text = extract_resume_features(resume_path)['clean_text']
+                new_texts.append(text)
+                keys.append(resume_hash)
+            except Exception as e:
+                print(f"⚠ Could not index {resume_path}: {e}")
+        if keys:
+            self.vectors.put_many(keys, encode_texts(new_texts, tier=self.encoder_tier))
+            self.save_ann()
+
+        now = datetime.now()
+        conn = self._connect()
+        try:
+            conn.executemany('''
+                INSERT OR REPLACE INTO candidates (resume_hash, resume_path, filename, job_id, added_at)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [(resume_hash, resume_path, os.path.basename(resume_path), job_id, now)
+                  for resume_hash, resume_path in located.items()])
+            conn.commit()
+        finally:
+            conn.close()
+        return len(keys)
+
+    def search(self, query_embedding, k=TALENT_POOL_DEFAULT_K):
+        """
+        Nearest candidates to a normalized query embedding
+
+        Returns:
+            List of (resume_hash, cosine similarity) sorted by similarity
+        """
+        generation, keys, matrix = self.vectors.snapshot()
+        k = min(k, len(keys))
+        if k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+
+        if self._uses_ann(len(keys)):
+            rows, similarities = self._ann_search(generation, keys, matrix, query, k)
+        else:
+            all_similarities = matrix @ query
+            rows = np.argpartition(-all_similarities, k - 1)[:k]
+            rows = rows[np.argsort(-all_similarities[rows], kind='stable')]
+            similarities = all_similarities[rows]
+
+        return [(keys[row], float(similarity)) for row, similarity in zip(rows, similarities)]
+
+    @staticmethod
+    def _uses_ann(rows):
+        return hnswlib is not None and rows >= TALENT_POOL_ANN_MIN
+
+    @staticmethod
+    def _keys_digest(keys):
+        """Identifies which key each graph label (row) stands for"""
+        return hashlib.blake2b("\n".join(keys).encode('utf-8'), digest_size=8).hexdigest()
+
+    def _saved_ann(self):
+        """Saved graphs as (rows indexed, keys digest, path), largest first"""
+        saved = []
+        for path in glob.glob(os.path.join(self.vectors.directory, "hnsw-*.bin")):
+            try:
+                _, rows, digest = os.path.basename(path)[:-len(".bin")].split("-")
+                saved.append((int(rows), digest, path))
+            except ValueError:
+                continue
+        return sorted(saved, reverse=True)
+
+    def _load_ann(self, keys, dim):
+        """The largest saved graph whose rows still hold the same keys, as (index, rows), or (None, 0)"""
+        for indexed, digest, path in self._saved_ann():
+            if indexed > len(keys) or digest != self._keys_digest(keys[:indexed]):
+                continue
+            try:
+                index = hnswlib.Index(space='ip', dim=dim)
+                index.load_index(path, max_elements=len(keys))
+                return index, indexed
+            except (RuntimeError, OSError) as e:
+                print(f"⚠ Could not load talent pool index {path}: {e}")
+        return None, 0
+
+    def _ann_index(self, generation, keys, matrix):
+        """
+        This process's HNSW graph over every row of matrix (call with _ann_lock held):
+        loaded from disk or built when missing, extended as rows are appended
+        """
+        ann_generation, index, indexed = self._ann or (None, None, 0)
+        # A new generation is a grown file (same rows) or a compaction (renumbered rows)
+        if ann_generation != generation and (
+                index is None or indexed > len(keys) or self._ann_digest != self._keys_digest(keys[:indexed])):
+            index, indexed = self._load_ann(keys, matrix.shape[1])
+            if index is None:
+                index = hnswlib.Index(space='ip', dim=matrix.shape[1])
+                index.init_index(max_elements=len(matrix), ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        if indexed < len(matrix):
+            if index.get_max_elements() < len(matrix):
+                index.resize_index(max(len(matrix), 2 * index.get_max_elements()))
+            index.add_items(np.asarray(matrix[indexed:]), np.arange(indexed, len(matrix)))
+            indexed = len(matrix)
+        self._ann = (generation, index, indexed)
+        self._ann_digest = self._keys_digest(keys[:indexed])
+        return index
+
+    def _ann_search(self, generation, keys, matrix, query, k):
+        """HNSW lookup over the current graph"""
+        with self._ann_lock:
+            index = self._ann_index(generation, keys, matrix)
+            index.set_ef(max(HNSW_EF_SEARCH, k))
+            labels, distances = index.knn_query(query, k=k)
+        # Inner-product space reports 1 - similarity
+        return labels[0], 1.0 - distances[0]
+
+    def load_ann(self):
+        """
+        Bring this process's HNSW graph up to date (at warm-up, so the first search is fast)
+
+        Returns:
+            True if the pool is large enough to be searched through the graph
+        """
+        generation, keys, matrix = self.vectors.snapshot()
+        if not self._uses_ann(len(keys)):
+            return False
+        with self._ann_lock:
+            self._ann_index(generation, keys, matrix)
+        return True
+
+    def save_ann(self):
+        """Save the up-to-date HNSW graph for other workers, replacing older saves"""
+        generation, keys, matrix = self.vectors.snapshot()
+        if not self._uses_ann(len(keys)):
+            return
+        with self._ann_lock:
+            index = self._ann_index(generation, keys, matrix)
+            path = os.path.join(self.vectors.directory, f"hnsw-{len(keys)}-{self._ann_digest}.bin")
+            staging = f"{path}.{os.getpid()}.tmp"
+            try:
+                index.save_index(staging)
+                os.replace(staging, path)
+            except (RuntimeError, OSError) as e:
+                print(f"⚠ Could not save talent pool index: {e}")
+                return
+        # Keep only the largest save (another worker may have saved a newer one)
+        for _, _, stale in self._saved_ann()[1:]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+    def locations(self, resume_hashes):
+        """Latest stored file location per resume hash"""
+        if not resume_hashes:
+            return {}
+        conn = self._connect()
+        conn.row_factory = sqlite3.Row
+        try:
+            placeholders = ','.join('?' * len(resume_hashes))
+            rows = conn.execute(
+                f'SELECT * FROM candidates WHERE resume_hash IN ({placeholders})', list(resume_hashes)
+            ).fetchall()
+        finally:
+            conn.close()
+        return {row['resume_hash']: dict(row) for row in rows}
+
+    def size(self):
+        return self.vectors.stats().get('entries', 0)
+
+
+_pool = None
+
+
+def get_talent_pool():
+    """Process-wide talent pool (None when disabled)"""
+    global _pool
+    if not TALENT_POOL_ENABLED:
+        return None
+    if _pool is None:
+        _pool = TalentPool()
+    return _pool
+
+
+if __name__ == "__main__":
+    # Backfill the pool from resumes already uploaded for past jobs
+    import sys
+
+    upload_dir = sys.argv[1] if len(sys.argv) > 1 else "uploads"
+    pool = get_talent_pool()
+    for job_dir in sorted(glob.glob(os.path.join(upload_dir, "*"))):
+        paths = sorted(glob.glob(os.path.join(job_dir, "*.pdf")) + glob.glob(os.path.join(job_dir, "*.docx")))
+        if paths:
+            added = pool.add_resumes(paths, job_id=os.path.basename(job_dir))
+            print(f"{os.path.basename(job_dir)}: {len(paths)} resumes, {added} new")
+    print(f"Talent pool size: {pool.size()}")
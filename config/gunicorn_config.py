@@ -1,6 +1,54 @@
+import gc
+import os
 import multiprocessing
 
+# Migrations run once in the master (on_starting), not on import in every worker
+os.environ.setdefault("MIGRATE_ON_STARTUP", "0")
+
+# Load the app and its models in the master before fork, so the workers share
+# them copy-on-write instead of each loading its own copy
+PRELOAD_MODELS = os.getenv("PRELOAD_MODELS", "1") == "1"
+
 bind = "0.0.0.0:8000"
-workers = multiprocessing.cpu_count() * 2 + 1
+# Upper bound: when_ready lowers it to what the available RAM holds (WEB_CONCURRENCY pins it)
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
 threads = 2
 timeout = 120
+preload_app = PRELOAD_MODELS
+
+
+def on_starting(server):
+    from api.startup import run_migrations
+    run_migrations()
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded, before the first worker is forked"""
+    from api.startup import preload_models, recommended_workers, WORKER_MEMORY_MB, MODEL_MEMORY_MB
+
+    mb = 1024 * 1024
+    per_worker = WORKER_MEMORY_MB * mb
+    if PRELOAD_MODELS:
+        model_bytes = preload_models()
+        server.log.info("Preloaded models in the master: %d MB shared with the workers", model_bytes // mb)
+        # Move everything loaded so far out of the collector's reach: collections in
+        # the workers would otherwise write to these objects and unshare their pages
+        gc.collect()
+        gc.freeze()
+    else:
+        per_worker += MODEL_MEMORY_MB * mb
+
+    if "WEB_CONCURRENCY" not in os.environ:
+        cpu_workers = server.num_workers
+        server.num_workers = recommended_workers(cpu_workers, per_worker)
+        server.log.info("Running %d workers (CPU-based limit %d, %d MB per worker)",
+                        server.num_workers, cpu_workers, per_worker // mb)
+
+    # Every web worker runs an inline analysis thread (ANALYSIS_WORKER_INLINE) with its own
+    # extraction pool: split the cores between them, as `api.analysis_worker --workers` does.
+    # Set here, before fork, so workers inherit it whether or not the app is preloaded
+    if "BATCH_WORKERS" not in os.environ:
+        from api import batch_pool
+        batch_pool.BATCH_WORKERS = max(1, (os.cpu_count() or 1) // server.num_workers)
+        os.environ["BATCH_WORKERS"] = str(batch_pool.BATCH_WORKERS)
+        server.log.info("Extraction processes per worker: %d", batch_pool.BATCH_WORKERS)
@@ -0,0 +1,96 @@
+"""
+Benchmark: encoder service under concurrency
+Several concurrent "jobs" each encode small batches of resumes, either calling
+the model directly (one small forward pass per request) or through the
+micro-batching encoder service (requests coalesced into larger batches)
+"""
+
+import argparse
+import csv
+import sys
+import os
+import time
+import threading
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import numpy as np
+import torch
+
+from src.preprocessing.text_cleaner import clean_text
+from src.matching.encoder_service import EncoderService, ENCODER_MAX_BATCH, ENCODER_MAX_WAIT
+from src.matching.semantic_matcher_bert import _encode_with_model, ENCODE_BATCH_SIZE
+
+DATA_PATH = "data/synthetic_resumes_1k.csv"
+
+
+def run_jobs(encode, resumes, jobs, request_size):
+    """
+    Split resumes across `jobs` threads, each encoding `request_size` texts per call
+
+    Returns:
+        Wall time and per-request latencies (seconds)
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def job(texts):
+        for i in range(0, len(texts), request_size):
+            start = time.perf_counter()
+            encode(texts[i:i + request_size])
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=job, args=(resumes[j::jobs],)) for j in range(jobs)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--limit", type=int, default=400, help="Number of resumes to encode")
+    arg_parser.add_argument("--jobs", type=int, default=8, help="Concurrent jobs")
+    arg_parser.add_argument("--request-size", type=int, default=4, help="Texts per encode request")
+    args = arg_parser.parse_args()
+
+    with open(DATA_PATH, newline='', encoding='utf-8') as f:
+        resumes = [clean_text(row['Resume_Text']) for row in csv.DictReader(f)][:args.limit]
+
+    service = EncoderService(lambda texts, batch_size: _encode_with_model(texts, batch_size or ENCODE_BATCH_SIZE))
+    model_lock = threading.Lock()
+
+    def direct(texts):
+        # One caller at a time, as when every job calls the shared model itself
+        with model_lock:
+            return _encode_with_model(texts, ENCODE_BATCH_SIZE)
+
+    print("="*60)
+    print(f"ENCODER SERVICE BENCHMARK ({len(resumes)} resumes, {args.jobs} jobs, "
+          f"{args.request_size} texts/request, {torch.get_num_threads()} torch threads)")
+    print(f"max batch {ENCODER_MAX_BATCH} texts, max wait {ENCODER_MAX_WAIT * 1000:g}ms")
+    print("="*60)
+
+    # Warm-up so neither side pays for lazy initialization
+    direct(resumes[:2])
+    service.encode(resumes[:2])
+
+    results = {}
+    for label, encode in (("direct", direct), ("encoder service", service.encode)):
+        elapsed, latencies = run_jobs(encode, resumes, args.jobs, args.request_size)
+        results[label] = elapsed
+        print(f"{label:<16} {elapsed:7.2f}s  {len(resumes) / elapsed:8.1f} resumes/s  "
+              f"p50 {np.percentile(latencies, 50) * 1000:7.1f}ms  p99 {np.percentile(latencies, 99) * 1000:7.1f}ms")
+
+    stats = service.stats()
+    print(f"Throughput gain: {results['direct'] / results['encoder service']:.2f}x, "
+          f"{stats['requests_per_batch']} requests/batch, {stats['texts_per_batch']} texts/batch")
+
+
+if __name__ == "__main__":
+    main()
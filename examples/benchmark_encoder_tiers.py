@@ -0,0 +1,86 @@
+"""
+Benchmark: encoder tiers
+Encodes the same resumes with every encoder tier (fast, standard, accurate)
+on the configured backend and reports docs/sec, and how closely each tier
+ranks the resumes against a job description compared with the standard tier
+(Spearman correlation and top-k overlap)
+"""
+
+import argparse
+import csv
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import numpy as np
+from scipy.stats import spearmanr
+
+from src.preprocessing.text_cleaner import clean_text
+from src.matching.semantic_matcher_bert import (
+    get_encoder_model, build_static_model, static_model_path, ENCODER_TIERS, ENCODE_BATCH_SIZE
+)
+from src.matching.static_encoder import static_encoder_exists
+
+DATA_PATH = "data/synthetic_resumes_1k.csv"
+
+JD_TEXT = ("Looking for a Data Scientist skilled in Python, Machine Learning, SQL and "
+           "Deep Learning, with experience deploying models to production")
+
+
+def time_encode(model, texts, batch_size, repeats):
+    """Best wall time over repeats, and the embeddings"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        embeddings = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        best = min(best, time.perf_counter() - start)
+    return best, embeddings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--limit", type=int, default=1000, help="Number of resumes to encode")
+    arg_parser.add_argument("--batch-size", type=int, default=ENCODE_BATCH_SIZE, help="Texts per forward pass")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Runs per tier; the fastest is reported")
+    arg_parser.add_argument("--top-k", type=int, default=50, help="Top candidates compared across tiers")
+    arg_parser.add_argument("--tiers", default=",".join(ENCODER_TIERS), help="Comma-separated tiers to run")
+    args = arg_parser.parse_args()
+
+    with open(DATA_PATH, newline='', encoding='utf-8') as f:
+        resumes = [clean_text(row['Resume_Text']) for row in csv.DictReader(f)][:args.limit]
+    # Sorted by length, as the matcher submits them
+    resumes.sort(key=len)
+    jd = clean_text(JD_TEXT)
+
+    print("="*60)
+    print(f"ENCODER TIER BENCHMARK ({len(resumes)} resumes, batch {args.batch_size})")
+    print("="*60)
+
+    scores = {}
+    tiers = args.tiers.split(",")
+    if "fast" in tiers and not static_encoder_exists(static_model_path()):
+        print(f"Distilling the static encoder into {build_static_model()}")
+    for tier in tiers:
+        model = get_encoder_model(tier)
+        # Warm-up so no tier pays for lazy initialization
+        model.encode(resumes[:2], batch_size=args.batch_size, normalize_embeddings=True)
+        elapsed, embeddings = time_encode(model, resumes, args.batch_size, args.repeats)
+        scores[tier] = embeddings @ model.encode([jd], normalize_embeddings=True)[0]
+        print(f"{tier:<9} {elapsed:7.3f}s  {len(resumes) / elapsed:10.1f} docs/s")
+
+    if "standard" in scores:
+        reference = scores["standard"]
+        top = set(np.argsort(-reference)[:args.top_k])
+        for tier, tier_scores in scores.items():
+            if tier == "standard":
+                continue
+            overlap = len(top & set(np.argsort(-tier_scores)[:args.top_k])) / len(top)
+            print(f"{tier} vs standard: Spearman {spearmanr(reference, tier_scores).correlation:.3f}, "
+                  f"top-{args.top_k} overlap {overlap:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: import-time cost of the API
+Imports a module in a fresh interpreter with `python -X importtime` and reports
+the wall time plus the cost per module: project modules by cumulative time
+(including what they import) and third-party packages by their own time
+"""
+
+import argparse
+import subprocess
+import sys
+import os
+import time
+from collections import defaultdict
+
+# Project root (the child interpreter imports from here)
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+PROJECT_PACKAGES = ("api", "src")
+
+
+def profile_import(module):
+    """
+    Import `module` in a new interpreter
+
+    Returns:
+        Wall time (seconds) and a list of (module, self_us, cumulative_us) in import order
+    """
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return wall, rows
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--module", default="api.main", help="Module to import")
+    arg_parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Fresh imports; the fastest is reported")
+    args = arg_parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.repeats)]
+    wall, rows = min(runs, key=lambda run: run[0])
+
+    project = [(name, cumulative) for name, _, cumulative in rows if name.split(".")[0] in PROJECT_PACKAGES]
+    third_party = defaultdict(int)
+    for name, self_us, _ in rows:
+        package = name.split(".")[0]
+        if package not in PROJECT_PACKAGES:
+            third_party[package] += self_us
+
+    print("="*60)
+    print(f"IMPORT TIME: {args.module} (best of {args.repeats})")
+    print("="*60)
+    print(f"Wall time (interpreter start + import): {wall:.2f}s")
+    print(f"Modules imported: {len(rows)}, total import time {sum(s for _, s, _ in rows) / 1e6:.2f}s")
+
+    print(f"\nProject modules (cumulative):")
+    for name, cumulative in sorted(project, key=lambda item: -item[1])[:args.top]:
+        print(f"  {name:<50} {cumulative / 1000:9.1f}ms")
+
+    print(f"\nThird-party packages (own time):")
+    for package, self_us in sorted(third_party.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {package:<50} {self_us / 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: encoder backends on CPU
+Encodes the same resumes with the torch (sentence-transformers) encoder and
+the ONNX Runtime backend, in fp32 and dynamically int8-quantized, and reports
+encodes/sec and the cosine deviation of each ONNX backend from torch
+"""
+
+import argparse
+import csv
+import sys
+import os
+import time
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+import torch
+
+from src.preprocessing.text_cleaner import clean_text
+from src.matching.semantic_matcher_bert import load_torch_encoder, ENCODE_BATCH_SIZE
+from src.matching.onnx_encoder import export_onnx_encoder, OnnxEncoder
+
+DATA_PATH = "data/synthetic_resumes_1k.csv"
+
+
+def time_encode(model, texts, batch_size, repeats):
+    """Best wall time over repeats, and the embeddings"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        embeddings = model.encode(texts, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+        best = min(best, time.perf_counter() - start)
+    return best, embeddings
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--limit", type=int, default=256, help="Number of resumes to encode")
+    arg_parser.add_argument("--batch-size", type=int, default=ENCODE_BATCH_SIZE, help="Texts per forward pass")
+    arg_parser.add_argument("--repeats", type=int, default=3, help="Runs per backend; the fastest is reported")
+    args = arg_parser.parse_args()
+
+    with open(DATA_PATH, newline='', encoding='utf-8') as f:
+        resumes = [clean_text(row['Resume_Text']) for row in csv.DictReader(f)][:args.limit]
+    # Sorted by length, as the matcher submits them
+    resumes.sort(key=len)
+
+    torch_model = load_torch_encoder()
+    with tempfile.TemporaryDirectory() as path:
+        export_onnx_encoder(torch_model, path)
+        backends = {
+            "torch": torch_model,
+            # Same thread count as torch, for a like-for-like comparison
+            "onnx fp32": OnnxEncoder(path, quantized=False, threads=torch.get_num_threads()),
+            "onnx int8": OnnxEncoder(path, quantized=True, threads=torch.get_num_threads()),
+        }
+
+        print("="*60)
+        print(f"ENCODER BACKEND BENCHMARK ({len(resumes)} resumes, batch {args.batch_size}, "
+              f"{torch.get_num_threads()} threads)")
+        print("="*60)
+
+        results = {}
+        reference = None
+        for label, model in backends.items():
+            # Warm-up so neither side pays for lazy initialization
+            model.encode(resumes[:2], batch_size=args.batch_size, normalize_embeddings=True)
+            elapsed, embeddings = time_encode(model, resumes, args.batch_size, args.repeats)
+            results[label] = elapsed
+            line = f"{label:<10} {elapsed:7.2f}s  {len(resumes) / elapsed:8.1f} encodes/s"
+            if reference is None:
+                reference = embeddings
+            else:
+                cosine = (reference * embeddings).sum(axis=1)
+                line += f"  cosine to torch: min {cosine.min():.5f}, mean {cosine.mean():.5f}"
+            print(line)
+
+    for label in ("onnx fp32", "onnx int8"):
+        print(f"Speedup {label} vs torch: {results['torch'] / results[label]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
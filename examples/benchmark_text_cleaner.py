@@ -0,0 +1,73 @@
+"""
+Benchmark: text cleaning stage
+Compares the original per-token stopword lookup with the frozen-set cleaner
+and the cached JD path on data/synthetic_resumes_1k.csv
+"""
+
+import csv
+import re
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from src.preprocessing.text_cleaner import clean_text, cached_clean_text, clear_clean_text_cache
+
+DATA_PATH = "data/synthetic_resumes_1k.csv"
+JD_PATH = "data/job_descriptions/jd_data_scientist.txt"
+
+
+def legacy_clean_text(text):
+    """The original implementation (stopword list reloaded for every token)"""
+    from nltk.corpus import stopwords
+    text = text.lower()
+    text = re.sub(r'[^a-zA-Z ]', ' ', text)
+    words = text.split()
+    words = [w for w in words if w not in stopwords.words("english")]
+    return " ".join(words)
+
+
+def load_resumes(path=DATA_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [row['Resume_Text'] for row in csv.DictReader(f)]
+
+
+def time_call(fn, texts):
+    start = time.perf_counter()
+    for text in texts:
+        fn(text)
+    return time.perf_counter() - start
+
+
+def main():
+    resumes = load_resumes()
+    with open(JD_PATH, 'r', encoding='utf-8', errors='ignore') as f:
+        jd_text = f.read()
+
+    print("="*60)
+    print(f"TEXT CLEANER BENCHMARK ({len(resumes)} resumes)")
+    print("="*60)
+
+    new_time = time_call(clean_text, resumes)
+    print(f"clean_text (frozen set):   {new_time:.3f}s  ({len(resumes)/new_time:,.0f} docs/s)")
+
+    try:
+        legacy_time = time_call(legacy_clean_text, resumes)
+        mismatches = sum(1 for t in resumes if legacy_clean_text(t) != clean_text(t))
+        print(f"legacy clean_text:         {legacy_time:.3f}s  ({len(resumes)/legacy_time:,.0f} docs/s)")
+        print(f"Speedup: {legacy_time/new_time:.1f}x, output mismatches: {mismatches}")
+    except (ImportError, LookupError) as e:
+        print(f"Legacy comparison skipped (NLTK stopwords unavailable: {e})")
+
+    # JD cleaned once per resume, as batch_analyze does
+    clear_clean_text_cache()
+    uncached = time_call(clean_text, [jd_text] * len(resumes))
+    cached = time_call(cached_clean_text, [jd_text] * len(resumes))
+    print(f"JD x{len(resumes)} uncached:         {uncached*1000:.1f}ms")
+    print(f"JD x{len(resumes)} cached:           {cached*1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
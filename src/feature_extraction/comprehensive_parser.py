@@ -1,8 +1,9 @@
 
 import re
-import spacy
 from typing import Dict, List, Any
 
+from src.feature_extraction.spacy_pipeline import get_spacy_pipeline
+
 class ComprehensiveParser:
     """
     Parses resume text to extract deep structured data:
@@ -13,13 +14,10 @@ class ComprehensiveParser:
     - Certifications
     """
 
-    def __init__(self):
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_spacy_pipeline()
 
     def parse(self, text: str) -> Dict[str, Any]:
         """Run all extractions and return a structured dictionary"""
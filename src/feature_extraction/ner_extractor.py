@@ -3,24 +3,20 @@ Named Entity Recognition (NER) Extractor
 Extracts structured entities from resumes: companies, certifications, projects, locations
 """
 
-import spacy
 import re
 
+from src.feature_extraction.spacy_pipeline import get_spacy_pipeline
+
 class NERExtractor:
     """
     Advanced NER extractor for resume parsing
     Extracts: Organizations, Certifications, Projects, Locations, Dates
     """
     
-    def __init__(self):
-        """Initialize spaCy NER model"""
-        try:
-            self.nlp = spacy.load("en_core_web_sm")
-        except OSError:
-            print("Downloading spaCy model...")
-            import subprocess
-            subprocess.run(["python", "-m", "spacy", "download", "en_core_web_sm"])
-            self.nlp = spacy.load("en_core_web_sm")
+    @property
+    def nlp(self):
+        """Shared spaCy pipeline, loaded on first use"""
+        return get_spacy_pipeline()
     
     def extract_entities(self, text):
         """
@@ -0,0 +1,42 @@
+"""
+Resume Feature Extraction
+Candidate-side features that do not depend on the job description.
+Kept free of heavy model imports so it can run inside lightweight worker processes.
+"""
+
+from src.preprocessing.resume_parser import extract_text
+from src.preprocessing.text_cleaner import clean_text
+from src.feature_extraction.skill_extractor import extract_skills
+from src.feature_extraction.experience_extractor import extract_experience
+from src.feature_extraction.education_extractor import extract_education
+from src.matching.bias_filter import remove_bias
+
+
+def extract_resume_features(resume_path):
+    """
+    Parse a resume file and extract its scoring features
+
+    Returns:
+        Dictionary with raw/clean text, skills, experience years,
+        education score and degree
+    """
+    return extract_features_from_text(extract_text(resume_path))
+
+
+def extract_features_from_text(resume_text_raw):
+    """Scoring features from already-parsed resume text"""
+    # FEATURE 5: Bias-Reduced Hiring Mechanism
+    resume_text_unbiased = remove_bias(resume_text_raw)
+
+    resume_clean = clean_text(resume_text_unbiased)
+
+    edu_score, degree = extract_education(resume_clean)
+
+    return {
+        'raw_text': resume_text_raw,
+        'clean_text': resume_clean,
+        'skills': extract_skills(resume_clean),
+        'experience_years': extract_experience(resume_clean),
+        'education_score': edu_score,
+        'degree': degree
+    }
@@ -3,6 +3,8 @@ Enterprise-Grade Skill Database
 Supports 500+ skills across multiple industries with synonym mapping
 """
 
+from src.feature_extraction.skill_matcher import SkillMatcher
+
 # Comprehensive Skill Database organized by industry/category
 SKILLS_DATABASE = {
     # Programming Languages
@@ -251,36 +253,22 @@ def normalize_skill(skill_text):
     skill_lower = skill_text.lower().strip()
     return SKILL_SYNONYMS.get(skill_lower, skill_lower)
 
+def _build_skill_matcher():
+    """Compile every skill and synonym into one single-pass matcher"""
+    term_map = {}
+    for skill in get_all_skills() + list(SKILL_SYNONYMS.keys()):
+        term_map[skill] = normalize_skill(skill)
+    return SkillMatcher(term_map)
+
 def extract_skills(text):
     """
     Extract skills from text with improved matching and synonym support
+    Uses the import-time automaton: one linear pass per document
     """
     if not text:
         return []
     
-    text_lower = text.lower()
-    skills_found = []
-    all_skills = get_all_skills()
-    
-    # Add synonyms to search space
-    search_terms = all_skills + list(SKILL_SYNONYMS.keys())
-    
-    for skill in search_terms:
-        # Normalize the skill
-        normalized = normalize_skill(skill)
-        
-        # Check for exact match with word boundaries
-        import re
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
-            if normalized not in skills_found:
-                skills_found.append(normalized)
-        # Also check for the skill as part of compound terms
-        elif skill in text_lower and len(skill) > 4:
-            if normalized not in skills_found:
-                skills_found.append(normalized)
-    
-    return list(set(skills_found))
+    return list(_SKILL_MATCHER.find(text.lower()))
 
 def get_skills_by_category(category):
     """Get skills for a specific category"""
@@ -297,3 +285,6 @@ def categorize_skills(skills_list):
 
 # Backward compatibility: maintain SKILLS_DB for existing code
 SKILLS_DB = get_all_skills()
+
+# Built once at import; shared by every extract_skills call
+_SKILL_MATCHER = _build_skill_matcher()
@@ -0,0 +1,109 @@
+"""
+Single-Pass Skill Matcher
+Aho-Corasick automaton over the skill vocabulary with regex-compatible word boundaries
+"""
+
+from collections import deque
+
+
+def _is_word_char(ch):
+    """Mirror of the regex \\w class for str patterns"""
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Multi-pattern matcher built once over every skill term and synonym.
+
+    A term is reported when one of its occurrences sits on regex word
+    boundaries (same semantics as r'\\b' + re.escape(term) + r'\\b'), or,
+    for terms longer than `substring_min_length - 1` characters, whenever it
+    occurs anywhere in the text (compound terms such as "pythonista").
+    """
+
+    def __init__(self, term_map, substring_min_length=5):
+        """
+        Args:
+            term_map: Dict of lowercase search term -> normalized skill name
+            substring_min_length: Terms at least this long also match inside words
+        """
+        self.substring_min_length = substring_min_length
+
+        # Node i: goto transitions, failure link and (term, normalized) outputs
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+
+        for term, normalized in term_map.items():
+            if term:
+                self._add_term(term, normalized)
+        self._build_failure_links()
+
+    def _add_term(self, term, normalized):
+        node = 0
+        for ch in term:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+
+        # Boundary flags are precomputed so the scan only inspects neighbours
+        self._out[node].append((
+            len(term),
+            normalized,
+            _is_word_char(term[0]),
+            _is_word_char(term[-1]),
+            len(term) >= self.substring_min_length
+        ))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def find(self, text):
+        """
+        Scan text once and return the set of normalized skills found.
+        Text is expected to be lowercased already.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        n = len(text)
+
+        found = set()
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+
+            if not out[node]:
+                continue
+
+            for length, normalized, starts_word, ends_word, substring_ok in out[node]:
+                if normalized in found:
+                    continue
+                if substring_ok:
+                    found.add(normalized)
+                    continue
+
+                start = i - length + 1
+                before = _is_word_char(text[start - 1]) if start > 0 else False
+                after = _is_word_char(text[i + 1]) if i + 1 < n else False
+                if before != starts_word and after != ends_word:
+                    found.add(normalized)
+
+        return found
@@ -0,0 +1,32 @@
+"""
+Shared spaCy Pipeline
+One English pipeline per process, loaded on first use and shared by the
+comprehensive parser and the NER extractor.
+
+Nothing is downloaded at runtime: the model is installed with the build
+(python -m spacy download en_core_web_sm). Without it a blank English
+pipeline is used, which tokenizes but finds no named entities.
+"""
+
+import os
+import threading
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+_nlp = None
+_nlp_lock = threading.Lock()
+
+
+def get_spacy_pipeline():
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                import spacy
+                try:
+                    _nlp = spacy.load(SPACY_MODEL)
+                except OSError:
+                    print(f"⚠ spaCy model {SPACY_MODEL} is not installed "
+                          f"(python -m spacy download {SPACY_MODEL}); named entities are disabled")
+                    _nlp = spacy.blank("en")
+    return _nlp
@@ -0,0 +1,345 @@
+"""
+Embedding Store
+Persistent, append-only store of normalized sentence embeddings keyed by text digest.
+
+Vectors live in a memory-mapped .npy matrix, so every worker on the host reads
+them through the shared page cache; a SQLite (WAL) table maps digests to rows.
+Each encoder model (and dimension/dtype) gets its own directory, so a model
+swap never mixes vector spaces. A model's dimension is also recorded next to
+the directories, so a store can be opened without loading the model.
+"""
+
+import os
+import re
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX: writers are serialized within the process only
+    fcntl = None
+
+EMBEDDING_STORE_ENABLED = os.getenv("EMBEDDING_STORE", "1") != "0"
+EMBEDDING_STORE_DIR = os.getenv("EMBEDDING_STORE_DIR", "cache/embeddings")
+
+# float16 halves disk/page-cache use at a small precision cost in the scores
+EMBEDDING_STORE_DTYPE = os.getenv("EMBEDDING_STORE_DTYPE", "float32")
+
+# Rows preallocated by the first write; the file doubles whenever it fills up
+_INITIAL_CAPACITY = 1024
+
+# SQLite host-parameter limit friendly chunk size for IN (...) lookups
+_SQL_CHUNK = 500
+
+
+def text_key(text):
+    """Store key for a text (digest of its UTF-8 bytes)"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _slug(model_name):
+    return re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+
+
+def _dimension_path(model_name, root=None):
+    return os.path.join(root or EMBEDDING_STORE_DIR, f"{_slug(model_name)}.dim")
+
+
+def recorded_dimension(model_name, root=None):
+    """Embedding dimension recorded for a model by record_dimension, or None"""
+    try:
+        with open(_dimension_path(model_name, root)) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def record_dimension(model_name, dim, root=None):
+    """Record a model's embedding dimension (written atomically; errors are ignored)"""
+    path = _dimension_path(model_name, root)
+    try:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        staging = f"{path}.{os.getpid()}.tmp"
+        with open(staging, 'w') as f:
+            f.write(str(int(dim)))
+        os.replace(staging, path)
+    except OSError:
+        pass
+
+
+class EmbeddingStore:
+    """
+    Append-only embedding matrix with a digest -> row index
+
+    The matrix file is preallocated and rewritten only when it grows or is
+    compacted; each rewrite is a new generation (vectors-<n>.npy) recorded
+    in the index, so readers mapping the previous file are never disturbed.
+    Writers hold an exclusive file lock, write the vectors first and commit
+    the index rows last, so a reader never sees a row that is not yet written.
+    Errors degrade to cache misses so encoding never fails because of the store.
+    """
+
+    def __init__(self, model_name, dim, root=None, dtype=None):
+        self.model_name = model_name
+        self.dim = dim
+        self.dtype = np.dtype(dtype or EMBEDDING_STORE_DTYPE)
+
+        self.directory = os.path.join(root or EMBEDDING_STORE_DIR, f"{_slug(model_name)}-{dim}d-{self.dtype.name}")
+        self._index_path = os.path.join(self.directory, 'index.db')
+        self._lock_path = os.path.join(self.directory, 'write.lock')
+
+        self._thread_lock = threading.Lock()
+        self._initialized = False
+        self._mapped = (None, None)  # (generation, read-only memmap)
+        self._row_keys = (None, [])  # (generation, keys in row order) for snapshot()
+
+    def _vectors_path(self, generation):
+        return os.path.join(self.directory, f"vectors-{generation}.npy")
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(self.directory, exist_ok=True)
+        conn = sqlite3.connect(self._index_path, timeout=30)
+        # A lost tail after power failure only costs re-encoding
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, row INTEGER NOT NULL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)')
+            conn.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('generation', 0), ('rows', 0)")
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    @contextmanager
+    def _write_lock(self):
+        """Exclusive across threads and (where supported) processes"""
+        with self._thread_lock:
+            with open(self._lock_path, 'a') as handle:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _meta(self, conn):
+        values = dict(conn.execute('SELECT name, value FROM meta').fetchall())
+        return values['generation'], values['rows']
+
+    def _lookup_rows(self, conn, keys):
+        rows = {}
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start:start + _SQL_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows.update(conn.execute(
+                f'SELECT key, row FROM embeddings WHERE key IN ({placeholders})', chunk
+            ).fetchall())
+        return rows
+
+    def _matrix(self, generation):
+        """Read-only mapping of a generation's matrix, reopened when the generation changes"""
+        mapped_generation, matrix = self._mapped
+        if mapped_generation != generation:
+            matrix = np.load(self._vectors_path(generation), mmap_mode='r')
+            self._mapped = (generation, matrix)
+        return matrix
+
+    def get_many(self, keys):
+        """
+        Look up embeddings by key
+
+        Returns:
+            Dictionary key -> float32 vector for the keys present in the store
+        """
+        unique = list(dict.fromkeys(keys))
+        if not unique:
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                # Generation and rows from one snapshot
+                conn.execute('BEGIN')
+                generation, _ = self._meta(conn)
+                rows = self._lookup_rows(conn, unique)
+                conn.rollback()
+            finally:
+                conn.close()
+            if not rows:
+                return {}
+            matrix = self._matrix(generation)
+            found_keys = list(rows)
+            vectors = np.asarray(matrix[[rows[k] for k in found_keys]], dtype=np.float32)
+            return dict(zip(found_keys, vectors))
+        except (sqlite3.Error, OSError, ValueError):
+            return {}
+
+    def snapshot(self):
+        """
+        Every stored vector in row order, for scanning the whole store
+
+        Returns:
+            (generation, keys in row order, read-only memmap of shape (len(keys), dim))
+        """
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN')
+            generation, used = self._meta(conn)
+            # Rows are append-only within a generation: only fetch keys added since the last call
+            known_generation, keys = self._row_keys
+            if known_generation != generation:
+                keys = []
+            if len(keys) < used:
+                keys = keys + [key for key, in conn.execute(
+                    'SELECT key FROM embeddings WHERE row >= ? ORDER BY row', (len(keys),)
+                )]
+                self._row_keys = (generation, keys)
+            conn.rollback()
+        finally:
+            conn.close()
+        keys = keys[:used]
+        if not used:
+            return generation, keys, np.zeros((0, self.dim), dtype=self.dtype)
+        return generation, keys, self._matrix(generation)[:used]
+
+    def put_many(self, keys, vectors):
+        """Append embeddings for keys not already stored"""
+        if len(keys) == 0:
+            return
+        vectors = np.asarray(vectors)
+        try:
+            conn = self._connect()
+            try:
+                with self._write_lock():
+                    present = self._lookup_rows(conn, list(dict.fromkeys(keys)))
+                    new = {}
+                    for key, vector in zip(keys, vectors):
+                        if key not in present and key not in new:
+                            new[key] = vector
+                    if not new:
+                        return
+
+                    generation, used = self._meta(conn)
+                    needed = used + len(new)
+                    current_generation = generation
+                    if needed > self._capacity(generation):
+                        generation = self._rewrite(generation, np.arange(used), max(needed, 2 * used))
+
+                    matrix = np.load(self._vectors_path(generation), mmap_mode='r+')
+                    matrix[used:needed] = np.stack(list(new.values())).astype(self.dtype)
+                    matrix.flush()
+                    del matrix
+
+                    conn.executemany(
+                        'INSERT INTO embeddings (key, row) VALUES (?, ?)',
+                        [(key, used + i) for i, key in enumerate(new)]
+                    )
+                    self._set_meta(conn, generation, needed)
+                    conn.commit()
+                    self._drop_generation(current_generation, generation)
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError, ValueError):
+            pass
+
+    def _capacity(self, generation):
+        path = self._vectors_path(generation)
+        if not os.path.exists(path):
+            return 0
+        return np.load(path, mmap_mode='r').shape[0]
+
+    def _rewrite(self, generation, source_rows, capacity):
+        """
+        Copy the given rows of a generation, in order, into a new preallocated file
+
+        Returns:
+            The new generation number
+        """
+        new_generation = generation + 1
+        capacity = max(capacity, _INITIAL_CAPACITY)
+        target = np.lib.format.open_memmap(
+            self._vectors_path(new_generation), mode='w+', dtype=self.dtype, shape=(capacity, self.dim)
+        )
+        if len(source_rows):
+            source = np.load(self._vectors_path(generation), mmap_mode='r')
+            target[:len(source_rows)] = source[source_rows]
+        target.flush()
+        del target
+        return new_generation
+
+    def _set_meta(self, conn, generation, rows):
+        conn.executemany('UPDATE meta SET value = ? WHERE name = ?', [(generation, 'generation'), (rows, 'rows')])
+
+    def _drop_generation(self, old_generation, new_generation):
+        """Remove a superseded matrix file (processes that mapped it keep their mapping)"""
+        if old_generation != new_generation:
+            try:
+                os.remove(self._vectors_path(old_generation))
+            except FileNotFoundError:
+                pass
+
+    def compact(self, keep_keys=None, max_rows=None):
+        """
+        Rewrite the matrix without dropped entries, trimming spare capacity
+
+        Args:
+            keep_keys: Only keep these keys (None keeps every entry)
+            max_rows: Keep at most this many of the most recently added entries
+
+        Returns:
+            Number of entries kept
+        """
+        conn = self._connect()
+        try:
+            with self._write_lock():
+                generation, used = self._meta(conn)
+                entries = conn.execute('SELECT key, row FROM embeddings ORDER BY row').fetchall()
+                if keep_keys is not None:
+                    keep_keys = set(keep_keys)
+                    entries = [entry for entry in entries if entry[0] in keep_keys]
+                if max_rows is not None:
+                    entries = entries[-max_rows:] if max_rows > 0 else []
+
+                if used:
+                    new_generation = self._rewrite(
+                        generation, np.array([row for _, row in entries], dtype=np.int64), len(entries)
+                    )
+                else:
+                    new_generation = generation
+
+                conn.execute('DELETE FROM embeddings')
+                conn.executemany(
+                    'INSERT INTO embeddings (key, row) VALUES (?, ?)',
+                    [(key, i) for i, (key, _) in enumerate(entries)]
+                )
+                self._set_meta(conn, new_generation, len(entries))
+                conn.commit()
+                self._drop_generation(generation, new_generation)
+                return len(entries)
+        finally:
+            conn.close()
+
+    def stats(self):
+        """Entry count, allocated rows and file size of the current generation"""
+        try:
+            conn = self._connect()
+            try:
+                generation, used = self._meta(conn)
+            finally:
+                conn.close()
+            path = self._vectors_path(generation)
+            return {
+                'model': self.model_name,
+                'dtype': self.dtype.name,
+                'generation': generation,
+                'entries': used,
+                'capacity': self._capacity(generation),
+                'bytes': os.path.getsize(path) if os.path.exists(path) else 0
+            }
+        except (sqlite3.Error, OSError, ValueError):
+            return {'model': self.model_name, 'dtype': self.dtype.name, 'entries': 0}
@@ -0,0 +1,143 @@
+"""
+Encoder Service
+One thread per process owns the sentence encoder and serves embedding requests
+from every caller (concurrent analysis jobs, the talent pool, training).
+
+Requests queue up while the model is busy; the service thread then takes as
+many as fit in ENCODER_MAX_BATCH texts, waiting at most ENCODER_MAX_WAIT after
+the oldest one arrived when several callers are active, and runs them through
+the model in one call. Texts requested by several callers in the same batch
+are encoded once. Callers get a Future per request, so a job never waits
+longer than one model call plus the batching deadline for its texts.
+"""
+
+import os
+import time
+import queue
+import threading
+from concurrent.futures import Future
+
+ENCODER_SERVICE_ENABLED = os.getenv("ENCODER_SERVICE", "1") != "0"
+
+# Texts per model call collected across requests (a larger single request still goes in one call)
+ENCODER_MAX_BATCH = int(os.getenv("ENCODER_MAX_BATCH", "128"))
+
+# Seconds a request may wait for others to join its batch
+ENCODER_MAX_WAIT = float(os.getenv("ENCODER_MAX_WAIT_MS", "5")) / 1000
+
+
+class EncoderService:
+    """
+    Dynamic micro-batching front end for an encode function
+
+    Args:
+        encode_fn: encode_fn(texts, batch_size) -> (len(texts), dim) array in input order
+        max_batch: Texts per model call (requests are never split)
+        max_wait: Seconds the oldest queued request waits for more to arrive
+    """
+
+    def __init__(self, encode_fn, max_batch=ENCODER_MAX_BATCH, max_wait=ENCODER_MAX_WAIT):
+        self.encode_fn = encode_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait)
+        self._queue = queue.Queue()
+        self._thread = None
+        self._pid = None
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._last_batch_requests = 0
+        self.requests = 0
+        self.batches = 0
+        self.texts = 0
+        self.encoded = 0
+        self.wait_time = 0.0
+
+    def _ensure_thread(self):
+        # A forked worker inherits the object but not the thread: start one per process
+        if self._thread is not None and self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                if self._pid != os.getpid():
+                    self._queue = queue.Queue()
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name="encoder-service", daemon=True)
+                self._thread.start()
+
+    def submit(self, texts, batch_size=None):
+        """
+        Queue texts for encoding
+
+        Returns:
+            Future resolving to their (len(texts), dim) embedding matrix, in input order
+        """
+        future = Future()
+        if not texts:
+            future.set_result(None)
+            return future
+        self._ensure_thread()
+        self._queue.put((list(texts), batch_size, future, time.monotonic()))
+        return future
+
+    def encode(self, texts, batch_size=None):
+        """Blocking submit"""
+        return self.submit(texts, batch_size).result()
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or the deadline passes"""
+        first = self._queue.get()
+        batch = [first]
+        size = len(first[0])
+        # Waiting only pays off with several active callers: a lone caller
+        # (last batch served one request, nothing else queued) is served at once
+        concurrent = self._last_batch_requests > 1 or not self._queue.empty()
+        deadline = first[3] + (self.max_wait if concurrent else 0.0)
+        while size < self.max_batch:
+            try:
+                request = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            batch.append(request)
+            size += len(request[0])
+        self._last_batch_requests = len(batch)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.monotonic()
+
+            # One model call for the distinct texts of every request in the batch
+            unique = list(dict.fromkeys(text for texts, _, _, _ in batch for text in texts))
+            sizes = [size for _, size, _, _ in batch if size]
+            try:
+                matrix = self.encode_fn(unique, max(sizes) if sizes else None)
+            except Exception as e:
+                for _, _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+
+            index = {text: i for i, text in enumerate(unique)}
+            for texts, _, future, _ in batch:
+                future.set_result(matrix[[index[text] for text in texts]])
+
+            with self._stats_lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.texts += sum(len(texts) for texts, _, _, _ in batch)
+                self.encoded += len(unique)
+                self.wait_time += sum(started - queued_at for _, _, _, queued_at in batch)
+
+    def stats(self):
+        """Batching counters for this process"""
+        with self._stats_lock:
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'texts': self.texts,
+                'encoded': self.encoded,
+                'requests_per_batch': round(self.requests / self.batches, 2) if self.batches else 0.0,
+                'texts_per_batch': round(self.encoded / self.batches, 2) if self.batches else 0.0,
+                'avg_wait_ms': round(self.wait_time / self.requests * 1000, 3) if self.requests else 0.0,
+                'queued': self._queue.qsize(),
+            }
@@ -0,0 +1,76 @@
+"""
+Job Description Profile
+Everything derived from a JD that does not depend on the candidate,
+computed once per job and shared by every resume analysis
+"""
+
+from src.preprocessing.text_cleaner import cached_clean_text
+from src.feature_extraction.skill_extractor import extract_skills
+from src.feature_extraction.experience_extractor import extract_experience
+from src.matching.role_weights import detect_role_from_jd, get_role_weights
+from src.matching.semantic_matcher_bert import encode_text, encode_texts, resolve_encoder_tier
+
+# Used when the JD does not state a number of years
+DEFAULT_REQUIRED_EXPERIENCE = 3
+
+
+class JDProfile:
+    """
+    Precomputed job description features:
+    cleaned text, skill set, required years, role, role weights and
+    the normalized sentence embedding from its encoder tier (resumes scored
+    against the profile are encoded with the same tier). The embedding is only
+    encoded when first read, so skill-only uses never load the encoder.
+    """
+
+    def __init__(self, jd_text, job_role=None, embedding=None, encoder_tier=None):
+        """
+        Args:
+            jd_text: Raw job description text
+            job_role: Target role; detected from the JD text when omitted
+            embedding: Precomputed normalized embedding of the cleaned text (encoded on first use if omitted)
+            encoder_tier: Encoder tier (see ENCODER_TIERS; default DEFAULT_ENCODER_TIER)
+        """
+        self.raw_text = jd_text
+        self.cleaned_text = cached_clean_text(jd_text)
+
+        self.skills = extract_skills(self.cleaned_text)
+        self.skill_set = set(self.skills)
+
+        self.required_experience = extract_experience(self.cleaned_text) or DEFAULT_REQUIRED_EXPERIENCE
+
+        self.job_role = job_role or detect_role_from_jd(jd_text)
+        self.role_weights = get_role_weights(self.job_role)
+
+        self.encoder_tier = resolve_encoder_tier(encoder_tier)
+        self._embedding = embedding
+
+    @property
+    def embedding(self):
+        if self._embedding is None:
+            self._embedding = encode_text(self.cleaned_text, self.encoder_tier)
+        return self._embedding
+
+    def __repr__(self):
+        return (f"JDProfile(role={self.job_role!r}, skills={len(self.skill_set)}, "
+                f"required_experience={self.required_experience}, encoder_tier={self.encoder_tier!r})")
+
+
+def build_jd_profile(jd_text, job_role=None, encoder_tier=None):
+    """Convenience constructor mirroring the functional API used elsewhere"""
+    return JDProfile(jd_text, job_role, encoder_tier=encoder_tier)
+
+
+def build_jd_profiles(jd_texts, job_roles=None, encoder_tier=None):
+    """
+    Profiles for many JDs with a single batched encode
+
+    Args:
+        jd_texts: List of raw job description texts
+        job_roles: Matching list of roles (None entries are detected)
+        encoder_tier: Encoder tier shared by every profile
+    """
+    job_roles = job_roles or [None] * len(jd_texts)
+    embeddings = encode_texts([cached_clean_text(jd_text) for jd_text in jd_texts], tier=encoder_tier)
+    return [JDProfile(jd_text, job_role, embedding, encoder_tier)
+            for jd_text, job_role, embedding in zip(jd_texts, job_roles, embeddings)]
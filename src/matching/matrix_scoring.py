@@ -0,0 +1,97 @@
+"""
+Resume x JD Score Matrix
+Vectorized form of the core scoring in MLInferenceEngine.score_resume for
+placing many resumes across many job descriptions at once.
+
+Semantic scores come from one GEMM of the resume and JD embedding matrices,
+skill overlap from a sparse resume-skill x JD-skill product; experience,
+education and role weighting are broadcast over the (resumes, JDs) grid.
+"""
+
+import numpy as np
+from scipy import sparse
+
+from src.matching.semantic_matcher_bert import encode_texts
+
+
+def skill_incidence(skill_lists, vocabulary):
+    """Sparse binary (len(skill_lists), len(vocabulary)) matrix; skills outside the vocabulary are ignored"""
+    rows, cols = [], []
+    for i, skills in enumerate(skill_lists):
+        for skill in set(skills):
+            col = vocabulary.get(skill)
+            if col is not None:
+                rows.append(i)
+                cols.append(col)
+    data = np.ones(len(rows), dtype=np.float32)
+    return sparse.csr_matrix((data, (rows, cols)), shape=(len(skill_lists), len(vocabulary)))
+
+
+def score_matrix(resume_features, jd_profiles, resume_embeddings=None):
+    """
+    Score every resume against every JD
+
+    Args:
+        resume_features: List of extract_resume_features outputs
+        jd_profiles: List of JDProfile
+        resume_embeddings: Normalized (resumes, dim) matrix (encoded here, with the
+            profiles' encoder tier, if omitted)
+
+    Returns:
+        Dictionary of (resumes, JDs) float arrays: 'final', 'semantic',
+        'skill_overlap' (% of JD skills), 'skill_matches' (count), 'experience',
+        plus the per-resume 'education' vector
+    """
+    if resume_embeddings is None:
+        resume_embeddings = encode_texts([features['clean_text'] for features in resume_features],
+                                         tier=jd_profiles[0].encoder_tier)
+    jd_embeddings = np.stack([profile.embedding for profile in jd_profiles]).astype(resume_embeddings.dtype)
+
+    # FEATURE 1: Semantic similarity for all pairs in one GEMM
+    semantic = np.round((resume_embeddings @ jd_embeddings.T).astype(np.float64) * 100, 2)
+
+    # Skill overlap: |resume skills & JD skills| / |JD skills| via a sparse product
+    vocabulary = {}
+    for profile in jd_profiles:
+        for skill in profile.skill_set:
+            vocabulary.setdefault(skill, len(vocabulary))
+    resume_skills = skill_incidence([features['skills'] for features in resume_features], vocabulary)
+    jd_skills = skill_incidence([profile.skill_set for profile in jd_profiles], vocabulary)
+    overlap_counts = np.asarray((resume_skills @ jd_skills.T).todense(), dtype=np.float64)
+    jd_skill_counts = np.array([len(profile.skill_set) for profile in jd_profiles], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skill_overlap = np.where(jd_skill_counts > 0, overlap_counts / jd_skill_counts * 100, 0.0)
+
+    # FEATURE 4: Experience score (same rule as experience_score, broadcast)
+    candidate_years = np.array([features['experience_years'] for features in resume_features], dtype=np.float64)[:, None]
+    required_years = np.array([profile.required_experience for profile in jd_profiles], dtype=np.float64)[None, :]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        experience = np.where(
+            (required_years == 0) | (candidate_years >= required_years),
+            100.0,
+            np.round(candidate_years / required_years * 100, 2)
+        )
+
+    education = np.array([features['education_score'] for features in resume_features], dtype=np.float64)
+
+    # FEATURE 9: Role-specific component weights per JD
+    weights = {
+        component: np.array([profile.role_weights[component] for profile in jd_profiles], dtype=np.float64)
+        for component in ('semantic', 'skills', 'experience', 'education')
+    }
+    final = (
+        semantic * weights['semantic'] +
+        skill_overlap * weights['skills'] +
+        experience * weights['experience'] +
+        education[:, None] * weights['education']
+    )
+    final = np.minimum(100.0, final)
+
+    return {
+        'final': final,
+        'semantic': semantic,
+        'skill_overlap': skill_overlap,
+        'skill_matches': overlap_counts,
+        'experience': experience,
+        'education': education
+    }
@@ -0,0 +1,205 @@
+"""
+ONNX Encoder Backend
+Runs the sentence encoder through onnxruntime instead of torch, optionally with
+dynamic int8 quantization of its weights, for faster CPU-only inference.
+
+The transformer is exported once (export_onnx_encoder) next to its tokenizer;
+serving needs only onnxruntime and tokenizers (no torch or transformers), and
+pooling and normalization are applied in numpy exactly as the
+sentence-transformers modules do. OnnxEncoder implements the part of the
+SentenceTransformer interface the matcher uses (encode,
+get_sentence_embedding_dimension), so it can stand in for the torch model.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+
+ONNX_MODEL_FILE = "model.onnx"
+ONNX_INT8_MODEL_FILE = "model.int8.onnx"
+ONNX_CONFIG_FILE = "encoder_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+# Threads per onnxruntime session; the same per-worker budget as the match classifier
+# (MODEL_THREADS), since every gunicorn and analysis worker runs its own session
+ONNX_THREADS = int(os.getenv("ONNX_THREADS", os.getenv("MODEL_THREADS", "1")))
+
+POOLING_MODES = ("mean", "cls", "max")
+
+
+def onnx_export_exists(path, quantized=True):
+    """Whether path holds an export (with its int8 model if quantized)"""
+    model_file = ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE
+    return all(os.path.exists(os.path.join(path, name)) for name in (ONNX_CONFIG_FILE, model_file))
+
+
+def _pooling_mode(model):
+    """Pooling mode of a SentenceTransformer ('mean', 'cls' or 'max')"""
+    from sentence_transformers.models import Pooling
+
+    for module in model:
+        if isinstance(module, Pooling):
+            mode = getattr(module, 'pooling_mode', None)
+            if mode is None:
+                mode = module.get_pooling_mode_str()
+            if mode not in POOLING_MODES:
+                raise ValueError(f"Unsupported pooling mode for the ONNX encoder: {mode}")
+            return mode
+    raise ValueError("The encoder has no pooling module")
+
+
+def export_onnx_encoder(model, path, quantize=True, opset=17):
+    """
+    Export a SentenceTransformer's transformer to ONNX (and its int8-quantized copy)
+
+    Args:
+        model: Loaded SentenceTransformer (torch backend)
+        path: Output directory (model, tokenizer and pooling config)
+        quantize: Also write a dynamically int8-quantized model
+        opset: ONNX opset version
+
+    Returns:
+        path
+    """
+    import torch
+    from sentence_transformers.models import Normalize
+
+    os.makedirs(path, exist_ok=True)
+    transformer = model[0].auto_model.cpu().eval()
+    tokenizer = model.tokenizer
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids")
+                   if name in tokenizer.model_input_names]
+
+    class HiddenStates(torch.nn.Module):
+        """Token embeddings only, the input of the pooling module"""
+
+        def __init__(self, transformer):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, *inputs):
+            return self.transformer(**dict(zip(input_names, inputs))).last_hidden_state
+
+    sample = tokenizer(["onnx export sample", "a longer onnx export sample text"],
+                       padding=True, return_tensors="pt")
+    axes = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            HiddenStates(transformer),
+            tuple(sample[name] for name in input_names),
+            os.path.join(path, ONNX_MODEL_FILE),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes={**{name: axes for name in input_names}, "token_embeddings": axes},
+            opset_version=opset,
+            dynamo=False,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(os.path.join(path, ONNX_MODEL_FILE), os.path.join(path, ONNX_INT8_MODEL_FILE),
+                         weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(path)
+    if not os.path.exists(os.path.join(path, TOKENIZER_FILE)):
+        raise ValueError("The ONNX encoder needs a fast (tokenizers) tokenizer")
+    config = {
+        'input_names': input_names,
+        'max_seq_length': model.max_seq_length,
+        'pad_token': tokenizer.pad_token,
+        'pad_token_id': tokenizer.pad_token_id,
+        'pooling_mode': _pooling_mode(model),
+        'normalize': any(isinstance(module, Normalize) for module in model),
+        'dimension': model.get_sentence_embedding_dimension(),
+    }
+    with open(os.path.join(path, ONNX_CONFIG_FILE), 'w') as f:
+        json.dump(config, f, indent=2)
+    return path
+
+
+class OnnxEncoder:
+    """
+    Sentence encoder served by onnxruntime
+    The session is created on first use in each process: its thread pool does not
+    survive fork, so an encoder loaded in gunicorn's master is still safe in the workers.
+
+    Args:
+        path: Directory written by export_onnx_encoder
+        quantized: Use the int8 model
+        threads: onnxruntime intra-op threads (0 = all cores)
+    """
+
+    def __init__(self, path, quantized=True, threads=ONNX_THREADS):
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(path, ONNX_CONFIG_FILE)) as f:
+            self.config = json.load(f)
+        self.quantized = quantized
+        self.threads = threads
+        self.model_path = os.path.join(path, ONNX_INT8_MODEL_FILE if quantized else ONNX_MODEL_FILE)
+        # Truncated and padded as sentence-transformers tokenizes
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=self.config['pad_token_id'], pad_token=self.config['pad_token'])
+        self._session = None
+        self._session_pid = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """This process's onnxruntime session (a forked child creates its own)"""
+        if self._session is None or self._session_pid != os.getpid():
+            import onnxruntime
+
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    options = onnxruntime.SessionOptions()
+                    options.intra_op_num_threads = self.threads
+                    options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+                    self._session = onnxruntime.InferenceSession(
+                        self.model_path, options, providers=["CPUExecutionProvider"]
+                    )
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def get_sentence_embedding_dimension(self):
+        return self.config['dimension']
+
+    def _pool(self, token_embeddings, attention_mask):
+        mode = self.config['pooling_mode']
+        if mode == "cls":
+            return token_embeddings[:, 0]
+        mask = attention_mask[:, :, None].astype(token_embeddings.dtype)
+        if mode == "max":
+            return np.where(mask > 0, token_embeddings, -1e9).max(axis=1)
+        return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+
+    def encode(self, sentences, batch_size=32, normalize_embeddings=False, convert_to_numpy=True, **kwargs):
+        """
+        Embeddings for sentences, in input order (the subset of SentenceTransformer.encode the matcher uses)
+
+        Returns:
+            (len(sentences), dim) float32 array
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            encoded = {
+                'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+                'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64),
+            }
+            feeds = {name: encoded[name] for name in self.config['input_names']}
+            token_embeddings = self.session.run(None, feeds)[0]
+            batches.append(self._pool(token_embeddings, encoded['attention_mask']))
+
+        embeddings = np.concatenate(batches).astype(np.float32)
+        if normalize_embeddings or self.config['normalize']:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings[0] if single else embeddings
@@ -1,9 +1,378 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import threading
+import numpy as np
+from src.matching.embedding_store import (
+    EmbeddingStore, text_key, recorded_dimension, record_dimension, EMBEDDING_STORE_ENABLED
+)
+from src.matching.encoder_service import EncoderService, ENCODER_SERVICE_ENABLED
 
-model = SentenceTransformer("all-MiniLM-L6-v2")
+ENCODER_MODEL_NAME = "all-MiniLM-L6-v2"
 
-def semantic_similarity(resume_text, jd_text):
-    embeddings = model.encode([resume_text, jd_text])
-    score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
+# Encoder tiers, fastest first:
+# - fast: static token embeddings distilled from ENCODER_MODEL_NAME (NumPy only, no model call)
+# - standard: ENCODER_MODEL_NAME
+# - accurate: ENCODER_ACCURATE_MODEL, a larger sentence-transformer
+# Scores from different tiers are not comparable; stores and caches are keyed by tier.
+ENCODER_TIERS = ("fast", "standard", "accurate")
+DEFAULT_ENCODER_TIER = os.getenv("ENCODER_TIER", "standard")
+
+ENCODER_ACCURATE_MODEL = os.getenv("ENCODER_ACCURATE_MODEL", "all-mpnet-base-v2")
+
+# Bundled copies of encoder models (python -m api.startup bundle); loaded from here
+# when present, so workers start without the network
+ENCODER_MODEL_DIR = os.getenv("ENCODER_MODEL_DIR", "models/encoder")
+
+# Texts per forward pass for batched encoding
+ENCODE_BATCH_SIZE = int(os.getenv("ENCODE_BATCH_SIZE", "32"))
+
+# Inference backend of the transformer tiers: "torch" (sentence-transformers) or "onnx" (onnxruntime, CPU)
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+
+# ONNX exports of the encoders (written on first use or by python -m api.startup bundle)
+ENCODER_ONNX_DIR = os.getenv("ENCODER_ONNX_DIR", "models/encoder_onnx")
+
+# Serve the ONNX backend from the dynamically int8-quantized model
+ENCODER_ONNX_INT8 = os.getenv("ENCODER_ONNX_INT8", "1") == "1"
+
+# Static token embeddings of the fast tier (built by python -m api.startup bundle, never on a request)
+STATIC_ENCODER_DIR = os.getenv("STATIC_ENCODER_DIR", "models/encoder_static")
+
+# Tiers saved by python -m api.startup bundle
+ENCODER_BUNDLE_TIERS = [tier for tier in os.getenv("ENCODER_BUNDLE_TIERS", "fast,standard").split(",") if tier]
+
+ENCODER_BACKENDS = ("torch", "onnx")
+
+_models = {}
+_model_lock = threading.Lock()
+
+def resolve_encoder_tier(tier=None):
+    """The tier to use (DEFAULT_ENCODER_TIER when None); ValueError for unknown tiers"""
+    tier = tier or DEFAULT_ENCODER_TIER
+    if tier not in ENCODER_TIERS:
+        raise ValueError(f"Unknown encoder tier {tier!r}; expected one of {ENCODER_TIERS}")
+    return tier
+
+def encoder_model_name(tier=None):
+    """Sentence-transformer behind a tier (for the fast tier, the one its vectors are distilled from)"""
+    return ENCODER_ACCURATE_MODEL if resolve_encoder_tier(tier) == "accurate" else ENCODER_MODEL_NAME
+
+def bundled_model_path(model_name=ENCODER_MODEL_NAME):
+    return os.path.join(ENCODER_MODEL_DIR, model_name)
+
+def onnx_model_path(model_name=ENCODER_MODEL_NAME):
+    return os.path.join(ENCODER_ONNX_DIR, model_name)
+
+def static_model_path(model_name=ENCODER_MODEL_NAME):
+    return os.path.join(STATIC_ENCODER_DIR, model_name)
+
+def encoder_version(tier=None):
+    """
+    Identifies the embeddings a tier's encoder produces; stores and caches
+    are keyed by it, so vectors from different tiers or backends are never mixed
+    """
+    tier = resolve_encoder_tier(tier)
+    model_name = encoder_model_name(tier)
+    if tier == "fast":
+        return f"{model_name}-static"
+    if ENCODER_BACKEND == "onnx":
+        return f"{model_name}-onnx-int8" if ENCODER_ONNX_INT8 else f"{model_name}-onnx"
+    return model_name
+
+def load_torch_encoder(model_name=ENCODER_MODEL_NAME):
+    """A sentence-transformers encoder: the bundled copy if present, else the model hub cache"""
+    from sentence_transformers import SentenceTransformer
+    path = bundled_model_path(model_name)
+    if os.path.isdir(path):
+        return SentenceTransformer(path)
+    print(f"⚠ No bundled encoder at {path}; loading {model_name} from the model hub cache")
+    return SentenceTransformer(model_name)
+
+def _install(path, build, exists, replace=False):
+    """
+    Build a model directory in a private staging directory and rename it into place,
+    so processes building at the same time never load each other's partial files
+
+    Args:
+        build: build(staging_path) writes the files
+        exists: exists(path) tells whether path holds a complete build
+        replace: Overwrite a complete existing build (kept otherwise)
+    """
+    import shutil
+
+    staging = f"{path}.{os.getpid()}.tmp"
+    build(staging)
+    if replace or not exists(path):
+        shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.rename(staging, path)
+    except OSError:
+        # Another process installed its build first
+        shutil.rmtree(staging, ignore_errors=True)
+    return path
+
+def export_onnx_model(model_name=ENCODER_MODEL_NAME, replace=False):
+    """Export a torch encoder to ONNX under ENCODER_ONNX_DIR (with its int8 copy); returns the path"""
+    from src.matching.onnx_encoder import export_onnx_encoder, onnx_export_exists
+    return _install(onnx_model_path(model_name),
+                    lambda path: export_onnx_encoder(load_torch_encoder(model_name), path),
+                    onnx_export_exists, replace)
+
+def build_static_model(replace=False):
+    """Distill the standard encoder into the fast tier's static token vectors; returns the path"""
+    from src.matching.static_encoder import build_static_encoder, static_encoder_exists
+    return _install(static_model_path(),
+                    lambda path: build_static_encoder(load_torch_encoder(), path),
+                    static_encoder_exists, replace)
+
+def _load_encoder(tier):
+    if tier == "fast":
+        from src.matching.static_encoder import StaticEncoder, static_encoder_exists
+        path = static_model_path()
+        if not static_encoder_exists(path):
+            # Distilling runs the whole vocabulary through the model: far too slow for a request
+            raise FileNotFoundError(
+                f"No static encoder at {path}; build it with python -m api.startup bundle "
+                f"(ENCODER_BUNDLE_TIERS must include fast)"
+            )
+        return StaticEncoder(path)
+
+    model_name = encoder_model_name(tier)
+    if ENCODER_BACKEND not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown ENCODER_BACKEND {ENCODER_BACKEND!r}; expected one of {ENCODER_BACKENDS}")
+    if ENCODER_BACKEND == "onnx":
+        from src.matching.onnx_encoder import OnnxEncoder, onnx_export_exists
+        path = onnx_model_path(model_name)
+        if not onnx_export_exists(path, quantized=ENCODER_ONNX_INT8):
+            print(f"⚠ No ONNX export at {path}; exporting {model_name} once")
+            export_onnx_model(model_name)
+        return OnnxEncoder(path, quantized=ENCODER_ONNX_INT8)
+    return load_torch_encoder(model_name)
+
+def get_encoder_model(tier=None):
+    """
+    The sentence encoder of a tier, loaded on first use
+    (sentence_transformers/torch or onnxruntime are only imported then)
+    """
+    tier = resolve_encoder_tier(tier)
+    model = _models.get(tier)
+    if model is None:
+        with _model_lock:
+            if tier not in _models:
+                _models[tier] = _load_encoder(tier)
+            model = _models[tier]
+    return model
+
+def bundle_encoder_model(tiers=None):
+    """
+    Save the encoders of the given tiers (default ENCODER_BUNDLE_TIERS) for offline
+    starts: transformer tiers under ENCODER_MODEL_DIR (and exported to ONNX when that
+    backend is configured), the fast tier's vectors under STATIC_ENCODER_DIR
+
+    Returns:
+        Saved paths
+    """
+    paths = []
+    for tier in tiers or ENCODER_BUNDLE_TIERS:
+        if resolve_encoder_tier(tier) == "fast":
+            paths.append(build_static_model(replace=True))
+            continue
+        model_name = encoder_model_name(tier)
+        path = bundled_model_path(model_name)
+        load_torch_encoder(model_name).save(path)
+        paths.append(path)
+        if ENCODER_BACKEND == "onnx":
+            paths.append(export_onnx_model(model_name, replace=True))
+    return paths
+
+_dimensions = {}
+
+def encoder_dimension(tier=None):
+    """
+    Embedding dimension of a tier's encoder without loading it when avoidable:
+    from the loaded model, else as recorded when the model was last loaded
+    (so texts served from the embedding store never force a model load)
+    """
+    tier = resolve_encoder_tier(tier)
+    dim = _dimensions.get(tier)
+    if dim is not None:
+        return dim
+    version = encoder_version(tier)
+    if tier not in _models:
+        dim = recorded_dimension(version)
+    if dim is None:
+        dim = get_encoder_model(tier).get_sentence_embedding_dimension()
+        record_dimension(version, dim)
+    _dimensions[tier] = dim
+    return dim
+
+def encoder_tier_available(tier=None):
+    """
+    Whether a tier's encoder can be loaded without building or (when the hub is
+    offline) downloading anything: loaded already, bundled, exported to ONNX, or
+    in the model hub cache / downloadable
+    """
+    tier = resolve_encoder_tier(tier)
+    if tier in _models:
+        return True
+    if tier == "fast":
+        from src.matching.static_encoder import static_encoder_exists
+        return static_encoder_exists(static_model_path())
+
+    model_name = encoder_model_name(tier)
+    if os.path.isdir(bundled_model_path(model_name)):
+        return True
+    if ENCODER_BACKEND == "onnx":
+        from src.matching.onnx_encoder import onnx_export_exists
+        if onnx_export_exists(onnx_model_path(model_name), quantized=ENCODER_ONNX_INT8):
+            return True
+    if os.getenv("HF_HUB_OFFLINE", "0") != "1":
+        return True
+    try:
+        from huggingface_hub import try_to_load_from_cache
+    except ImportError:
+        return False
+    repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    return isinstance(try_to_load_from_cache(repo_id, "config.json"), str)
+
+def uses_model_cache(tier=None):
+    """
+    Whether a tier goes through the encoder service and the embedding store
+    The fast tier computes embeddings faster than it could look them up or queue them.
+    """
+    return resolve_encoder_tier(tier) != "fast"
+
+_embedding_stores = {}
+
+def get_embedding_store(tier=None):
+    """Persistent embedding store for a tier's model (None when disabled or for the fast tier)"""
+    tier = resolve_encoder_tier(tier)
+    if not EMBEDDING_STORE_ENABLED or not uses_model_cache(tier):
+        return None
+    store = _embedding_stores.get(tier)
+    if store is None:
+        store = _embedding_stores.setdefault(tier, EmbeddingStore(encoder_version(tier), encoder_dimension(tier)))
+    return store
+
+_encoder_services = {}
+
+def get_encoder_service(tier=None):
+    """Micro-batching service of a tier, shared by every caller in this process (None when disabled or for the fast tier)"""
+    tier = resolve_encoder_tier(tier)
+    if not ENCODER_SERVICE_ENABLED or not uses_model_cache(tier):
+        return None
+    service = _encoder_services.get(tier)
+    if service is None:
+        service = _encoder_services.setdefault(tier, EncoderService(
+            lambda texts, batch_size: _encode_with_model(texts, batch_size or ENCODE_BATCH_SIZE, tier)
+        ))
+    return service
+
+def encoder_stats():
+    """Batching counters of every encoder service started in this process, by tier"""
+    return {tier: service.stats() for tier, service in _encoder_services.items()}
+
+def semantic_similarity(resume_text, jd_text, tier=None):
+    embeddings = _encode([resume_text, jd_text], tier=tier)
+    # Rows are L2-normalized: the dot product is the cosine similarity
+    score = float(np.dot(embeddings[0], embeddings[1]))
+    return round(score * 100, 2)
+
+def encode_text(text, tier=None):
+    """Encode a single text into an L2-normalized embedding"""
+    return encode_texts([text], tier=tier)[0]
+
+def similarity_to_embedding(text, target_embedding, tier=None):
+    """
+    Semantic similarity against a precomputed normalized embedding
+    (e.g. a job description encoded once per batch, with the same tier)
+    """
+    embedding = encode_text(text, tier)
+    score = float(np.dot(embedding, target_embedding))
     return round(score * 100, 2)
+
+def _encode_with_model(texts, batch_size, tier=None):
+    """
+    Encode many texts in one model call
+    Texts are sorted by length so each batch holds similar lengths (less padding);
+    rows are returned L2-normalized and in the original input order
+    """
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    embeddings = get_encoder_model(tier).encode(
+        [texts[i] for i in order],
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True
+    )
+    
+    matrix = np.empty_like(embeddings)
+    matrix[order] = embeddings
+    return matrix
+
+def _encode(texts, batch_size=ENCODE_BATCH_SIZE, tier=None):
+    """Model embeddings for texts, through the tier's encoder service when it is enabled"""
+    service = get_encoder_service(tier)
+    if service is None:
+        return _encode_with_model(texts, batch_size, tier)
+    return service.encode(texts, batch_size)
+
+def warm_up_encoder(texts, batch_size=ENCODE_BATCH_SIZE, tier=None):
+    """
+    Run a tier's model on a single text and on a full batch, bypassing the embedding
+    store, so the first real requests don't pay for its lazy initialization
+    """
+    _encode(texts[:1], batch_size, tier)
+    # Distinct texts: the encoder service encodes duplicates once
+    _encode([f"{texts[i % len(texts)]} {i}" for i in range(batch_size)], batch_size, tier)
+
+def encode_texts(texts, batch_size=ENCODE_BATCH_SIZE, tier=None):
+    """
+    L2-normalized embeddings for many texts from a tier's encoder, in input order
+    Texts already in the tier's embedding store are read from it; only the rest
+    go through the model (in one batched call) and are then stored.
+    """
+    dim = encoder_dimension(tier)
+    if not texts:
+        return np.zeros((0, dim), dtype=np.float32)
+    
+    store = get_embedding_store(tier)
+    if store is None:
+        return _encode(texts, batch_size, tier)
+    
+    keys = [text_key(text) for text in texts]
+    stored = store.get_many(keys)
+    if len(stored) == len(set(keys)):
+        return np.stack([stored[key] for key in keys])
+    
+    missing = [i for i, key in enumerate(keys) if key not in stored]
+    encoded = _encode([texts[i] for i in missing], batch_size, tier)
+    store.put_many([keys[i] for i in missing], encoded)
+    
+    matrix = np.empty((len(texts), dim), dtype=np.float32)
+    for i, key in enumerate(keys):
+        if key in stored:
+            matrix[i] = stored[key]
+    matrix[missing] = encoded
+    return matrix
+
+def batch_similarity_to_embedding(texts, target_embedding, batch_size=ENCODE_BATCH_SIZE, tier=None):
+    """
+    Semantic similarity of every text against one normalized embedding
+    Returns a list of scores (0-100, 2 decimals) from a single matrix-vector product
+    """
+    matrix = encode_texts(texts, batch_size=batch_size, tier=tier)
+    scores = matrix @ np.asarray(target_embedding, dtype=matrix.dtype)
+    return [round(float(s) * 100, 2) for s in scores]
+
+def paired_similarity(texts_a, texts_b, batch_size=ENCODE_BATCH_SIZE, tier=None):
+    """
+    Row-wise similarity for aligned lists of text pairs
+    Each distinct text is encoded once, however many pairs it appears in
+    """
+    unique = list(dict.fromkeys(list(texts_a) + list(texts_b)))
+    index = {text: i for i, text in enumerate(unique)}
+    matrix = encode_texts(unique, batch_size=batch_size, tier=tier)
+    
+    rows_a = matrix[[index[t] for t in texts_a]]
+    rows_b = matrix[[index[t] for t in texts_b]]
+    scores = np.einsum('ij,ij->i', rows_a, rows_b)
+    return [round(float(s) * 100, 2) for s in scores]
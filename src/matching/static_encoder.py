@@ -0,0 +1,149 @@
+"""
+Static Encoder
+Fast encoder tier: one precomputed vector per tokenizer vocabulary entry.
+A text's embedding is the mean of its token vectors, L2-normalized, computed
+in NumPy/SciPy as a sparse (texts x vocabulary) weight matrix times the
+vector table, without any model call. Texts are split into words and
+punctuation as BERT pre-tokenizes them; each distinct word is tokenized into
+vocabulary pieces once and cached.
+
+The vectors are distilled once from a sentence-transformer by running every
+vocabulary token through it on its own (build_static_encoder), so they live in
+the same space as that model's embeddings. Word order and context are lost:
+quality is below the transformer tiers, in exchange for throughput.
+"""
+
+import os
+import re
+import json
+import numpy as np
+from scipy import sparse
+
+STATIC_VECTORS_FILE = "vectors.npy"
+STATIC_CONFIG_FILE = "static_config.json"
+TOKENIZER_FILE = "tokenizer.json"
+
+# Tokens per text considered (the rest of a longer text is ignored)
+STATIC_MAX_TOKENS = int(os.getenv("STATIC_MAX_TOKENS", "512"))
+
+# Distinct words whose vocabulary pieces are cached per encoder
+STATIC_WORD_CACHE_SIZE = int(os.getenv("STATIC_WORD_CACHE_SIZE", "200000"))
+
+# Runs of letters/digits, and single punctuation characters (BERT's whitespace/punctuation split)
+_WORD_PATTERN = re.compile(r"[^\W_]+|[^\w\s]|_")
+
+
+def static_encoder_exists(path):
+    return all(os.path.exists(os.path.join(path, name))
+               for name in (STATIC_VECTORS_FILE, STATIC_CONFIG_FILE, TOKENIZER_FILE))
+
+
+def build_static_encoder(model, path, batch_size=512):
+    """
+    Distill a SentenceTransformer into static token vectors
+
+    Args:
+        model: Loaded SentenceTransformer (torch backend)
+        path: Output directory (vectors, tokenizer and config)
+        batch_size: Tokens per forward pass
+
+    Returns:
+        path
+    """
+    import torch
+
+    os.makedirs(path, exist_ok=True)
+    tokenizer = model.tokenizer
+    vocab_size = len(tokenizer)
+    special_ids = set(tokenizer.all_special_ids)
+
+    # Every token as its own input: [CLS] token [SEP], through the full model (pooling included)
+    prefix = [tokenizer.cls_token_id] if tokenizer.cls_token_id is not None else []
+    suffix = [tokenizer.sep_token_id] if tokenizer.sep_token_id is not None else []
+    vectors = np.zeros((vocab_size, model.get_sentence_embedding_dimension()), dtype=np.float32)
+    model.eval()
+    with torch.no_grad():
+        for start in range(0, vocab_size, batch_size):
+            ids = torch.tensor([prefix + [i] + suffix for i in range(start, min(start + batch_size, vocab_size))])
+            features = {'input_ids': ids, 'attention_mask': torch.ones_like(ids)}
+            if 'token_type_ids' in tokenizer.model_input_names:
+                features['token_type_ids'] = torch.zeros_like(ids)
+            features = {name: tensor.to(model.device) for name, tensor in features.items()}
+            vectors[start:start + len(ids)] = model(features)['sentence_embedding'].cpu().numpy()
+    # Special tokens never appear in tokenized text; keep them out of any mean
+    vectors[sorted(i for i in special_ids if i < vocab_size)] = 0.0
+
+    np.save(os.path.join(path, STATIC_VECTORS_FILE), vectors)
+    tokenizer.save_pretrained(path)
+    if not os.path.exists(os.path.join(path, TOKENIZER_FILE)):
+        raise ValueError("The static encoder needs a fast (tokenizers) tokenizer")
+    with open(os.path.join(path, STATIC_CONFIG_FILE), 'w') as f:
+        json.dump({'vocab_size': vocab_size, 'dimension': int(vectors.shape[1])}, f, indent=2)
+    return path
+
+
+class StaticEncoder:
+    """
+    Sentence encoder from static token vectors
+
+    Args:
+        path: Directory written by build_static_encoder
+        max_tokens: Tokens per text considered
+    """
+
+    def __init__(self, path, max_tokens=STATIC_MAX_TOKENS):
+        from tokenizers import Tokenizer
+
+        with open(os.path.join(path, STATIC_CONFIG_FILE)) as f:
+            self.config = json.load(f)
+        # Memory-mapped: forked workers share the table
+        self.vectors = np.load(os.path.join(path, STATIC_VECTORS_FILE), mmap_mode='r')
+        self.tokenizer = Tokenizer.from_file(os.path.join(path, TOKENIZER_FILE))
+        self.tokenizer.no_padding()
+        self.tokenizer.no_truncation()
+        self.max_tokens = max_tokens
+        self._pieces = {}  # word -> vocabulary ids
+
+    def _token_ids(self, text):
+        pieces = self._pieces
+        ids = []
+        for word in _WORD_PATTERN.findall(text):
+            word_ids = pieces.get(word)
+            if word_ids is None:
+                word_ids = self.tokenizer.encode(word, add_special_tokens=False).ids
+                if len(pieces) < STATIC_WORD_CACHE_SIZE:
+                    pieces[word] = word_ids
+            ids += word_ids
+            if len(ids) >= self.max_tokens:
+                return ids[:self.max_tokens]
+        return ids
+
+    def get_sentence_embedding_dimension(self):
+        return self.config['dimension']
+
+    def encode(self, sentences, batch_size=None, normalize_embeddings=False, convert_to_numpy=True, **kwargs):
+        """
+        Mean token vector of each sentence, in input order (batch_size is accepted for
+        interface compatibility; every sentence is encoded in one sparse product)
+
+        Returns:
+            (len(sentences), dim) float32 array (zeros for texts without tokens)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        if not texts:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        ids = [self._token_ids(text) for text in texts]
+        lengths = np.fromiter((len(row) for row in ids), dtype=np.int64, count=len(ids))
+        indptr = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=indptr[1:])
+        columns = np.fromiter((i for row in ids for i in row), dtype=np.int64, count=int(indptr[-1]))
+        # Weight 1/length per token occurrence: the product is the mean (repeated tokens add up)
+        weights = np.repeat(1.0 / np.maximum(lengths, 1), lengths).astype(np.float32)
+        pooling = sparse.csr_matrix((weights, columns, indptr), shape=(len(ids), self.config['vocab_size']))
+
+        embeddings = np.asarray(pooling @ self.vectors, dtype=np.float32)
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return embeddings[0] if single else embeddings
@@ -11,6 +11,10 @@ from PIL import Image
 import io
 import os
 import re
+from src.preprocessing.text_cache import cached_extract
+
+# Part of the parsed-text cache key; bump when extraction output changes
+ADVANCED_PARSER_VERSION = "advanced_parser-1"
 
 class AdvancedResumeParser:
     """
@@ -42,11 +46,14 @@ class AdvancedResumeParser:
             Extracted text as string
         """
         if file_path.endswith(".pdf"):
-            return self._extract_from_pdf(file_path)
+            parse = lambda path, data: self._extract_from_pdf(path)
         elif file_path.endswith(".docx"):
-            return self._extract_from_docx(file_path)
+            parse = lambda path, data: self._extract_from_docx(path)
         else:
             raise ValueError(f"Unsupported file format: {file_path}")
+        
+        # Content-addressed: re-uploads of the same file skip pdfplumber/OCR
+        return cached_extract(file_path, ADVANCED_PARSER_VERSION, parse)
     
     def _extract_from_pdf(self, file_path):
         """Extract text from PDF with fallback to OCR if needed"""
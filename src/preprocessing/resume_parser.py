@@ -1,15 +1,26 @@
+import io
 import pdfplumber
 import docx
+from src.preprocessing.text_cache import cached_extract
 
-def extract_text(file_path):
+# Part of the parsed-text cache key; bump when extraction output changes
+PARSER_VERSION = "resume_parser-1"
+
+def _parse(file_path, data):
     text = ""
     if file_path.endswith(".pdf"):
-        with pdfplumber.open(file_path) as pdf:
+        with pdfplumber.open(io.BytesIO(data)) as pdf:
             for page in pdf.pages:
-                if page.extract_text():
-                    text += page.extract_text() + " "
+                page_text = page.extract_text()
+                if page_text:
+                    text += page_text + " "
     elif file_path.endswith(".docx"):
-        doc = docx.Document(file_path)
+        doc = docx.Document(io.BytesIO(data))
         for para in doc.paragraphs:
             text += para.text + " "
     return text.strip()
+
+def extract_text(file_path):
+    if not file_path.endswith((".pdf", ".docx")):
+        return ""
+    return cached_extract(file_path, PARSER_VERSION, _parse)
@@ -0,0 +1,172 @@
+"""
+Parsed Text Cache
+Content-addressed, disk-backed cache of extracted resume text.
+Keys are SHA-256 of the file bytes plus the parser version, so the same PDF
+uploaded for another requisition skips pdfplumber/OCR entirely.
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+import hashlib
+
+PARSED_TEXT_CACHE_ENABLED = os.getenv("PARSED_TEXT_CACHE", "1") != "0"
+PARSED_TEXT_CACHE_PATH = os.getenv("PARSED_TEXT_CACHE_PATH", "cache/parsed_text.db")
+
+# Upper bound on stored (compressed) bytes before least-recently-used eviction
+PARSED_TEXT_CACHE_MAX_BYTES = int(os.getenv("PARSED_TEXT_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Hits refresh their LRU timestamp at most this often (keeps reads mostly read-only)
+_TOUCH_INTERVAL = 60.0
+
+
+def content_key(data, parser_version):
+    """Cache key for raw file bytes under a given parser version"""
+    return f"{parser_version}:{hashlib.sha256(data).hexdigest()}"
+
+
+class ParsedTextCache:
+    """
+    SQLite (WAL) store shared by all processes on the host.
+    Every operation uses its own short-lived connection, and any database
+    error degrades to a cache miss so parsing never fails because of the cache.
+    """
+
+    def __init__(self, path=PARSED_TEXT_CACHE_PATH, max_bytes=PARSED_TEXT_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._initialized = False
+
+    def _connect(self):
+        if not self._initialized:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS parsed_text (
+                    key TEXT PRIMARY KEY,
+                    text BLOB NOT NULL,  -- zlib-compressed UTF-8
+                    size INTEGER NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            ''')
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_parsed_text_access ON parsed_text(last_access)')
+            conn.commit()
+            self._initialized = True
+        return conn
+
+    def get(self, key):
+        """Return cached text for key, or None on miss"""
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute('SELECT text, last_access FROM parsed_text WHERE key = ?', (key,)).fetchone()
+                if row is None:
+                    return None
+                now = time.time()
+                if now - row[1] > _TOUCH_INTERVAL:
+                    conn.execute('UPDATE parsed_text SET last_access = ? WHERE key = ?', (now, key))
+                    conn.commit()
+                return zlib.decompress(row[0]).decode('utf-8')
+            finally:
+                conn.close()
+        except (sqlite3.Error, zlib.error, OSError):
+            return None
+
+    def put(self, key, text):
+        """Store text under key and evict least-recently-used entries beyond the size bound"""
+        blob = zlib.compress(text.encode('utf-8'), 6)
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('''
+                    INSERT OR REPLACE INTO parsed_text (key, text, size, last_access)
+                    VALUES (?, ?, ?, ?)
+                ''', (key, blob, len(blob), time.time()))
+                self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def _evict(self, conn):
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM parsed_text').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Trim to 90% so eviction does not run on every subsequent insert
+        target = int(self.max_bytes * 0.9)
+        rows = conn.execute('SELECT key, size FROM parsed_text ORDER BY last_access ASC').fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= target:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM parsed_text WHERE key = ?', stale)
+
+    def clear(self):
+        try:
+            conn = self._connect()
+            try:
+                conn.execute('DELETE FROM parsed_text')
+                conn.commit()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            pass
+
+    def stats(self):
+        """Entry count and stored bytes"""
+        try:
+            conn = self._connect()
+            try:
+                count, size = conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM parsed_text').fetchone()
+                return {'entries': count, 'bytes': size, 'max_bytes': self.max_bytes}
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError):
+            return {'entries': 0, 'bytes': 0, 'max_bytes': self.max_bytes}
+
+
+_cache = None
+
+
+def get_parsed_text_cache():
+    """Process-wide cache instance (None when disabled)"""
+    global _cache
+    if not PARSED_TEXT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = ParsedTextCache()
+    return _cache
+
+
+def cached_extract(file_path, parser_version, parse_fn):
+    """
+    Read the file once, serve its text from the cache or parse and store it
+
+    Args:
+        file_path: Resume file path
+        parser_version: Version stamp of the parser producing the text
+        parse_fn: Callable (file_path, data) -> text, run on cache miss
+    """
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    cache = get_parsed_text_cache()
+    if cache is None:
+        return parse_fn(file_path, data)
+
+    key = content_key(data, parser_version)
+    text = cache.get(key)
+    if text is None:
+        text = parse_fn(file_path, data)
+        # Empty output may be a transient OCR/parse failure; do not pin it
+        if text:
+            cache.put(key, text)
+    return text
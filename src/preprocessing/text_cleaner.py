@@ -1,12 +1,82 @@
 import re
-import nltk
-from nltk.corpus import stopwords
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Letters-only tokens; everything else acts as a separator
+TOKEN_PATTERN = re.compile(r'[a-z]+')
+
+# Bounded LRU for repeated inputs (e.g. the same JD cleaned for every resume)
+CLEAN_CACHE_SIZE = int(os.getenv("CLEAN_TEXT_CACHE_SIZE", "256"))
+
+# NLTK english stopword list, used when the corpus is not installed locally
+_BUNDLED_ENGLISH_STOPWORDS = (
+    "i me my myself we our ours ourselves you you're you've you'll you'd your yours "
+    "yourself yourselves he him his himself she she's her hers herself it it's its "
+    "itself they them their theirs themselves what which who whom this that that'll "
+    "these those am is are was were be been being have has had having do does did "
+    "doing a an the and but if or because as until while of at by for with about "
+    "against between into through during before after above below to from up down "
+    "in out on off over under again further then once here there when where why how "
+    "all any both each few more most other some such no nor not only own same so "
+    "than too very s t can will just don don't should should've now d ll m o re ve "
+    "y ain aren aren't couldn couldn't didn didn't doesn doesn't hadn hadn't hasn "
+    "hasn't haven haven't isn isn't ma mightn mightn't mustn mustn't needn needn't "
+    "shan shan't shouldn shouldn't wasn wasn't weren weren't won won't wouldn wouldn't"
+).split()
+
+_stopwords = None
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_stopwords():
+    """
+    Return the english stopword set, loaded once per process.
+    Uses the local NLTK corpus when present and never triggers a download.
+    """
+    global _stopwords
+    if _stopwords is None:
+        try:
+            from nltk.corpus import stopwords
+            words = stopwords.words("english")
+        except (ImportError, LookupError):
+            words = _BUNDLED_ENGLISH_STOPWORDS
+        _stopwords = frozenset(words)
+    return _stopwords
 
-nltk.download("stopwords")
 
 def clean_text(text):
-    text = text.lower()
-    text = re.sub(r'[^a-zA-Z ]', ' ', text)
-    words = text.split()
-    words = [w for w in words if w not in stopwords.words("english")]
-    return " ".join(words)
+    stop = get_stopwords()
+    return " ".join(w for w in TOKEN_PATTERN.findall(text.lower()) if w not in stop)
+
+
+def cached_clean_text(text):
+    """
+    clean_text behind a bounded LRU keyed by a digest of the input,
+    so cached entries do not pin the original (possibly large) strings.
+    """
+    if CLEAN_CACHE_SIZE <= 0:
+        return clean_text(text)
+
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _cache_lock:
+        cleaned = _cache.get(key)
+        if cleaned is not None:
+            _cache.move_to_end(key)
+            return cleaned
+
+    cleaned = clean_text(text)
+    with _cache_lock:
+        _cache[key] = cleaned
+        _cache.move_to_end(key)
+        while len(_cache) > CLEAN_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return cleaned
+
+
+def clear_clean_text_cache():
+    """Drop all cached cleaning results"""
+    with _cache_lock:
+        _cache.clear()
@@ -0,0 +1,203 @@
+"""
+Model Distillation for Online Scoring
+Fits a compact student on the ensemble's soft labels for the latency-sensitive API path
+
+The student is a logistic model on quantile-binned features, stored as one
+additive lookup table per feature: scoring a row is a bin lookup per feature,
+a sum and a sigmoid, with no estimator stack behind it.
+"""
+
+import os
+import sys
+import copy
+import json
+import time
+import pickle
+import numpy as np
+import joblib
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+
+# Add project root to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../')))
+
+STUDENT_MODEL_PATH = "models/student_classifier.pkl"
+DISTILLATION_REPORT_PATH = "models/distillation_report.json"
+
+
+class BinnedLogisticStudent:
+    """
+    Logistic regression on one-hot quantile bins, collapsed into lookup tables
+    Exposes the classifier surface the API uses (classes_, feature_names_in_, predict_proba, predict).
+    """
+
+    def __init__(self, n_bins=16, C=10.0):
+        self.n_bins = n_bins
+        self.C = C
+
+    def _bin_indices(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        return [np.searchsorted(edges, X[:, f], side='right') for f, edges in enumerate(self.bin_edges_)]
+
+    def fit(self, X, soft_targets):
+        """
+        Args:
+            X: (n_samples, n_features) training features (array or DataFrame)
+            soft_targets: Teacher probability of the positive class per sample
+        """
+        if hasattr(X, 'columns'):
+            self.feature_names_in_ = np.array(list(X.columns), dtype=object)
+        X = np.asarray(X, dtype=np.float64)
+        soft_targets = np.asarray(soft_targets, dtype=np.float64)
+
+        # Interior quantile edges per feature (duplicates collapse for discrete features)
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.bin_edges_ = [np.unique(np.quantile(X[:, f], quantiles)) for f in range(X.shape[1])]
+
+        offsets = np.cumsum([0] + [len(edges) + 1 for edges in self.bin_edges_])
+        onehot = np.zeros((len(X), offsets[-1]))
+        for f, indices in enumerate(self._bin_indices(X)):
+            onehot[np.arange(len(X)), offsets[f] + indices] = 1.0
+
+        # Cross-entropy against soft labels: each row once as positive (weight p), once as negative (1 - p)
+        logistic = LogisticRegression(C=self.C, max_iter=2000)
+        logistic.fit(
+            np.vstack([onehot, onehot]),
+            np.r_[np.ones(len(X)), np.zeros(len(X))],
+            sample_weight=np.r_[soft_targets, 1.0 - soft_targets]
+        )
+
+        coef = logistic.coef_[0]
+        self.tables_ = [coef[offsets[f]:offsets[f + 1]] for f in range(X.shape[1])]
+        self.intercept_ = float(logistic.intercept_[0])
+        self.classes_ = np.array([0, 1])
+        return self
+
+    def decision_function(self, X):
+        logits = np.full(len(X), self.intercept_)
+        for table, indices in zip(self.tables_, self._bin_indices(X)):
+            logits += table[indices]
+        return logits
+
+    def predict_proba(self, X):
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(X)))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return (self.decision_function(X) > 0).astype(int)
+
+
+def _online_copy(model):
+    """Copy of the model with every n_jobs pinned to 1, as the API runs it"""
+    model = copy.deepcopy(model)
+    for estimator in [model] + list(getattr(model, 'estimators_', [])):
+        if hasattr(estimator, 'get_params') and 'n_jobs' in estimator.get_params(deep=False):
+            estimator.set_params(n_jobs=1)
+    return model
+
+
+def measure_latency(model, X, repeats=500):
+    """
+    Returns:
+        Dictionary with p50/p99 single-row predict_proba latency and
+        the time for one predict_proba over all of X (milliseconds)
+    """
+    X = np.asarray(X, dtype=np.float64)
+    timings = []
+    for i in range(repeats):
+        row = X[i % len(X):i % len(X) + 1]
+        start = time.perf_counter()
+        model.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batch = time.perf_counter() - start
+
+    return {
+        'single_row_p50_ms': round(float(np.percentile(timings, 50)) * 1000, 4),
+        'single_row_p99_ms': round(float(np.percentile(timings, 99)) * 1000, 4),
+        'batch_ms': round(batch * 1000, 3),
+        'batch_rows': len(X)
+    }
+
+
+def distill_student_model(teacher, X_train, X_test, y_test, n_bins=16,
+                          filepath=STUDENT_MODEL_PATH, report_path=DISTILLATION_REPORT_PATH):
+    """
+    Fit the student on the teacher's soft labels, save it next to the teacher
+    and report accuracy and latency of both
+
+    Args:
+        teacher: Fitted classifier with predict_proba (the ensemble)
+        X_train: Features the teacher labels for the student
+        X_test, y_test: Held-out split for the comparison
+
+    Returns:
+        Trained student and the report dictionary
+    """
+    # Plain arrays in the training column order, as the API passes them
+    X_train_values = np.asarray(X_train, dtype=np.float64)
+    X_test_values = np.asarray(X_test, dtype=np.float64)
+    teacher = _online_copy(teacher)
+
+    print(f"Distilling student from teacher soft labels on {len(X_train_values)} samples...")
+    soft_targets = teacher.predict_proba(X_train_values)[:, 1]
+    student = BinnedLogisticStudent(n_bins=n_bins).fit(X_train, soft_targets)
+
+    teacher_proba = teacher.predict_proba(X_test_values)[:, 1]
+    student_proba = student.predict_proba(X_test_values)[:, 1]
+    teacher_pred = (teacher_proba > 0.5).astype(int)
+    student_pred = (student_proba > 0.5).astype(int)
+
+    report = {}
+    for name, model, y_pred in [('teacher', teacher, teacher_pred), ('student', student, student_pred)]:
+        report[name] = {
+            'accuracy': round(float(accuracy_score(y_test, y_pred)), 4),
+            'f1': round(float(f1_score(y_test, y_pred, zero_division=0)), 4),
+            'size_bytes': len(pickle.dumps(model)),
+            **measure_latency(model, X_test_values)
+        }
+    report['agreement'] = round(float(np.mean(teacher_pred == student_pred)), 4)
+    report['probability_mae'] = round(float(np.mean(np.abs(teacher_proba - student_proba))), 4)
+
+    print("\n" + "="*50)
+    print("DISTILLATION REPORT (teacher -> student)")
+    print("="*50)
+    print(f"{'':22}{'Teacher':>12}{'Student':>12}")
+    for metric, label, scale, unit in [
+        ('accuracy', 'Accuracy', 100, '%'),
+        ('f1', 'F1-score', 100, '%'),
+        ('single_row_p99_ms', 'Single-row p99', 1, 'ms'),
+        ('batch_ms', f'Batch ({len(X_test_values)} rows)', 1, 'ms'),
+        ('size_bytes', 'Size', 1 / 1024, 'KB'),
+    ]:
+        print(f"{label:22}{report['teacher'][metric] * scale:>10.2f}{unit:>2}"
+              f"{report['student'][metric] * scale:>10.2f}{unit:>2}")
+    print(f"Agreement with teacher: {report['agreement']*100:.2f}%")
+    print(f"Mean |probability diff|: {report['probability_mae']:.4f}")
+    print("="*50)
+
+    joblib.dump(student, filepath)
+    print(f"\nStudent model saved to '{filepath}'")
+    with open(report_path, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Distillation report saved to '{report_path}'")
+
+    return student, report
+
+
+if __name__ == "__main__":
+    # Distill from the saved ensemble without retraining it
+    from sklearn.model_selection import train_test_split
+    from src.training.train_model import generate_synthetic_data
+    from src.training.ensemble_model import load_ensemble_model
+    # Through the package so the pickled student references src.training.distillation, not __main__
+    from src.training.distillation import distill_student_model
+
+    df = generate_synthetic_data(10000)
+    X = df.drop("label", axis=1)
+    y = df["label"]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    distill_student_model(load_ensemble_model(), X_train, X_test, y_test)
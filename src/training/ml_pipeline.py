@@ -15,7 +15,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../'
 from src.preprocessing.text_cleaner import clean_text
 from src.feature_extraction.skill_extractor import extract_skills
 from src.feature_extraction.experience_extractor import extract_experience
-from src.matching.semantic_matcher_bert import semantic_similarity
+from src.matching.semantic_matcher_bert import paired_similarity
 from src.matching.experience_weight import experience_score
 
 class MLPipeline:
@@ -152,16 +152,21 @@ class MLPipeline:
         
         features = []
         
-        for idx, row in pairs_df.iterrows():
+        # Feature 1: Semantic Similarity
+        # Every distinct resume/JD text is encoded once in batched forward passes
+        print(f"Encoding {len(pairs_df)} pairs...")
+        semantic_scores = paired_similarity(
+            pairs_df['resume_text'].tolist(),
+            pairs_df['jd_text'].tolist()
+        )
+        
+        for (idx, row), semantic_score in zip(pairs_df.iterrows(), semantic_scores):
             if idx % 100 == 0:
                 print(f"Processing pair {idx}/{len(pairs_df)}...")
             
             resume_text = row['resume_text']
             jd_text = row['jd_text']
             
-            # Feature 1: Semantic Similarity
-            semantic_score = semantic_similarity(resume_text, jd_text)
-            
             # Feature 2: Skill Overlap
             resume_skills = set(extract_skills(resume_text))
             jd_skills = set(extract_skills(jd_text))
@@ -134,7 +134,7 @@ def process_csv_data(filepath, jd_text=""):
         
     return pd.DataFrame(processed_data)
 
-def train_and_evaluate(csv_path=None, use_ensemble=False):
+def train_and_evaluate(csv_path=None, use_ensemble=False, distill=True):
     if csv_path and os.path.exists(csv_path):
         print(f"Training on real data from {csv_path}")
         df = process_csv_data(csv_path)
@@ -157,6 +157,10 @@ def train_and_evaluate(csv_path=None, use_ensemble=False):
         from src.training.ensemble_model import train_ensemble_model, save_ensemble_model
         clf, metrics = train_ensemble_model(X_train, X_test, y_train, y_test)
         save_ensemble_model(clf, "models/ensemble_classifier.pkl")
+        if distill:
+            # Compact student for the API's online scoring path
+            from src.training.distillation import distill_student_model
+            distill_student_model(clf, X_train, X_test, y_test)
         return  # Ensemble module handles all output
     elif csv_path:
         clf = RandomForestClassifier(n_estimators=100, random_state=42)
@@ -191,6 +195,7 @@ if __name__ == "__main__":
     parser.add_argument("--csv", type=str, help="Path to Kaggle/Data CSV file", default=None)
     parser.add_argument("--jd_text", type=str, help="Job Description text (optional, for feature extraction)", default="")
     parser.add_argument("--ensemble", action="store_true", help="Use ensemble model (RF + XGBoost + LR)")
+    parser.add_argument("--no-distill", action="store_true", help="Skip distilling the ensemble into the student model")
     args = parser.parse_args()
     
-    train_and_evaluate(args.csv, use_ensemble=args.ensemble)
+    train_and_evaluate(args.csv, use_ensemble=args.ensemble, distill=not args.no_distill)
@@ -42,6 +42,43 @@ def test_skill_database():
     
     return len(all_skills) >= 500
 
+def test_skill_matcher_parity():
+    """Test the single-pass matcher against the per-pattern regex scan"""
+    print("\n" + "="*60)
+    print("TEST 1b: Skill Matcher Parity")
+    print("="*60)
+    
+    import re
+    from src.feature_extraction.skill_extractor import SKILL_SYNONYMS, normalize_skill
+    
+    def regex_extract(text):
+        text_lower = text.lower()
+        found = set()
+        for skill in get_all_skills() + list(SKILL_SYNONYMS.keys()):
+            if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
+                found.add(normalize_skill(skill))
+            elif skill in text_lower and len(skill) > 4:
+                found.add(normalize_skill(skill))
+        return found
+    
+    samples = [
+        "Senior engineer: Python, C++, C#, .NET Core, Node.js and CI/CD pipelines.",
+        "Expert in ML, AI, k8s, JS, TCP/IP, A/B testing and Security+.",
+        "Pythonista building reactive dashboards in PowerBI and Tableau",
+        "go_lang r-studio c++x scala3",
+    ]
+    
+    mismatches = 0
+    for text in samples:
+        expected = regex_extract(text)
+        actual = set(extract_skills(text))
+        if expected != actual:
+            mismatches += 1
+            print(f"Mismatch on {text!r}: {sorted(expected ^ actual)}")
+    
+    print(f"Samples checked: {len(samples)}, mismatches: {mismatches}")
+    return mismatches == 0
+
 def test_ner_extraction():
     """Test Named Entity Recognition"""
     print("\n" + "="*60)
@@ -95,6 +132,90 @@ def test_semantic_matching():
     
     return similarity > 70
 
+def test_onnx_encoder_parity():
+    """Test the ONNX backends against the torch encoder (cosine of their embeddings)"""
+    print("\n" + "="*60)
+    print("TEST 3b: ONNX Encoder Parity")
+    print("="*60)
+    
+    try:
+        import onnxruntime  # noqa: F401
+    except ImportError:
+        print("onnxruntime not installed, skipping")
+        return True
+    
+    import tempfile
+    import numpy as np
+    from src.matching.semantic_matcher_bert import load_torch_encoder
+    from src.matching.onnx_encoder import export_onnx_encoder, OnnxEncoder
+    
+    texts = [
+        "Experienced Data Scientist with Python, Machine Learning, and Deep Learning",
+        "Looking for Data Scientist skilled in Python, ML, and Neural Networks",
+        "DevOps engineer: Docker, Kubernetes, Terraform, AWS and CI/CD pipelines",
+        "Intern",
+        " ".join(["Senior backend developer building Java and Spring microservices."] * 40),
+    ]
+    # Minimum cosine similarity to the torch embedding of the same text
+    bounds = {False: 0.9999, True: 0.98}
+    
+    model = load_torch_encoder()
+    reference = model.encode(texts, normalize_embeddings=True)
+    passed = True
+    with tempfile.TemporaryDirectory() as path:
+        export_onnx_encoder(model, path)
+        for quantized, bound in bounds.items():
+            embeddings = OnnxEncoder(path, quantized=quantized).encode(texts, batch_size=2, normalize_embeddings=True)
+            cosine = (reference * embeddings).sum(axis=1)
+            label = "int8" if quantized else "fp32"
+            print(f"ONNX {label}: min cosine {cosine.min():.5f}, mean {cosine.mean():.5f} (bound {bound})")
+            passed = passed and embeddings.shape == reference.shape and cosine.min() >= bound
+    
+    return passed
+
+def test_static_encoder():
+    """Test the fast tier: tokenization parity with the model tokenizer, and mean pooling"""
+    print("\n" + "="*60)
+    print("TEST 3c: Static Encoder")
+    print("="*60)
+    
+    import tempfile
+    import numpy as np
+    from src.matching.semantic_matcher_bert import load_torch_encoder
+    from src.matching.static_encoder import build_static_encoder, StaticEncoder
+    
+    texts = [
+        "Experienced Data Scientist with Python, Machine Learning, and Deep Learning",
+        "DevOps engineer: Docker, Kubernetes, Terraform, AWS and CI/CD pipelines (5+ years)",
+        "C++/C# developer_backend, e-commerce & fin-tech",
+        "",
+    ]
+    
+    model = load_torch_encoder()
+    with tempfile.TemporaryDirectory() as path:
+        build_static_encoder(model, path)
+        encoder = StaticEncoder(path)
+        embeddings = encoder.encode(texts, normalize_embeddings=True)
+        
+        passed = embeddings.shape == (len(texts), model.get_sentence_embedding_dimension())
+        for text, embedding in zip(texts, embeddings):
+            ids = model.tokenizer(text, add_special_tokens=False)['input_ids']
+            passed = passed and encoder._token_ids(text) == ids
+            if ids:
+                expected = np.asarray(encoder.vectors[ids]).mean(axis=0)
+                expected /= np.linalg.norm(expected)
+                passed = passed and np.allclose(embedding, expected, atol=1e-5)
+            else:
+                passed = passed and not embedding.any()
+        
+        bulk = texts[:3] * 2000
+        start_time = time.time()
+        encoder.encode(bulk, normalize_embeddings=True)
+        elapsed = time.time() - start_time
+        print(f"Encoded {len(bulk)} texts in {elapsed:.3f}s ({len(bulk) / elapsed:.0f} docs/s)")
+    
+    return passed
+
 def test_model_accuracy():
     """Test model accuracy on synthetic data"""
     print("\n" + "="*60)
@@ -171,6 +292,247 @@ def test_end_to_end():
         print(f"Error in end-to-end test: {e}")
         return False
 
+def test_job_queue_leases():
+    """Test lease expiry, reclaiming by another worker and abandoning after max attempts"""
+    print("\n" + "="*60)
+    print("TEST 6: Job Queue Leases")
+    print("="*60)
+
+    import tempfile
+    import api.history_db as history_db
+    from api.job_queue import JobQueue
+
+    with tempfile.TemporaryDirectory() as path:
+        history_path = history_db.DB_PATH
+        history_db.DB_PATH = os.path.join(path, "history.db")
+        try:
+            history_db.init_history_db()
+            history_db.save_analysis_job("job-1", "recruiter@example.com", "jd.txt", 1)
+
+            queue = JobQueue(os.path.join(path, "jobs.db"), lease_seconds=0.2, max_attempts=2)
+            queue.create("job-1", "analysis", {"jd_path": "jd.txt"}, queued=True)
+
+            job = queue.claim("worker-a")
+            passed = job is not None and job['status'] == 'processing' and job['attempts'] == 1
+            passed = passed and queue.claim("worker-b") is None  # leased to worker-a
+            passed = passed and queue.heartbeat("job-1", "worker-a", progress=10)
+
+            # worker-a stops renewing its lease: worker-b takes the job over
+            time.sleep(0.3)
+            job = queue.claim("worker-b")
+            passed = passed and job is not None and job['attempts'] == 2
+            passed = passed and not queue.heartbeat("job-1", "worker-a")
+            passed = passed and not queue.finish("job-1", "worker-a", 'completed')
+            print(f"Reclaimed by worker-b after lease expiry: {job is not None}")
+
+            # worker-b dies too: the job is out of attempts
+            time.sleep(0.3)
+            passed = passed and queue.claim("worker-c") is None
+            job = queue.get("job-1")
+            history = history_db.get_job_by_id("job-1")
+            print(f"Status: {job['status']} ({job['error']}), history: {history['status']}")
+            passed = passed and job['status'] == 'failed' and job['error'] == "Abandoned after 2 attempts"
+            passed = passed and history['status'] == 'failed'
+        finally:
+            history_db.DB_PATH = history_path
+
+    return passed
+
+def test_embedding_store():
+    """Test concurrent writers and matrix growth across generations"""
+    print("\n" + "="*60)
+    print("TEST 7: Embedding Store")
+    print("="*60)
+
+    import tempfile
+    import threading
+    import numpy as np
+    from src.matching.embedding_store import EmbeddingStore
+
+    dim = 16
+    rng = np.random.default_rng(7)
+    keys = [f"text-{i}" for i in range(3000)]
+    vectors = rng.standard_normal((len(keys), dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as path:
+        reader = EmbeddingStore("test-model", dim, root=path)
+        reader.put_many(keys[:100], vectors[:100])
+        first_generation, first_keys, first_matrix = reader.snapshot()
+
+        # Overlapping chunks from separate instances, as from separate workers
+        def write(offset):
+            writer = EmbeddingStore("test-model", dim, root=path)
+            for start in range(offset, len(keys), 400):
+                writer.put_many(keys[start:start + 500], vectors[start:start + 500])
+
+        threads = [threading.Thread(target=write, args=(offset,)) for offset in (0, 100, 200, 300)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = reader.stats()
+        stored = reader.get_many(keys)
+        print(f"Entries: {stats['entries']}, generation {first_generation} -> {stats['generation']}")
+        passed = stats['entries'] == len(keys) and len(stored) == len(keys)
+        passed = passed and stats['generation'] > first_generation
+        passed = passed and all(np.array_equal(stored[key], vector) for key, vector in zip(keys, vectors))
+
+        # The snapshot taken before growth still reads the superseded generation
+        passed = passed and np.array_equal(np.asarray(first_matrix), vectors[:100]) and first_keys == keys[:100]
+
+        generation, snapshot_keys, matrix = reader.snapshot()
+        order = [keys.index(key) for key in snapshot_keys]
+        passed = passed and len(set(snapshot_keys)) == len(keys) and np.array_equal(np.asarray(matrix), vectors[order])
+
+        kept = reader.compact(max_rows=1000)
+        stored = reader.get_many(snapshot_keys[-1000:])
+        passed = passed and kept == 1000 and reader.stats()['generation'] > generation
+        passed = passed and all(np.array_equal(stored[key], vectors[keys.index(key)]) for key in snapshot_keys[-1000:])
+        passed = passed and not reader.get_many(snapshot_keys[:1])
+
+    return passed
+
+def test_result_cache_versioning():
+    """Test that results never cross analysis versions and that stale entries are pruned"""
+    print("\n" + "="*60)
+    print("TEST 8: Result Cache Versioning")
+    print("="*60)
+
+    import sqlite3
+    import tempfile
+    from api.result_cache import AnalysisResultCache, analysis_version, prune_result_cache
+
+    with tempfile.TemporaryDirectory() as path:
+        model_path = os.path.join(path, "model.pkl")
+        with open(model_path, 'wb') as f:
+            f.write(b"model one")
+        version = analysis_version(model_path)
+        with open(model_path, 'wb') as f:
+            f.write(b"model two")
+        retrained_version = analysis_version(model_path)
+        print(f"Versions: {version} -> {retrained_version}")
+        passed = version != retrained_version and analysis_version(model_path) == retrained_version
+
+        cache_path = os.path.join(path, "results.db")
+        cache = AnalysisResultCache(version, path=cache_path, memory_size=0)
+        key = cache.key("resume", "jd", "Data Scientist", "full", "standard")
+        cache.put(key, {'final_score': 81.5, 'filename': 'a.pdf', 'rank': 1})
+        result = cache.get(key)
+        passed = passed and result == {'final_score': 81.5}
+
+        retrained = AnalysisResultCache(retrained_version, path=cache_path, memory_size=0)
+        retrained_key = retrained.key("resume", "jd", "Data Scientist", "full", "standard")
+        passed = passed and retrained_key != key and retrained.get(retrained_key) is None
+
+        # Only the entry unused for longer than the retention period is pruned
+        retrained.put(retrained_key, {'final_score': 64.0})
+        conn = sqlite3.connect(cache_path)
+        conn.execute('UPDATE analysis_results SET last_access = ? WHERE key = ?', (time.time() - 3 * 86400, key))
+        conn.commit()
+        conn.close()
+        deleted = prune_result_cache(retention_days=1, path=cache_path)
+        print(f"Pruned entries: {deleted}")
+        passed = passed and deleted == 1 and cache.get(key) is None
+        passed = passed and retrained.get(retrained_key) == {'final_score': 64.0}
+
+    return passed
+
+def test_cascade_top_k():
+    """Test that the cascade returns the same top-K as scoring every candidate"""
+    print("\n" + "="*60)
+    print("TEST 9: Cascade Top-K")
+    print("="*60)
+
+    import csv
+    import tempfile
+    from docx import Document
+    from api.inference import inference_engine
+
+    jd_text = ("Looking for a Data Scientist skilled in Python, Machine Learning, SQL and "
+               "Deep Learning, with 3+ years of experience deploying models to production")
+    top_k = 5
+
+    with open("data/synthetic_resumes_1k.csv", newline='', encoding='utf-8') as f:
+        resumes = [row['Resume_Text'] for row in csv.DictReader(f)][:40]
+
+    with tempfile.TemporaryDirectory() as path:
+        resume_paths = []
+        for idx, text in enumerate(resumes):
+            document = Document()
+            for line in text.splitlines():
+                document.add_paragraph(line)
+            resume_path = os.path.join(path, f"resume_{idx:03d}.docx")
+            document.save(resume_path)
+            resume_paths.append(resume_path)
+
+        # Cascade first: the full run stores every result in the result cache
+        report = {}
+        cascade = inference_engine.batch_analyze(
+            resume_paths, jd_text, "Data Scientist", workers=1, cascade=True, top_k=top_k,
+            min_skill_overlap=0, min_experience_ratio=0, report=report
+        )
+        full = inference_engine.batch_analyze(resume_paths, jd_text, "Data Scientist", workers=1)
+
+    expected = [(result['filename'], result['final_score']) for result in full[:top_k]]
+    actual = [(result['filename'], result['final_score']) for result in cascade]
+    print(f"Stage counts: {report}")
+    print(f"Top-{top_k}: {actual}")
+    return len(full) == len(resumes) and actual == expected
+
+def test_model_registry():
+    """Test version activation and rejection of artifacts that fail their checksum"""
+    print("\n" + "="*60)
+    print("TEST 10: Model Registry")
+    print("="*60)
+
+    import tempfile
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+    from api.model_registry import ModelRegistry
+
+    rng = np.random.default_rng(10)
+    X = rng.random((200, 4)) * 100
+    y = (X[:, 0] + X[:, 2] > 100).astype(int)
+    first = LogisticRegression(max_iter=1000).fit(X, y)
+    second = LogisticRegression(max_iter=1000, C=0.01).fit(X, y)
+
+    with tempfile.TemporaryDirectory() as path:
+        registry = ModelRegistry(path)
+        v1 = registry.register(first, "student")
+        passed = registry.active_version() is None
+        v2 = registry.register(second, "student", activate=True)
+        passed = passed and (v1, v2) == ("v1", "v2") and registry.active_version() == v2
+
+        registry.activate(v1)
+        loaded = registry.load(v1)
+        passed = passed and registry.active_version() == v1
+        passed = passed and np.allclose(loaded.predict_proba(X), first.predict_proba(X))
+
+        # A modified artifact can be neither activated nor loaded
+        with open(registry.artifact_path(v2), 'ab') as f:
+            f.write(b"tampered")
+        for action in (registry.activate, registry.load):
+            try:
+                action(v2)
+                passed = False
+            except ValueError as e:
+                print(f"Rejected: {e}")
+        passed = passed and registry.active_version() == v1
+
+        try:
+            registry.activate("v9")
+            passed = False
+        except KeyError:
+            pass
+        try:
+            registry.remove(v1)
+            passed = False
+        except ValueError:
+            pass
+
+    return passed
+
 def run_all_tests():
     """Run all tests and generate report"""
     print("\n" + "="*60)
@@ -179,10 +541,18 @@ def run_all_tests():
     
     results = {
         "Skill Database (500+ skills)": test_skill_database(),
+        "Skill Matcher Parity": test_skill_matcher_parity(),
         "Named Entity Recognition": test_ner_extraction(),
         "Semantic Matching": test_semantic_matching(),
+        "ONNX Encoder Parity": test_onnx_encoder_parity(),
+        "Static Encoder": test_static_encoder(),
         "Model Accuracy": test_model_accuracy(),
-        "End-to-End Pipeline": test_end_to_end()
+        "End-to-End Pipeline": test_end_to_end(),
+        "Job Queue Leases": test_job_queue_leases(),
+        "Embedding Store": test_embedding_store(),
+        "Result Cache Versioning": test_result_cache_versioning(),
+        "Cascade Top-K": test_cascade_top_k(),
+        "Model Registry": test_model_registry()
     }
     
     print("\n" + "="*60)